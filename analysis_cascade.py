@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Keyword -> LLM Analysis Cascade
+===============================
+
+Cheap first tier in front of the OpenAI analysis:
+
+1) Score every scraped profile with the keyword scorer
+   (score_apimaestro.score_profile; the Firecrawl markdown's Experience and
+   Education sections are parsed into dated roles and schools, so founder,
+   recency, company, school and industry rules fire as on Apify items)
+2) Escalate to the LLM profiles scoring at/above ESCALATE_MIN_SCORE, within
+   BOUNDARY_MARGIN points of a tier boundary (60 / 75), or with any
+   founder-title or stealth signal
+3) Merge both signals into one final score and tier; profiles that were
+   not escalated keep their keyword score and tier
+
+Obvious non-founders never reach the LLM, so calls, latency and cost drop
+while the top of the ranking is still reviewed by the model.
+
+Env overrides: CASCADE_ESCALATE_MIN_SCORE, CASCADE_BOUNDARY_MARGIN, CASCADE_LLM_WEIGHT
+"""
+
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from score_apimaestro import match_terms, score_profile, to_text
+
+ESCALATE_MIN_SCORE = int(os.getenv("CASCADE_ESCALATE_MIN_SCORE", "40"))
+BOUNDARY_MARGIN = int(os.getenv("CASCADE_BOUNDARY_MARGIN", "5"))
+# Share of the final score that comes from the LLM fit score (0..1)
+LLM_WEIGHT = float(os.getenv("CASCADE_LLM_WEIGHT", "0.5"))
+TIER_BOUNDARIES = (60, 75)
+
+
+def tier_for(score: float) -> str:
+    if score >= 75:
+        return "A"
+    if score >= 60:
+        return "B"
+    return "C"
+
+
+def public_id_from_url(url: str) -> str:
+    if "linkedin.com/in/" not in url:
+        return url
+    return url.split("linkedin.com/in/")[-1].split("/")[0].split("?")[0]
+
+
+SECTION_NAMES = {
+    "about", "experience", "education", "skills", "licenses & certifications", "certifications", "projects",
+    "volunteering", "volunteer experience", "languages", "activity", "honors & awards", "recommendations",
+    "interests", "publications", "courses", "organizations",
+}
+_MONTH = r"(?:(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+)?"
+DATE_RANGE_RE = re.compile(_MONTH + r"((?:19|20)\d{2})\s*(?:-|–|—|to)\s*(?:(present|current|now)|" + _MONTH + r"((?:19|20)\d{2}))",
+                           re.I)
+DURATION_RE = re.compile(r"[·•]?\s*\d+\s*(?:yrs?|years?|mos?|months?)\b.*$", re.I)
+MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+SCHOOL_RE = re.compile(r"universit|college|institute|school|\biit\b|\biim\b", re.I)
+
+
+def _date(month: Optional[str], year: Optional[str]) -> Optional[Dict[str, int]]:
+    if not year:
+        return None
+    date = {"year": int(year)}
+    if month:
+        date["month"] = MONTHS.index(month.lower()[:3]) + 1
+    return date
+
+
+def _split_role(text: str) -> Tuple[str, str]:
+    """"Title at Company" / "Title · Company" / "Founder, Company" -> (title, company)."""
+    for sep in (" at ", " @ ", " · ", " | ", " - "):
+        if sep in text:
+            title, company = text.split(sep, 1)
+            return title.strip(), company.strip()
+    if "," in text:
+        title, company = text.split(",", 1)
+        if match_terms("founder", to_text(title)):
+            return title.strip(), company.strip()
+    return text.strip(), ""
+
+
+def _role(lines: List[str], dates: Optional[re.Match] = None) -> Dict[str, Any]:
+    lines = [ln for ln in lines if ln][-2:]
+    if len(lines) == 2:
+        title, company = lines
+    else:
+        title, company = _split_role(lines[0]) if lines else ("", "")
+    role: Dict[str, Any] = {"title": title, "company": company, "is_current": False}
+    if dates:
+        role["start_date"] = _date(dates.group(1), dates.group(2))
+        role["is_current"] = bool(dates.group(3))
+        role["end_date"] = None if dates.group(3) else _date(dates.group(4), dates.group(5))
+    return role
+
+
+def _parse_roles(lines: List[str]) -> List[Dict[str, Any]]:
+    """Experience entries: title/company lines (or a "### Title" heading) closed by a date-range line."""
+    roles: List[Dict[str, Any]] = []
+    buf: List[str] = []
+    for ln in lines:
+        if ln.startswith("#"):
+            if buf:
+                roles.append(_role(buf))
+            buf = [ln.lstrip("#").strip()]
+            continue
+        if ln[:1] in "-*•" or len(ln) > 160:
+            continue  # description bullets / paragraphs
+        m = DATE_RANGE_RE.search(ln)
+        if m:
+            rest = DURATION_RE.sub("", ln[:m.start()] + ln[m.end():]).strip(" ()·|-–,")
+            roles.append(_role(buf + ([rest] if rest else []), m))
+            buf = []
+        else:
+            buf.append(ln)
+    if buf:
+        roles.append(_role(buf))
+    return [r for r in roles if r["title"] or r["company"]]
+
+
+def _parse_schools(lines: List[str]) -> List[Dict[str, Any]]:
+    schools: List[Dict[str, Any]] = []
+    for ln in lines:
+        text = ln.lstrip("#").strip()
+        if not text or ln[:1] in "-*•":
+            continue
+        m = DATE_RANGE_RE.search(text)
+        if m and not text[:m.start()].strip(" ()·|-–,"):
+            continue  # a date line under the school
+        schools.append({"school": text[:m.start()].strip(" ()·|-–,") if m else text})
+    return schools
+
+
+def _headline_background(headline: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Roles and schools named in a "Founder at X | ex-Google | Stanford" headline."""
+    roles: List[Dict[str, Any]] = []
+    schools: List[Dict[str, Any]] = []
+    for seg in re.split(r"\s*[|•·]\s*", headline or ""):
+        seg = seg.strip()
+        if not seg:
+            continue
+        past = re.match(r"(?:ex[-\s]|former(?:ly)?\s+)(.+)", seg, re.I)
+        if past:
+            roles.append({"title": "", "company": past.group(1).strip(), "is_current": False})
+        elif match_terms("school", to_text(seg)) or SCHOOL_RE.search(seg):
+            schools.append({"school": seg})
+        else:
+            m = DATE_RANGE_RE.search(seg)
+            text = seg[:m.start()].strip(" ()·|-–,") if m else seg
+            title, company = _split_role(text)
+            if company:
+                role = _role([title, company], m)
+                if not m:
+                    role["is_current"] = True
+                roles.append(role)
+    return roles, schools
+
+
+def markdown_to_profile(url: str, markdown: str) -> Dict[str, Any]:
+    """Shape Firecrawl markdown like an apimaestro item so the keyword scorer can read it.
+
+    Experience / Education sections become dated experience and education
+    entries; without them, the headline's "Title at Company", "ex-Company"
+    and school segments stand in."""
+    lines = [ln.strip() for ln in (markdown or "").splitlines() if ln.strip()]
+    name = ""
+    headline = ""
+    sections: Dict[str, List[str]] = {}
+    current = ""
+    for ln in lines:
+        label = ln.lstrip("#").strip().rstrip(":").lower()
+        if label in SECTION_NAMES:
+            current = label
+            sections.setdefault(current, [])
+        elif current:
+            sections[current].append(ln)
+        elif not name and ln.startswith("#"):
+            name = ln.lstrip("#").strip()
+        elif name and not headline and not ln.startswith("#"):
+            headline = ln
+    experience = _parse_roles(sections.get("experience", []))
+    education = _parse_schools(sections.get("education", []))
+    head_roles, head_schools = _headline_background(headline)
+    return {
+        "basic_info": {
+            "fullname": name,
+            "headline": headline,
+            "about": markdown or "",
+            "public_identifier": public_id_from_url(url),
+            "location": {},
+        },
+        "experience": experience or head_roles,
+        "education": education or head_schools,
+    }
+
+
+def keyword_score(profile_data: Dict[str, Any]) -> Dict[str, Any]:
+    """First-tier score for a scraped profile ({url, data: {markdown}})."""
+    url = profile_data.get("url", "")
+    markdown = profile_data.get("data", {}).get("markdown", "")
+    return score_profile(markdown_to_profile(url, markdown))
+
+
+def should_escalate(keyword_result: Dict[str, Any]) -> bool:
+    """Escalate high scores, scores near a tier boundary, and any founder/stealth evidence.
+
+    A founder title or stealth language alone is worth only 10-20 keyword
+    points, so those profiles go to the LLM whatever their score."""
+    score = keyword_result.get("score", 0)
+    if score >= ESCALATE_MIN_SCORE:
+        return True
+    breakdown = keyword_result.get("breakdown") or {}
+    if breakdown.get("founder", 0) > 0 or breakdown.get("stealth", 0) > 0:
+        return True
+    return any(abs(score - b) <= BOUNDARY_MARGIN for b in TIER_BOUNDARIES)
+
+
+def merge_signals(keyword_result: Dict[str, Any], analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Blend the keyword score (0-100) with the LLM antler_fit_score (0-10)."""
+    kw_score = keyword_result.get("score", 0)
+    if analysis and analysis.get("success"):
+        try:
+            llm_score = float(analysis.get("antler_fit_score", 0)) * 10
+        except (TypeError, ValueError):
+            llm_score = 0.0
+        final = round((1 - LLM_WEIGHT) * kw_score + LLM_WEIGHT * llm_score, 1)
+        source = "keyword+llm"
+    else:
+        final = float(kw_score)
+        source = "keyword"
+    return {
+        "keyword_score": kw_score,
+        "keyword_tier": keyword_result.get("tier"),
+        "final_score": final,
+        "tier": tier_for(final),
+        "score_source": source,
+    }
@@ -11,17 +11,30 @@ Apify (apimaestro) Full LinkedIn Sections Pipeline
 Endpoint (OpenAPI provided):
 POST https://api.apify.com/v2/acts/apimaestro~linkedin-profile-full-sections-scraper/run-sync-get-dataset-items?token=...
 Body: { usernames: ["https://linkedin.com/in/...", ...], includeEmail: true }
+
+Optional: --celery queues the batches as Celery tasks (enrichment_tasks.py) so
+workers on several machines enrich in parallel, idempotent per profile and
+under one shared rate limit.
+
+Stages (actor run-sync call, JSON parse, stealth filter, writes) are timed
+with pipeline_timing.py and reported at the end of the run;
+PIPELINE_PROFILE=cprofile|sample adds a profile dump.
 """
 
 import os
 import json
 import math
 import time
+import argparse
 from typing import List, Dict, Any
 
 import requests
 from dotenv import load_dotenv
 
+import pipeline_timing
+from metrics import APIFY_CALL_SECONDS, HTTP_RESPONSES, IN_FLIGHT, PROFILES_ENRICHED
+from pipeline_timing import count, span
+
 load_dotenv()
 
 APIFY_TOKEN = os.getenv("APIFY_TOKEN")
@@ -54,12 +67,20 @@ def read_urls() -> List[str]:
 def call_apimaestro(usernames: List[str], include_email: bool = True) -> List[Dict[str, Any]]:
     url = f"{APIFY_BASE}/{ACTOR_PATH}?token={APIFY_TOKEN}"
     payload = {"usernames": usernames, "includeEmail": include_email}
-    r = requests.post(url, json=payload, timeout=300)
+    # run-sync: actor run, server-side wait and dataset download in one request
+    with span("apify.run_sync"), IN_FLIGHT.track(service="apify"), APIFY_CALL_SECONDS.time(service="apimaestro"):
+        r = requests.post(url, json=payload, timeout=300)
+    count("apify.runs")
+    count("apify.dataset_bytes", len(r.content))
+    HTTP_RESPONSES.inc(service="apify", status=r.status_code)
     r.raise_for_status()
     try:
-        return r.json()
+        with span("json.parse"):
+            items = r.json()
     except Exception:
         return [{"raw": r.text}]
+    PROFILES_ENRICHED.inc(len(items) if isinstance(items, list) else 1, source="apimaestro")
+    return items
 
 
 def looks_stealth(item: Dict[str, Any]) -> bool:
@@ -73,7 +94,16 @@ def looks_stealth(item: Dict[str, Any]) -> bool:
     return any(k in text for k in STEALTH_KEYWORDS)
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Apify apimaestro full sections pipeline")
+    parser.add_argument("--celery", action="store_true",
+                        help="Enrich through Celery workers (see enrichment_tasks.py) instead of in-process")
+    parser.add_argument("--batch-size", type=int, default=50, help="Profiles per actor call / task")
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
     print("🚀 Apify apimaestro full sections pipeline")
     urls = read_urls()
     print(f"🔗 Input URLs: {len(urls)}")
@@ -82,32 +112,40 @@ def main():
         return
 
     # Apimaestro supports up to 500 usernames per call per schema. We'll batch smaller (e.g., 50) to be safe.
-    batch_size = 50
+    batch_size = args.batch_size
     all_items: List[Dict[str, Any]] = []
 
-    for i in range(0, len(urls), batch_size):
-        batch = urls[i:i+batch_size]
-        print(f"📦 Batch {i//batch_size + 1} — {len(batch)} profiles")
-        try:
-            items = call_apimaestro(batch, include_email=True)
-            print(f"   ↳ Received {len(items)} items")
-            all_items.extend(items if isinstance(items, list) else [items])
-            time.sleep(1.5)
-        except requests.HTTPError as e:
-            print(f"   ↳ HTTPError: {e}")
-            continue
-        except Exception as e:
-            print(f"   ↳ Error: {e}")
-            continue
+    if args.celery:
+        from enrichment_tasks import enqueue_and_collect
+        with span("celery.enqueue_and_collect"):
+            all_items = enqueue_and_collect(urls, batch_size=batch_size, include_email=True)
+    else:
+        for i in range(0, len(urls), batch_size):
+            batch = urls[i:i+batch_size]
+            print(f"📦 Batch {i//batch_size + 1} — {len(batch)} profiles")
+            try:
+                items = call_apimaestro(batch, include_email=True)
+                print(f"   ↳ Received {len(items)} items")
+                all_items.extend(items if isinstance(items, list) else [items])
+                count("apify.items", len(items) if isinstance(items, list) else 1)
+                with span("sleep"):
+                    time.sleep(1.5)
+            except requests.HTTPError as e:
+                print(f"   ↳ HTTPError: {e}")
+                continue
+            except Exception as e:
+                print(f"   ↳ Error: {e}")
+                continue
 
     # Save raw
-    with open(RAW_OUT, "w") as f:
+    with span("write_output"), open(RAW_OUT, "w") as f:
         json.dump(all_items, f, indent=2)
     print(f"🗂️ Saved raw items: {len(all_items)} -> {RAW_OUT}")
 
     # Filter stealth
-    stealth_items = [it for it in all_items if isinstance(it, dict) and looks_stealth(it)]
-    with open(STEALTH_OUT, "w") as f:
+    with span("stealth_filter"):
+        stealth_items = [it for it in all_items if isinstance(it, dict) and looks_stealth(it)]
+    with span("write_output"), open(STEALTH_OUT, "w") as f:
         json.dump(stealth_items, f, indent=2)
     print(f"🕵️ Stealth-matching: {len(stealth_items)} -> {STEALTH_OUT}")
 
@@ -118,4 +156,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    with pipeline_timing.run("apify_apimaestro_pipeline"):
+        main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Columnar Export (Parquet / Arrow IPC)
+=====================================
+
+Writes scored profiles as typed columns instead of pretty-printed JSON, so
+dashboards and notebooks can load and filter millions of rows without
+parsing JSON:
+
+- score: int16, tier / location: dictionary-encoded strings
+- every score-breakdown component becomes its own int16 column
+  (breakdown_<component>), so filters like "breakdown_stealth > 0" run
+  on a column
+- list fields (e.g. categories) become list<string>
+- Parquet is zstd-compressed; Arrow IPC ("feather v2") is lz4 and can be
+  memory-mapped
+
+pyarrow is imported lazily; only the --format parquet|arrow paths need it.
+
+Usage:
+    write_scored(rows, "apimaestro_scored.parquet")
+    python columnar_export.py apimaestro_scored.json apimaestro_scored.parquet
+"""
+
+import sys
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+FORMATS = ("json", "parquet", "arrow")
+EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# Column -> arrow type name; unlisted scalar fields are stored as strings
+TYPED_COLUMNS = {
+    "score": "int16",
+    "tier": "category",
+    "location": "category",
+    "final_score": "float32",
+    "keyword_score": "int16",
+    "has_ai": "bool",
+    "has_health": "bool",
+    "has_consumer": "bool",
+    "is_indian": "bool",
+    "categories": "list",
+}
+BREAKDOWN_KEYS = ("breakdown", "score_breakdown")
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError:
+        raise SystemExit("❌ pyarrow is required for columnar export: pip install pyarrow")
+    return pyarrow
+
+
+def output_path(base: str, fmt: str) -> str:
+    """Swap a .json output name for the format's extension."""
+    stem = base[:-5] if base.endswith(".json") else base
+    return stem + EXTENSIONS.get(fmt, ".json")
+
+
+def _arrow_type(pa, kind: str):
+    return {
+        "int16": pa.int16(),
+        "float32": pa.float32(),
+        "bool": pa.bool_(),
+        "category": pa.dictionary(pa.int32(), pa.string()),
+        "list": pa.list_(pa.string()),
+    }.get(kind, pa.string())
+
+
+def to_table(rows: Sequence[Dict[str, Any]], columns: Optional[List[str]] = None):
+    """Typed pyarrow Table; nested breakdown dicts are flattened to breakdown_* columns."""
+    pa = _pyarrow()
+    if columns is None:
+        columns = []
+        for row in rows:
+            for key, value in row.items():
+                if key not in columns and key not in BREAKDOWN_KEYS and not isinstance(value, dict):
+                    columns.append(key)
+    components: List[str] = []
+    for row in rows:
+        for key in BREAKDOWN_KEYS:
+            for comp in (row.get(key) or {}):
+                if comp not in components:
+                    components.append(comp)
+
+    arrays = []
+    names = []
+    for col in columns:
+        kind = TYPED_COLUMNS.get(col, "string")
+        values = [row.get(col) for row in rows]
+        if kind == "string":
+            values = [None if v is None else (v if isinstance(v, str) else json.dumps(v)) for v in values]
+        elif kind == "category":
+            values = [None if v is None else str(v) for v in values]
+        elif kind == "list":
+            values = [None if v is None else [str(x) for x in v] for v in values]
+        typ = _arrow_type(pa, kind)
+        if kind == "category":
+            arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, type=typ))
+        names.append(col)
+    for comp in components:
+        values = []
+        for row in rows:
+            breakdown = next((row[k] for k in BREAKDOWN_KEYS if isinstance(row.get(k), dict)), {})
+            values.append(breakdown.get(comp))
+        arrays.append(pa.array(values, type=pa.int16()))
+        names.append(f"breakdown_{comp}")
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def write_scored(rows: Sequence[Dict[str, Any]], path: str, fmt: Optional[str] = None,
+                 columns: Optional[List[str]] = None) -> str:
+    """Write rows as Parquet or Arrow IPC (format from `fmt` or the file extension)."""
+    pa = _pyarrow()
+    fmt = fmt or ("arrow" if path.endswith((".arrow", ".feather")) else "parquet")
+    table = to_table(rows, columns)
+    if fmt == "parquet":
+        pa.parquet.write_table(table, path, compression="zstd")
+    elif fmt == "arrow":
+        pa.feather.write_feather(table, path, compression="lz4")
+    else:
+        raise ValueError(f"Unsupported columnar format: {fmt}")
+    return path
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: python columnar_export.py <scored.json> <out.parquet|out.arrow>")
+        raise SystemExit(1)
+    with open(sys.argv[1], "r") as f:
+        rows = json.load(f)
+    path = write_scored(rows, sys.argv[2])
+    print(f"✅ Wrote {len(rows)} rows to {path}")
+
+
+if __name__ == "__main__":
+    main()
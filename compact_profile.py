@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Compact Profile Records
+=======================
+
+Slotted, string-interned profile records for holding large corpora in
+memory. Raw apimaestro items are dicts of dicts carrying URLs, images,
+descriptions and other fields nothing downstream reads; a CompactProfile
+keeps only what scoring (score_apimaestro.score_profile) and the profile
+store / exports need:
+
+- CompactProfile: identifier, name, headline, about, location
+  (full, city, country), email, follower count, current company,
+  experience and education tuples, sources
+- CompactExperience: title, company, start/end year+month, is_current
+- CompactEducation: school, degree, start/end year
+- Repeated strings (companies, schools, titles, cities, countries) are
+  interned, so a company shared by 10k people is stored once
+
+iter_json_array() streams a JSON array file item by item (the file is
+decoded in chunks, never as one parsed list), and load_compact() projects
+each item into a CompactProfile as it is parsed, so the raw dicts are
+garbage right after their record is built.
+
+CompactProfile.to_record() rebuilds the canonical nested dict
+(profile_merge.py) on demand for code that reads dicts.
+
+Usage:
+    merger = ProfileMerger(factory=CompactProfile.from_record)
+    merger.add_many(iter_json_array("apimaestro_batch_raw.json"), source="batch")
+    scored = [score_profile(p.to_record()) for p in merger.records()]
+
+Memory comparison on a raw file:
+    python compact_profile.py [apimaestro_batch_raw.json]
+"""
+
+import sys
+import json
+import time
+import tracemalloc
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from profile_merge import ProfileMerger
+
+CHUNK_SIZE = 1 << 20
+
+_intern = sys.intern
+
+
+def _istr(value: Any) -> str:
+    return _intern(value) if isinstance(value, str) and value else ""
+
+
+def _ym(date: Any) -> Tuple[Optional[int], Optional[int]]:
+    if isinstance(date, dict) and date.get("year"):
+        return date.get("year"), date.get("month")
+    return None, None
+
+
+def _date(year: Optional[int], month: Optional[int]) -> Dict[str, Any]:
+    return {"year": year, "month": month} if year else {}
+
+
+class CompactExperience:
+    __slots__ = ("title", "company", "start_year", "start_month", "end_year", "end_month", "is_current")
+
+    def __init__(self, title: str, company: str, start_year: Optional[int], start_month: Optional[int],
+                 end_year: Optional[int], end_month: Optional[int], is_current: bool):
+        self.title = title
+        self.company = company
+        self.start_year = start_year
+        self.start_month = start_month
+        self.end_year = end_year
+        self.end_month = end_month
+        self.is_current = is_current
+
+    @classmethod
+    def from_record(cls, exp: Dict[str, Any]) -> "CompactExperience":
+        return cls(_istr(exp.get("title")), _istr(exp.get("company")),
+                   *_ym(exp.get("start_date")), *_ym(exp.get("end_date")), bool(exp.get("is_current")))
+
+    def to_record(self) -> Dict[str, Any]:
+        return {
+            "title": self.title,
+            "company": self.company,
+            "start_date": _date(self.start_year, self.start_month),
+            "end_date": _date(self.end_year, self.end_month),
+            "is_current": self.is_current,
+        }
+
+
+class CompactEducation:
+    __slots__ = ("school", "degree", "start_year", "end_year")
+
+    def __init__(self, school: str, degree: str, start_year: Optional[int], end_year: Optional[int]):
+        self.school = school
+        self.degree = degree
+        self.start_year = start_year
+        self.end_year = end_year
+
+    @classmethod
+    def from_record(cls, ed: Dict[str, Any]) -> "CompactEducation":
+        return cls(_istr(ed.get("school")), _istr(ed.get("degree_name") or ed.get("degree")),
+                   _ym(ed.get("start_date"))[0], _ym(ed.get("end_date"))[0])
+
+    def to_record(self) -> Dict[str, Any]:
+        return {
+            "school": self.school,
+            "degree": self.degree,
+            "start_date": _date(self.start_year, None),
+            "end_date": _date(self.end_year, None),
+        }
+
+
+class CompactProfile:
+    """One person, holding only the fields scoring and storage read.
+
+    Field names match the canonical record (profile_merge.BASIC_FIELDS /
+    LIST_FIELDS), so ProfileMerger can merge CompactProfiles directly."""
+
+    __slots__ = ("public_identifier", "fullname", "headline", "about", "location", "email",
+                 "follower_count", "current_company", "experience", "education", "sources")
+
+    def __init__(self, public_identifier: str, fullname: str = "", headline: str = "", about: str = "",
+                 location: Tuple[str, str, str] = ("", "", ""), email: Optional[str] = None,
+                 follower_count: int = 0, current_company: str = "",
+                 experience: Tuple[CompactExperience, ...] = (), education: Tuple[CompactEducation, ...] = (),
+                 sources: Optional[List[str]] = None):
+        self.public_identifier = public_identifier
+        self.fullname = fullname
+        self.headline = headline
+        self.about = about
+        self.location = location
+        self.email = email
+        self.follower_count = follower_count
+        self.current_company = current_company
+        self.experience = experience
+        self.education = education
+        self.sources = sources if sources is not None else []
+
+    @classmethod
+    def from_record(cls, rec: Dict[str, Any]) -> "CompactProfile":
+        """Project a canonical record (profile_merge.normalize_profile) into a compact one."""
+        basic = rec.get("basic_info") or {}
+        loc = basic.get("location") or {}
+        return cls(
+            public_identifier=_istr(basic.get("public_identifier")),
+            fullname=basic.get("fullname") or "",
+            headline=basic.get("headline") or "",
+            about=basic.get("about") or "",
+            location=(_istr(loc.get("full")), _istr(loc.get("city")), _istr(loc.get("country"))),
+            email=basic.get("email") or None,
+            follower_count=basic.get("follower_count") or 0,
+            current_company=_istr(basic.get("current_company")),
+            experience=tuple(CompactExperience.from_record(e) for e in rec.get("experience") or []),
+            education=tuple(CompactEducation.from_record(e) for e in rec.get("education") or []),
+            sources=[_intern(s) for s in rec.get("sources") or []],
+        )
+
+    def to_record(self) -> Dict[str, Any]:
+        """Canonical nested record (the shape score_profile and profile_store read)."""
+        full, city, country = self.location
+        pid = self.public_identifier
+        return {
+            "basic_info": {
+                "fullname": self.fullname,
+                "headline": self.headline,
+                "about": self.about,
+                "public_identifier": pid,
+                "location": {"full": full, "city": city, "country": country},
+                "email": self.email,
+                "follower_count": self.follower_count,
+                "current_company": self.current_company,
+            },
+            "experience": [e.to_record() for e in self.experience],
+            "education": [e.to_record() for e in self.education],
+            "profileUrl": f"https://www.linkedin.com/in/{pid}" if pid else "",
+            "sources": list(self.sources),
+        }
+
+
+def iter_json_array(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array file one at a time.
+
+    Reads `chunk_size` characters at a time and decodes one item per
+    raw_decode call; a missing, empty or non-array file yields nothing."""
+    decoder = json.JSONDecoder()
+    try:
+        f = open(path, "r")
+    except OSError:
+        return
+    with f:
+        buf = f.read(chunk_size).lstrip()
+        if not buf.startswith("["):
+            return
+        pos = 1
+        eof = False
+        while True:
+            # Skip separators; pull in more text when the buffer runs dry
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n,":
+                    pos += 1
+                if pos < len(buf) or eof:
+                    break
+                buf, pos = f.read(chunk_size), 0
+                eof = not buf
+            if pos >= len(buf) or buf[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # Item spans the chunk boundary: extend the buffer and retry
+                more = f.read(chunk_size)
+                eof = not more
+                buf, pos = buf[pos:] + more, 0
+                continue
+            yield item
+            pos = end
+
+
+def load_compact(*sources: Tuple[str, str, float]) -> ProfileMerger:
+    """Stream each (path, source, fetched_at) into one compact, merged corpus."""
+    merger = ProfileMerger(factory=CompactProfile.from_record)
+    for path, source, fetched_at in sources:
+        merger.add_many(iter_json_array(path), source=source, fetched_at=fetched_at)
+    return merger
+
+
+# ---- benchmark ------------------------------------------------------
+
+def main():
+    from profile_merge import merge_profiles
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "apimaestro_batch_raw.json"
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(path, "r") as f:
+        raw = json.load(f)
+    records = merge_profiles((path, raw, 0))
+    dict_sec = time.perf_counter() - start
+    dict_current, dict_peak = tracemalloc.get_traced_memory()
+    del raw, records
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    merger = load_compact((path, path, 0))
+    compact_sec = time.perf_counter() - start
+    compact_current, compact_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    mb = 1024 * 1024
+    print(f"📦 {len(merger.records())} profiles from {path}")
+    print(f"- json.load + dict records: peak {dict_peak / mb:.1f} MB, held {dict_current / mb:.1f} MB, {dict_sec:.2f}s")
+    print(f"- streamed compact records: peak {compact_peak / mb:.1f} MB, held {compact_current / mb:.1f} MB, {compact_sec:.2f}s")
+    print(f"- held memory ratio:        {dict_current / max(1, compact_current):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
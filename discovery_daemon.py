@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Scheduled Incremental Discovery Daemon
+======================================
+
+Re-runs the discovery queries on a schedule and only pays for what is new:
+
+1) Spend DISCOVERY_SEARCH_BUDGET Google searches (SerpAPI) per cycle on
+   the queries the adaptive scheduler (query_scheduler.py) ranks best by
+   new profiles per credit, with stats shared across runs and with
+   indian_founders_discovery.py. A query keeps paging while its pages
+   hold profiles unknown to the global URL frontier (url_frontier.py) and
+   drops out of the cycle at the first page with none -- later pages are
+   older, already-harvested results. New URLs that are near-duplicates of
+   one another (near_duplicates.py, from result titles/snippets) are
+   collapsed to one per person
+2) Enrich only the new identifiers (apimaestro full sections; --celery
+   hands them to the enrichment workers in enrichment_tasks.py)
+3) Score them (score_apimaestro.score_profile), append raw + scored rows
+   to NDJSON files, add them to the lookalike index if one exists
+   (lookalike_index.py) and, with --db, upsert them into the profile store
+
+Identifiers are recorded in the frontier only once Apify has answered for
+them, so anything a failed cycle missed is retried by the next one. A
+collapsed near-duplicate is recorded once its kept person is, with source
+"near_dup_of:<kept id>", so later cycles neither enrich it nor keep paging
+for it; `python url_frontier.py --release-near-dups` undoes those merges.
+
+Metrics (metrics.py) are served on METRICS_PORT while the daemon runs,
+plus per-cycle founder_discovery_* counters and the last cycle's duration.
+
+Query sets: "stealth" (serpapi_to_apify.QUERIES), "indian"
+(indian_founders_discovery.generate_search_query_plan()), or "all".
+
+Usage:
+    python discovery_daemon.py                  # every DISCOVERY_INTERVAL_HOURS
+    python discovery_daemon.py --once --queries indian --db
+
+Env overrides: DISCOVERY_INTERVAL_HOURS, DISCOVERY_MAX_PAGES,
+DISCOVERY_SEARCH_BUDGET, QUERY_STATS_PATH
+"""
+
+import os
+import json
+import time
+import argparse
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import schedule
+
+import metrics
+from profile_merge import is_failed, normalize_profile, profile_id
+from url_frontier import UrlFrontier, canonical_url, canonicalize
+
+INTERVAL_HOURS = float(os.getenv("DISCOVERY_INTERVAL_HOURS", "6"))
+MAX_PAGES = int(os.getenv("DISCOVERY_MAX_PAGES", "5"))
+SEARCH_BUDGET = int(os.getenv("DISCOVERY_SEARCH_BUDGET", "30"))
+RAW_OUT = "discovery_daemon_raw.ndjson"
+SCORED_OUT = "discovery_daemon_scored.ndjson"
+ENRICH_BATCH_SIZE = 50
+FRONTIER_SOURCE = "discovery_daemon"
+
+CYCLES = metrics.counter("founder_discovery_cycles_total", "Discovery cycles by outcome", ["outcome"])
+DISCOVERED = metrics.counter("founder_discovery_new_profiles_total", "New identifiers found by discovery cycles")
+LAST_CYCLE_SECONDS = metrics.gauge("founder_discovery_last_cycle_seconds", "Duration of the last discovery cycle")
+
+
+def load_plan(which: str) -> List[Tuple[str, str]]:
+    """(template, query) pairs of the query set (stealth queries share one template)."""
+    plan: List[Tuple[str, str]] = []
+    if which in ("stealth", "all"):
+        from serpapi_to_apify import QUERIES
+        plan.extend(("stealth", q) for q in QUERIES)
+    if which in ("indian", "all"):
+        from indian_founders_discovery import generate_search_query_plan
+        plan.extend(generate_search_query_plan())
+    # One entry per query string (first template wins)
+    return list({q: (t, q) for t, q in reversed(plan)}.values())[::-1]
+
+
+def discover_new(plan: List[Tuple[str, str]], frontier: UrlFrontier, budget: int = SEARCH_BUDGET,
+                 max_pages: int = MAX_PAGES) -> Dict[str, Any]:
+    """Spend up to `budget` searches on the queries QueryScheduler ranks best.
+
+    The scheduler picks each search (query and results page) by its
+    new-profiles-per-credit record over all runs and gets every page's
+    yield back; a query stays on the next page while pages hold new
+    profiles and drops out of this cycle at the first page that holds none.
+
+    Returns new canonical URLs (one per person), the collapsed near-duplicate
+    URLs (dropped URL -> kept URL) and the number of searches."""
+    from near_duplicates import dedupe_serp
+    from query_scheduler import QueryScheduler
+    from serpapi_to_apify import RESULTS_PER_PAGE, extract_linkedin_urls_from_serp, extract_serp_entries, serpapi_search
+
+    new_ids: Dict[str, None] = {}
+    entries: Dict[str, Dict[str, str]] = {}
+    searches = 0
+
+    def is_new(url: str) -> bool:
+        pid = canonicalize(url)
+        if not pid or pid in new_ids or frontier.seen(canonical_url(pid)):
+            return False
+        new_ids[pid] = None
+        return True
+
+    scheduler = QueryScheduler(plan, is_new=is_new, max_page=max_pages)
+    try:
+        for i in range(budget):
+            pick = scheduler.next_query()
+            if pick is None:
+                print("   ↳ No live queries left (all used or pruned)")
+                break
+            try:
+                result = serpapi_search(pick.query, start=pick.page * RESULTS_PER_PAGE)
+            except Exception as e:
+                print(f"   ↳ [{i + 1}/{budget}] search error: {e}")
+                continue
+            searches += 1
+            urls = extract_linkedin_urls_from_serp(result)
+            for url, entry in extract_serp_entries(result).items():
+                entries.setdefault(url, entry)
+            last_page = len(result.get("organic_results") or []) < RESULTS_PER_PAGE
+            new = scheduler.record(pick, urls, credits=1, last_page=last_page)
+            print(f"🔎 [{i + 1}/{budget}] [{pick.template}] page {pick.page + 1}: {len(urls)} profiles, "
+                  f"{new} new — {pick.query[:60]}")
+            time.sleep(1.5)
+    finally:
+        scheduler.close()
+    urls, near_dups = dedupe_serp({u: entries.get(u, {}) for u in (canonical_url(pid) for pid in new_ids)})
+    if near_dups:
+        print(f"🧬 {len(near_dups)} new URLs are near-duplicates of another new person; not enriched")
+    return {"urls": urls, "near_duplicates": near_dups, "searches": searches}
+
+
+def enrich(urls: List[str], use_celery: bool = False) -> List[Dict[str, Any]]:
+    if use_celery:
+        from enrichment_tasks import enqueue_and_collect
+        return enqueue_and_collect(urls, batch_size=ENRICH_BATCH_SIZE)
+    from apify_apimaestro_pipeline import call_apimaestro
+    items: List[Dict[str, Any]] = []
+    for i in range(0, len(urls), ENRICH_BATCH_SIZE):
+        batch = urls[i:i + ENRICH_BATCH_SIZE]
+        try:
+            got = call_apimaestro(batch, include_email=True)
+        except Exception as e:
+            print(f"   ↳ Enrichment error (batch {i // ENRICH_BATCH_SIZE + 1}): {e}")
+            continue
+        items.extend(got if isinstance(got, list) else [got])
+    return items
+
+
+def _append_ndjson(path: str, rows: List[Dict[str, Any]]) -> None:
+    with open(path, "a") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def run_cycle(plan: List[Tuple[str, str]], use_celery: bool = False, db_url: Optional[str] = None,
+              max_pages: int = MAX_PAGES, budget: int = SEARCH_BUDGET) -> Dict[str, int]:
+    """One discovery -> enrichment -> scoring pass over only the new identifiers."""
+    from score_apimaestro import score_profile
+
+    started = time.time()
+    print(f"\n🕒 Discovery cycle at {time.strftime('%Y-%m-%d %H:%M:%S')} "
+          f"({len(plan)} queries, budget {budget} searches)")
+    frontier = UrlFrontier()
+    try:
+        found = discover_new(plan, frontier, budget, max_pages)
+        urls = found["urls"]
+        full_cost = len(plan) * max_pages
+        print(f"🆕 {len(urls)} new profiles from {found['searches']} searches "
+              f"(a full re-run would be up to {full_cost})")
+        DISCOVERED.inc(len(urls))
+        if not urls:
+            return {"searches": found["searches"], "new": 0, "enriched": 0, "scored": 0}
+
+        items = [it for it in enrich(urls, use_celery) if isinstance(it, dict)]
+        profiles = [it for it in items if not is_failed(it)]
+        records = [normalize_profile(it, FRONTIER_SOURCE) for it in profiles]
+        scored = [score_profile(rec) for rec in records]
+
+        # Only now are the identifiers known for good: anything Apify answered for (even
+        # "no profile found") is recorded; unanswered ones get rediscovered next cycle
+        answered = {profile_id(it) for it in items}
+        for url in urls:
+            if canonicalize(url) in answered:
+                frontier.add(url, source=FRONTIER_SOURCE)
+        # A collapsed near-duplicate is settled with its person (reversible:
+        # url_frontier.py --release-near-dups), or it would come back as new next cycle
+        frontier.add_near_duplicates(found["near_duplicates"], answered)
+        frontier.flush()
+    finally:
+        frontier.close()
+
+    _append_ndjson(RAW_OUT, items)
+    _append_ndjson(SCORED_OUT, scored)
+    from lookalike_index import update_index
+    update_index(records)
+    tiers = Counter(r["tier"] for r in scored)
+    print(f"✅ Enriched {len(profiles)}/{len(urls)}, tiers A={tiers['A']} B={tiers['B']} C={tiers['C']} "
+          f"-> {RAW_OUT}, {SCORED_OUT} ({time.time() - started:.0f}s)")
+    if db_url is not None and records:
+        from profile_store import store_scored_run
+        run_id = store_scored_run(records, scored, scorer="apimaestro", source=FRONTIER_SOURCE, db_url=db_url or None)
+        # Seed fetch times + content hashes for change-driven re-enrichment (reenrich_planner.py)
+        from sqlalchemy.orm import Session
+        from profile_store import get_engine
+        from reenrich_planner import record_fetches
+        with Session(get_engine(db_url or None)) as session, session.begin():
+            record_fetches(session, records)
+        print(f"🗃️ Upserted {len(scored)} profiles into profile store (run {run_id})")
+    return {"searches": found["searches"], "new": len(urls), "enriched": len(profiles), "scored": len(scored)}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scheduled incremental discovery")
+    parser.add_argument("--queries", choices=["stealth", "indian", "all"], default="all")
+    parser.add_argument("--interval-hours", type=float, default=INTERVAL_HOURS)
+    parser.add_argument("--max-pages", type=int, default=MAX_PAGES, help="Page cap per query")
+    parser.add_argument("--budget", type=int, default=SEARCH_BUDGET, help="SerpAPI searches per cycle")
+    parser.add_argument("--once", action="store_true", help="Run a single cycle and exit")
+    parser.add_argument("--celery", action="store_true", help="Enrich through Celery workers")
+    parser.add_argument("--db", nargs="?", const="", default=None, metavar="URL",
+                        help="Also upsert into the profile store (default URL: DATABASE_URL)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    plan = load_plan(args.queries)
+
+    def job():
+        started = time.time()
+        try:
+            run_cycle(plan, use_celery=args.celery, db_url=args.db, max_pages=args.max_pages, budget=args.budget)
+            CYCLES.inc(outcome="ok")
+        except Exception as e:
+            # Keep the daemon alive; the next cycle retries everything not yet in the frontier
+            print(f"❌ Cycle failed: {e}")
+            CYCLES.inc(outcome="failed")
+        LAST_CYCLE_SECONDS.set(time.time() - started)
+
+    if not args.once:
+        metrics.serve()
+    job()
+    if args.once:
+        return
+    schedule.every(args.interval_hours).hours.do(job)
+    print(f"⏰ Next cycle in {args.interval_hours:g}h (Ctrl+C to stop)")
+    try:
+        while True:
+            schedule.run_pending()
+            time.sleep(30)
+    except KeyboardInterrupt:
+        print("👋 Discovery daemon stopped")
+
+
+if __name__ == "__main__":
+    main()
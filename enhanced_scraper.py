@@ -2,6 +2,7 @@
 """
 Enhanced LinkedIn Profile Scraper
 Works with discovered profiles and extracts comprehensive data
+HTTP fetch, HTML parse and extraction are timed (pipeline_timing.py)
 """
 
 import requests
@@ -13,6 +14,9 @@ import argparse
 from bs4 import BeautifulSoup
 from typing import Dict, List, Any
 
+import pipeline_timing
+from pipeline_timing import count, span
+
 def scrape_linkedin_profile(url: str) -> Dict[str, Any]:
     """Enhanced LinkedIn profile scraper"""
     try:
@@ -27,32 +31,36 @@ def scrape_linkedin_profile(url: str) -> Dict[str, Any]:
         
         print(f"🔍 Scraping: {url}")
         
-        response = requests.get(url, headers=headers, timeout=10)
+        with span("http.get"):
+            response = requests.get(url, headers=headers, timeout=10)
+        count(f"http.status.{response.status_code}")
         
         if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
+            with span("html.parse"):
+                soup = BeautifulSoup(response.content, 'html.parser')
             
-            # Extract comprehensive information
-            profile_data = {
-                'linkedin_url': url,
-                'name': extract_name(soup),
-                'headline': extract_headline(soup),
-                'location': extract_location(soup),
-                'summary': extract_summary(soup),
-                'experience_data': extract_experience(soup),
-                'education_data': extract_education(soup),
-                'skills_data': extract_skills(soup),
-                'connection_count': extract_connection_count(soup),
-                'follower_count': extract_follower_count(soup),
-                'achievements': extract_achievements(soup),
-                'volunteer_experience': extract_volunteer(soup),
-                'certifications': extract_certifications(soup),
-                'publications': extract_publications(soup),
-                'projects': extract_projects(soup),
-                'languages': extract_languages(soup),
-                'interests': extract_interests(soup),
-                'raw_html': response.text[:1000]  # Store first 1000 chars for debugging
-            }
+            with span("extract"):
+                # Extract comprehensive information
+                profile_data = {
+                    'linkedin_url': url,
+                    'name': extract_name(soup),
+                    'headline': extract_headline(soup),
+                    'location': extract_location(soup),
+                    'summary': extract_summary(soup),
+                    'experience_data': extract_experience(soup),
+                    'education_data': extract_education(soup),
+                    'skills_data': extract_skills(soup),
+                    'connection_count': extract_connection_count(soup),
+                    'follower_count': extract_follower_count(soup),
+                    'achievements': extract_achievements(soup),
+                    'volunteer_experience': extract_volunteer(soup),
+                    'certifications': extract_certifications(soup),
+                    'publications': extract_publications(soup),
+                    'projects': extract_projects(soup),
+                    'languages': extract_languages(soup),
+                    'interests': extract_interests(soup),
+                    'raw_html': response.text[:1000]  # Store first 1000 chars for debugging
+                }
             
             if profile_data['name']:
                 print(f"✅ Success: {profile_data['name']}")
@@ -548,7 +556,8 @@ def main():
             results.append(profile_data)
         
         # Random delay to be respectful
-        time.sleep(random.uniform(2, 4))
+        with span("sleep"):
+            time.sleep(random.uniform(2, 4))
     
     print("\n" + "=" * 50)
     print("SCRAPING RESULTS")
@@ -575,4 +584,5 @@ def main():
         print(f"\n💾 Enhanced results saved to: enhanced_scraped_profiles.json")
 
 if __name__ == "__main__":
-    main()
+    with pipeline_timing.run("enhanced_scraper"):
+        main()
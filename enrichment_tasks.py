@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Distributed Enrichment Workers (Celery + Redis)
+===============================================
+
+Task-queue mode for the apimaestro full-sections enrichment: URL batches
+become Celery tasks, Redis is broker and result backend, and any number of
+workers on any number of machines drain the queue.
+
+- Idempotent per person: before fetching, a worker claims each public
+  identifier with SET NX (expiring, so a crashed worker's claims lapse).
+  Fetched items are kept in Redis for ENRICH_RESULT_TTL seconds; a URL
+  whose item is already there is answered from Redis, and a URL another
+  worker is fetching right now is left to that worker; enqueue_and_collect
+  then waits (up to ENRICH_CLAIM_TTL) for its item to land in Redis
+- Shared rate limit: every Apify call takes a slot in a Redis fixed-window
+  counter (ENRICH_CALLS_PER_MINUTE across all workers), so adding workers
+  never exceeds the account's limits
+- Results are aggregated as tasks complete (enqueue_and_collect), not in
+  submission order
+- Each worker process serves its metrics (metrics.py: profiles enriched,
+  in-flight Apify runs, HTTP statuses, rate-limit waits) on METRICS_PORT
+  or the next free port after it
+
+Run:
+    celery -A enrichment_tasks worker --loglevel=info --concurrency=4
+    python apify_apimaestro_pipeline.py --celery
+
+Tests / single machine: ENRICH_BROKER_URL=memory:// ENRICH_STATE_URL=memory://
+CELERY_TASK_ALWAYS_EAGER=1 runs tasks in-process with in-memory state.
+
+Env overrides: REDIS_URL, ENRICH_BROKER_URL, ENRICH_BACKEND_URL,
+ENRICH_STATE_URL, ENRICH_CALLS_PER_MINUTE, ENRICH_RESULT_TTL,
+ENRICH_CLAIM_TTL, CELERY_TASK_ALWAYS_EAGER
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Any, Dict, List, Optional
+
+import redis
+import requests
+from celery import Celery
+from celery.signals import worker_process_init
+from dotenv import load_dotenv
+
+import metrics
+from metrics import RATE_LIMIT_WAIT
+from profile_merge import is_failed, profile_id
+from url_frontier import canonicalize, unique_profile_urls
+
+load_dotenv()
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+BROKER_URL = os.getenv("ENRICH_BROKER_URL", f"{REDIS_URL}/0")
+BACKEND_URL = os.getenv("ENRICH_BACKEND_URL", "cache+memory://" if BROKER_URL.startswith("memory://") else f"{REDIS_URL}/1")
+STATE_URL = os.getenv("ENRICH_STATE_URL", f"{REDIS_URL}/2")
+CALLS_PER_MINUTE = int(os.getenv("ENRICH_CALLS_PER_MINUTE", "20"))
+RESULT_TTL = int(os.getenv("ENRICH_RESULT_TTL", str(7 * 24 * 3600)))
+CLAIM_TTL = int(os.getenv("ENRICH_CLAIM_TTL", "900"))
+KEY_PREFIX = "enrich"
+
+app = Celery("enrichment_tasks", broker=BROKER_URL, backend=BACKEND_URL)
+app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    result_expires=24 * 3600,
+    task_always_eager=os.getenv("CELERY_TASK_ALWAYS_EAGER", "").lower() in ("1", "true", "yes"),
+)
+
+
+class MemoryState:
+    """In-process stand-in for the few Redis commands used here (single-machine runs and tests)."""
+
+    def __init__(self):
+        self._data: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key: str) -> bool:
+        exp = self._expires.get(key)
+        if exp is not None and exp <= time.time():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    def set(self, key: str, value: Any, nx: bool = False, ex: Optional[int] = None) -> Optional[bool]:
+        with self._lock:
+            if nx and self._live(key):
+                return None
+            self._data[key] = value
+            if ex:
+                self._expires[key] = time.time() + ex
+            else:
+                self._expires.pop(key, None)
+            return True
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            return self._data.get(key) if self._live(key) else None
+
+    def mget(self, keys: List[str]) -> List[Any]:
+        return [self.get(k) for k in keys]
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(1 for k in keys if self._data.pop(k, None) is not None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = int(self._data.get(key, 0) if self._live(key) else 0) + 1
+            self._data[key] = value
+            return value
+
+    def expire(self, key: str, seconds: int) -> bool:
+        with self._lock:
+            self._expires[key] = time.time() + seconds
+            return True
+
+
+_state = None
+
+
+def get_state():
+    """Redis client for claims, items and rate counters (MemoryState for memory://)."""
+    global _state
+    if _state is None:
+        _state = MemoryState() if STATE_URL.startswith("memory://") else redis.Redis.from_url(STATE_URL)
+    return _state
+
+
+class SharedRateLimiter:
+    """Fixed-window call counter in Redis, shared by every worker."""
+
+    def __init__(self, name: str, per_minute: int = CALLS_PER_MINUTE, state=None):
+        self.name = name
+        self.per_minute = max(1, per_minute)
+        self.state = state
+
+    def acquire(self) -> None:
+        """Block until this call fits in the current minute's budget."""
+        state = self.state or get_state()
+        while True:
+            window = int(time.time() // 60)
+            key = f"{KEY_PREFIX}:rate:{self.name}:{window}"
+            count = state.incr(key)
+            if count == 1:
+                state.expire(key, 120)
+            if count <= self.per_minute:
+                return
+            wait = max(0.05, (window + 1) * 60 - time.time())
+            RATE_LIMIT_WAIT.inc(wait, limiter=self.name)
+            time.sleep(wait)
+
+
+APIFY_LIMIT = SharedRateLimiter("apimaestro")
+
+
+@worker_process_init.connect
+def _serve_metrics(**_):
+    # One registry per worker process; each child takes the next free port after METRICS_PORT
+    metrics.serve()
+
+
+def _item_key(pid: str) -> str:
+    return f"{KEY_PREFIX}:item:{pid}"
+
+
+def _claim_key(pid: str) -> str:
+    return f"{KEY_PREFIX}:claim:{pid}"
+
+
+@app.task(bind=True, name="enrichment_tasks.enrich_batch", autoretry_for=(requests.RequestException,),
+          retry_backoff=True, retry_backoff_max=300, max_retries=3)
+def enrich_batch(self, urls: List[str], include_email: bool = True) -> Dict[str, Any]:
+    """Enrich one URL batch; returns {"items", "fetched", "reused", "in_flight"}."""
+    from apify_apimaestro_pipeline import call_apimaestro
+
+    state = get_state()
+    pids = [pid for pid in (canonicalize(u) for u in urls) if pid]
+    cached = state.mget([_item_key(pid) for pid in pids]) if pids else []
+    items: List[Dict[str, Any]] = []
+    to_fetch: List[str] = []
+    in_flight: List[str] = []
+    for pid, raw in zip(pids, cached):
+        if raw is not None:
+            items.append(json.loads(raw))
+        elif state.set(_claim_key(pid), self.request.id or "local", nx=True, ex=CLAIM_TTL):
+            to_fetch.append(pid)
+        else:
+            in_flight.append(pid)
+    reused = len(items)
+
+    if to_fetch:
+        APIFY_LIMIT.acquire()
+        try:
+            fetched = call_apimaestro([f"https://www.linkedin.com/in/{pid}" for pid in to_fetch], include_email)
+        except Exception:
+            # Let a retry (or another worker) claim these again
+            state.delete(*[_claim_key(pid) for pid in to_fetch])
+            raise
+        fetched = fetched if isinstance(fetched, list) else [fetched]
+        stored = set()
+        for item in fetched:
+            if not isinstance(item, dict):
+                continue
+            items.append(item)
+            pid = profile_id(item)
+            if pid and pid in to_fetch and not is_failed(item):
+                state.set(_item_key(pid), json.dumps(item), ex=RESULT_TTL)
+                stored.add(pid)
+        # Failed or missing profiles stay retryable
+        unstored = [_claim_key(pid) for pid in to_fetch if pid not in stored]
+        if unstored:
+            state.delete(*unstored)
+
+    return {"items": items, "fetched": len(items) - reused, "reused": reused, "in_flight": in_flight}
+
+
+def _await_in_flight(pids: List[str], timeout: float = CLAIM_TTL,
+                     poll_interval: float = 1.0) -> List[Dict[str, Any]]:
+    """Items for profiles another worker was fetching, read from Redis as they land.
+
+    A pid is given up when its claim is released without an item (that fetch
+    failed) or after `timeout` seconds (the claim would have lapsed by then)."""
+    state = get_state()
+    waiting = list(dict.fromkeys(pids))
+    items: List[Dict[str, Any]] = []
+    deadline = time.time() + timeout
+    while waiting:
+        raws = state.mget([_item_key(pid) for pid in waiting])
+        claims = state.mget([_claim_key(pid) for pid in waiting])
+        still_waiting = []
+        for pid, raw, claim in zip(waiting, raws, claims):
+            if raw is not None:
+                items.append(json.loads(raw))
+            elif claim is not None:
+                still_waiting.append(pid)
+        waiting = still_waiting
+        if not waiting or time.time() >= deadline:
+            break
+        time.sleep(poll_interval)
+    if waiting:
+        print(f"⚠️ {len(waiting)} in-flight profiles did not arrive within {timeout:.0f}s")
+    return items
+
+
+def enqueue_and_collect(urls: List[str], batch_size: int = 50, include_email: bool = True,
+                        poll_interval: float = 1.0) -> List[Dict[str, Any]]:
+    """Queue URL batches and gather items as each task finishes (completion order).
+
+    Profiles that were in flight in another worker are read back from Redis
+    once that worker stores them."""
+    urls = unique_profile_urls(urls)
+    batches = [urls[i:i + batch_size] for i in range(0, len(urls), batch_size)]
+    pending = [enrich_batch.delay(batch, include_email) for batch in batches]
+    print(f"📨 Queued {len(pending)} enrichment tasks ({len(urls)} profiles)")
+
+    items: List[Dict[str, Any]] = []
+    done = 0
+    totals = {"fetched": 0, "reused": 0, "in_flight": 0}
+    in_flight: List[str] = []
+    while pending:
+        still_pending = []
+        for result in pending:
+            if not result.ready():
+                still_pending.append(result)
+                continue
+            done += 1
+            if result.failed():
+                print(f"   ↳ Task {done}/{len(batches)} failed: {result.result}")
+                continue
+            out = result.get()
+            items.extend(out["items"])
+            totals["fetched"] += out["fetched"]
+            totals["reused"] += out["reused"]
+            in_flight.extend(out["in_flight"])
+            print(f"   ↳ Task {done}/{len(batches)}: {len(out['items'])} items "
+                  f"({out['reused']} from cache, {len(out['in_flight'])} in flight elsewhere)")
+        pending = still_pending
+        if pending:
+            time.sleep(poll_interval)
+    if in_flight:
+        print(f"⏳ Waiting for {len(in_flight)} profiles in flight elsewhere")
+        arrived = _await_in_flight(in_flight, poll_interval=poll_interval)
+        items.extend(arrived)
+        totals["in_flight"] = len(arrived)
+    print(f"✅ Enrichment done: {totals['fetched']} fetched, {totals['reused']} reused, "
+          f"{totals['in_flight']} from other runs")
+    return items
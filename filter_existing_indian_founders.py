@@ -2,91 +2,82 @@
 """
 Filter Existing Data for Indian Founders - Health & Consumer Tech
 Filters existing apimaestro_batch_raw.json for Indian founders in specific verticals
+and hands the result straight to the scorer (score_indian_founders.run_scoring)
 """
 
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-def filter_indian_health_consumer_profiles() -> List[Dict[str, Any]]:
-    """Filter existing profiles for Indian founders in health/consumer tech"""
-    
-    # Load existing data
+from region_classifier import build_indian_founder_classifier
+from score_indian_founders import run_scoring
+from summary_stats import SummaryAccumulator
+
+# Entries kept for high-cardinality summary fields (locations, companies, schools)
+SUMMARY_TOP_N = 50
+
+# Health and Consumer Tech Keywords
+HEALTH_KEYWORDS = [
+    "healthtech", "health tech", "healthcare", "health care", "medical", "pharma",
+    "telemedicine", "tele-medicine", "digital health", "mental health", "fitness",
+    "wellness", "nutrition", "diagnostics", "biotech", "biotechnology", "clinical",
+    "patient care", "hospital", "clinic", "doctor", "physician", "nurse",
+    "medical device", "health insurance", "healthcare platform", "health app"
+]
+
+CONSUMER_TECH_KEYWORDS = [
+    "consumer tech", "consumer technology", "e-commerce", "ecommerce", "marketplace",
+    "retail tech", "retail technology", "fashion tech", "food tech", "foodtech",
+    "fintech", "financial technology", "payments", "banking", "lending",
+    "insurance tech", "insurtech", "real estate", "proptech", "property tech",
+    "travel tech", "traveltech", "education tech", "edtech", "learning",
+    "entertainment", "gaming", "media", "content", "social", "mobile app",
+    "consumer app", "B2C", "direct to consumer", "D2C", "subscription"
+]
+
+AI_KEYWORDS = [
+    "ai", "artificial intelligence", "machine learning", "ml", "deep learning",
+    "computer vision", "nlp", "natural language processing", "predictive analytics",
+    "data science", "algorithm", "automation", "intelligent", "smart"
+]
+
+# Region/vertical keyword classifier, compiled once
+CLASSIFIER = build_indian_founder_classifier(HEALTH_KEYWORDS, CONSUMER_TECH_KEYWORDS, AI_KEYWORDS)
+
+def load_profiles(path: str = "apimaestro_batch_raw.json") -> List[Dict[str, Any]]:
+    """Load raw profiles, or [] if the file is missing"""
     try:
-        with open("apimaestro_batch_raw.json", "r") as f:
-            all_profiles = json.load(f)
+        with open(path, "r") as f:
+            return json.load(f)
     except FileNotFoundError:
-        print("❌ apimaestro_batch_raw.json not found")
+        print(f"❌ {path} not found")
+        return []
+
+def filter_indian_health_consumer_profiles(all_profiles: Optional[List[Dict[str, Any]]] = None,
+                                           summary: Optional[SummaryAccumulator] = None) -> List[Dict[str, Any]]:
+    """Filter profiles (default: apimaestro_batch_raw.json) for Indian founders in health/consumer tech.
+    Kept profiles are also folded into `summary` when given, saving a separate pass."""
+    
+    if all_profiles is None:
+        all_profiles = load_profiles()
+    if not all_profiles:
         return []
     
     print(f"📊 Processing {len(all_profiles)} existing profiles...")
     
-    # Health and Consumer Tech Keywords
-    HEALTH_KEYWORDS = [
-        "healthtech", "health tech", "healthcare", "health care", "medical", "pharma",
-        "telemedicine", "tele-medicine", "digital health", "mental health", "fitness",
-        "wellness", "nutrition", "diagnostics", "biotech", "biotechnology", "clinical",
-        "patient care", "hospital", "clinic", "doctor", "physician", "nurse",
-        "medical device", "health insurance", "healthcare platform", "health app"
-    ]
-    
-    CONSUMER_TECH_KEYWORDS = [
-        "consumer tech", "consumer technology", "e-commerce", "ecommerce", "marketplace",
-        "retail tech", "retail technology", "fashion tech", "food tech", "foodtech",
-        "fintech", "financial technology", "payments", "banking", "lending",
-        "insurance tech", "insurtech", "real estate", "proptech", "property tech",
-        "travel tech", "traveltech", "education tech", "edtech", "learning",
-        "entertainment", "gaming", "media", "content", "social", "mobile app",
-        "consumer app", "B2C", "direct to consumer", "D2C", "subscription"
-    ]
-    
-    AI_KEYWORDS = [
-        "ai", "artificial intelligence", "machine learning", "ml", "deep learning",
-        "computer vision", "nlp", "natural language processing", "predictive analytics",
-        "data science", "algorithm", "automation", "intelligent", "smart"
-    ]
-    
     filtered_profiles = []
     indian_count = 0
     
-    for profile in all_profiles:
+    for profile, flags in zip(all_profiles, CLASSIFIER.classify_many(all_profiles)):
         if not profile:
             continue
-            
-        # Extract text content for analysis
-        headline = profile.get("headline", "").lower()
-        about = profile.get("about", "").lower()
-        location = profile.get("location", "").lower()
-        experience = profile.get("experience", [])
-        education = profile.get("education", [])
-        
-        # Check for Indian indicators
-        indian_indicators = [
-            "india", "indian", "bangalore", "mumbai", "delhi", "hyderabad", 
-            "chennai", "pune", "gurgaon", "noida", "ahmedabad", "kolkata",
-            "iit", "iim", "bits", "nit", "indian institute"
-        ]
         
-        is_indian = any(indicator in location or indicator in about for indicator in indian_indicators)
-        
-        if is_indian:
+        if flags["is_indian"]:
             indian_count += 1
             
-            # Check for health/consumer tech indicators
-            health_indicators = [kw.lower() for kw in HEALTH_KEYWORDS]
-            consumer_indicators = [kw.lower() for kw in CONSUMER_TECH_KEYWORDS]
-            ai_indicators = [kw.lower() for kw in AI_KEYWORDS]
-            
-            has_health = any(indicator in headline or indicator in about for indicator in health_indicators)
-            has_consumer = any(indicator in headline or indicator in about for indicator in consumer_indicators)
-            has_ai = any(indicator in headline or indicator in about for indicator in ai_indicators)
-            
-            # Check for founder/startup indicators
-            founder_indicators = [
-                "founder", "co-founder", "cofounder", "ceo", "startup", "building", 
-                "stealth", "working on", "exploring", "launching"
-            ]
-            
-            is_founder = any(indicator in headline or indicator in about for indicator in founder_indicators)
+            has_health = flags["has_health"]
+            has_consumer = flags["has_consumer"]
+            has_ai = flags["has_ai"]
+            is_founder = flags["is_founder"]
             
             # Filter criteria: Indian + (Health OR Consumer) + Founder
             if (has_health or has_consumer) and is_founder:
@@ -108,80 +99,81 @@ def filter_indian_health_consumer_profiles() -> List[Dict[str, Any]]:
                 profile["has_consumer"] = has_consumer
                 
                 filtered_profiles.append(profile)
+                if summary is not None:
+                    summarize_profile(summary, profile)
     
     print(f"🇮🇳 Found {indian_count} Indian profiles out of {len(all_profiles)} total")
     print(f"🎯 Filtered to {len(filtered_profiles)} Indian health/consumer founders")
     
     return filtered_profiles
 
+def summarize_profile(acc: SummaryAccumulator, profile: Dict[str, Any]) -> None:
+    """Fold one filtered profile into the running summary"""
+    acc.row()
+    
+    # Count categories
+    for category in profile.get("categories", []):
+        acc.count("categories", category)
+    
+    # Count locations
+    acc.heavy("locations", profile.get("location", "Unknown"))
+    
+    # Count AI adoption
+    acc.count("ai_adoption", "with_ai" if profile.get("has_ai") else "without_ai")
+    
+    # Count focus areas
+    has_health = profile.get("has_health", False)
+    has_consumer = profile.get("has_consumer", False)
+    
+    if has_health and has_consumer:
+        acc.count("focus_areas", "both")
+    elif has_health:
+        acc.count("focus_areas", "health")
+    elif has_consumer:
+        acc.count("focus_areas", "consumer")
+    
+    # Count top companies
+    for exp in profile.get("experience", []):
+        acc.heavy("companies", exp.get("company", ""))
+    
+    # Count top schools
+    for edu in profile.get("education", []):
+        acc.heavy("schools", edu.get("school", ""))
+
+def build_summary(acc: SummaryAccumulator) -> Dict[str, Any]:
+    """Summary statistics from a filled accumulator (top-N lists are highest first)"""
+    return {
+        "total_profiles": acc.rows,
+        "categories": acc.counter("categories"),
+        "locations": acc.top("locations", SUMMARY_TOP_N),
+        "ai_adoption": {"with_ai": 0, "without_ai": 0, **acc.counter("ai_adoption")},
+        "focus_areas": {"health": 0, "consumer": 0, "both": 0, **acc.counter("focus_areas")},
+        "top_companies": acc.top("companies", SUMMARY_TOP_N),
+        "top_schools": acc.top("schools", SUMMARY_TOP_N)
+    }
+
 def generate_summary(filtered_profiles: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Generate summary statistics"""
-    summary = {
-        "total_profiles": len(filtered_profiles),
-        "categories": {},
-        "locations": {},
-        "ai_adoption": {"with_ai": 0, "without_ai": 0},
-        "focus_areas": {"health": 0, "consumer": 0, "both": 0},
-        "top_companies": {},
-        "top_schools": {}
-    }
-    
+    acc = SummaryAccumulator()
     for profile in filtered_profiles:
-        # Count categories
-        for category in profile.get("categories", []):
-            summary["categories"][category] = summary["categories"].get(category, 0) + 1
-        
-        # Count locations
-        location = profile.get("location", "Unknown")
-        summary["locations"][location] = summary["locations"].get(location, 0) + 1
-        
-        # Count AI adoption
-        if profile.get("has_ai"):
-            summary["ai_adoption"]["with_ai"] += 1
-        else:
-            summary["ai_adoption"]["without_ai"] += 1
-        
-        # Count focus areas
-        has_health = profile.get("has_health", False)
-        has_consumer = profile.get("has_consumer", False)
-        
-        if has_health and has_consumer:
-            summary["focus_areas"]["both"] += 1
-        elif has_health:
-            summary["focus_areas"]["health"] += 1
-        elif has_consumer:
-            summary["focus_areas"]["consumer"] += 1
-        
-        # Count top companies
-        experience = profile.get("experience", [])
-        for exp in experience:
-            company = exp.get("company", "")
-            if company:
-                summary["top_companies"][company] = summary["top_companies"].get(company, 0) + 1
-        
-        # Count top schools
-        education = profile.get("education", [])
-        for edu in education:
-            school = edu.get("school", "")
-            if school:
-                summary["top_schools"][school] = summary["top_schools"].get(school, 0) + 1
-    
-    return summary
+        summarize_profile(acc, profile)
+    return build_summary(acc)
 
-def main():
-    """Main execution function"""
+def filter_and_score(all_profiles: Optional[List[Dict[str, Any]]] = None,
+                     db_url: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Filter, write filter outputs, and score the filtered list in the same process"""
     print("🇮🇳 Filtering Existing Data for Indian Founders - Health & Consumer Tech")
     print("=" * 75)
     
-    # Filter profiles
-    filtered_profiles = filter_indian_health_consumer_profiles()
+    # Filter profiles, accumulating the summary as they pass
+    acc = SummaryAccumulator()
+    filtered_profiles = filter_indian_health_consumer_profiles(all_profiles, summary=acc)
     
     if not filtered_profiles:
         print("❌ No Indian health/consumer founders found. Exiting.")
-        return
+        return []
     
-    # Generate summary
-    summary = generate_summary(filtered_profiles)
+    summary = build_summary(acc)
     
     # Save filtered data
     with open("indian_founders_filtered.json", "w") as f:
@@ -198,29 +190,21 @@ def main():
     print(f"🤖 AI adoption: {summary['ai_adoption']}")
     print(f"🎯 Focus areas: {summary['focus_areas']}")
     
-    # Show top companies and schools
-    top_companies = sorted(summary["top_companies"].items(), key=lambda x: x[1], reverse=True)[:10]
-    top_schools = sorted(summary["top_schools"].items(), key=lambda x: x[1], reverse=True)[:10]
-    
-    print(f"🏢 Top companies: {dict(top_companies)}")
-    print(f"🎓 Top schools: {dict(top_schools)}")
+    # Show top companies and schools (already ranked)
+    print(f"🏢 Top companies: {dict(list(summary['top_companies'].items())[:10])}")
+    print(f"🎓 Top schools: {dict(list(summary['top_schools'].items())[:10])}")
     
     print("\n📁 Output files:")
     print("- indian_founders_filtered.json: Filtered Indian health/consumer founders")
     print("- indian_founders_summary.json: Summary statistics")
     
-    # Run scoring if we have profiles
-    if filtered_profiles:
-        print("\n🎯 Running scoring system...")
-        try:
-            import subprocess
-            result = subprocess.run(["python3", "score_indian_founders.py"], capture_output=True, text=True)
-            print(result.stdout)
-            if result.stderr:
-                print("Warnings:", result.stderr)
-                
-        except Exception as e:
-            print(f"❌ Error running scoring: {e}")
+    # Score the filtered list directly (no re-launch, no re-read)
+    print("\n🎯 Running scoring system...")
+    return run_scoring(filtered_profiles, db_url=db_url)
+
+def main():
+    """Main execution function"""
+    filter_and_score()
 
 if __name__ == "__main__":
     main()
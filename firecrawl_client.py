@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Concurrent Firecrawl Client
+===========================
+
+Replaces one-at-a-time `requests.post(.../scrape)` calls with:
+
+- A pooled requests.Session (keep-alive connection reuse)
+- A configurable in-flight limit plus a shared requests-per-minute bucket
+  (scrape_sync blocks on its own bucket with the same rate)
+- Retry with exponential backoff on 429 / 5xx / network errors,
+  honouring Retry-After when Firecrawl sends it
+- Result caching by URL (ResponseCache namespace "firecrawl")
+- stream(urls): async iterator yielding each result as soon as it lands,
+  so the analysis stage can start before the whole batch is scraped
+
+Results keep the shape used by real_profile_discovery.scrape_linkedin_profile:
+{"url", "success", "data", "html"} or {"url", "success": False, "error"}.
+
+Env overrides: FIRECRAWL_MAX_IN_FLIGHT, FIRECRAWL_RPM
+"""
+
+import os
+import time
+import asyncio
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import HTTP_RESPONSES, IN_FLIGHT
+from rate_limiter import AsyncTokenBucket, TokenBucket
+from response_cache import ResponseCache, make_key
+
+FIRECRAWL_SCRAPE_URL = "https://api.firecrawl.dev/scrape"
+MAX_IN_FLIGHT = int(os.getenv("FIRECRAWL_MAX_IN_FLIGHT", "5"))
+REQUESTS_PER_MINUTE = int(os.getenv("FIRECRAWL_RPM", "60"))
+MAX_RETRIES = 4
+BASE_BACKOFF_SEC = 2.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FirecrawlClient:
+    """Rate-limited, retrying, caching Firecrawl scrape client."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        requests_per_minute: int = REQUESTS_PER_MINUTE,
+        cache: Optional[ResponseCache] = None,
+        timeout: int = 30,
+    ):
+        self.max_in_flight = max(1, max_in_flight)
+        self.requests_per_minute = requests_per_minute
+        self.cache = cache
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_in_flight)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key or os.getenv('FIRECRAWL_API_KEY')}",
+            "Content-Type": "application/json",
+        })
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._bucket: Optional[AsyncTokenBucket] = None
+        self._sync_bucket = TokenBucket(requests_per_minute, capacity=self.max_in_flight, name="firecrawl")
+
+    # ---- single attempt ---------------------------------------------
+
+    def _attempt(self, profile_url: str) -> Tuple[Optional[Dict[str, Any]], Optional[float]]:
+        """One POST. Returns (result, None) when done, or (None, wait_seconds) to retry."""
+        payload = {"url": profile_url, "includeHtml": True, "waitFor": 3000}
+        try:
+            with IN_FLIGHT.track(service="firecrawl"):
+                response = self.session.post(FIRECRAWL_SCRAPE_URL, json=payload, timeout=self.timeout)
+        except requests.RequestException as e:
+            HTTP_RESPONSES.inc(service="firecrawl", status="error")
+            return {"url": profile_url, "success": False, "error": str(e)}, 0.0
+        HTTP_RESPONSES.inc(service="firecrawl", status=response.status_code)
+        if response.status_code == 200:
+            try:
+                data = response.json()
+            except ValueError as e:
+                return {"url": profile_url, "success": False, "error": f"invalid JSON response: {e}"}, None
+            if not isinstance(data, dict):
+                return {"url": profile_url, "success": False, "error": "unexpected JSON response"}, None
+            return {
+                "url": profile_url,
+                "success": True,
+                "data": data.get("data", {}),
+                "html": data.get("html", ""),
+            }, None
+        if response.status_code in RETRY_STATUSES:
+            retry_after = response.headers.get("Retry-After")
+            try:
+                return {"url": profile_url, "success": False, "error": f"HTTP {response.status_code}"}, float(retry_after)
+            except (TypeError, ValueError):
+                return {"url": profile_url, "success": False, "error": f"HTTP {response.status_code}"}, 0.0
+        return {"url": profile_url, "success": False, "error": response.text}, None
+
+    def _cached(self, profile_url: str) -> Optional[Dict[str, Any]]:
+        if self.cache is None:
+            return None
+        return self.cache.get(make_key("firecrawl", profile_url))
+
+    def _store(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        if self.cache is not None and result.get("success"):
+            self.cache.set(make_key("firecrawl", result["url"]), result)
+        return result
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: float) -> float:
+        return max(retry_after, BASE_BACKOFF_SEC * (2 ** attempt))
+
+    # ---- blocking API -----------------------------------------------
+
+    def scrape_sync(self, profile_url: str) -> Dict[str, Any]:
+        cached = self._cached(profile_url)
+        if cached is not None:
+            return cached
+        result: Dict[str, Any] = {}
+        for attempt in range(MAX_RETRIES + 1):
+            self._sync_bucket.acquire()
+            result, retry_after = self._attempt(profile_url)
+            if retry_after is None or attempt == MAX_RETRIES:
+                break
+            time.sleep(self._backoff(attempt, retry_after))
+        return self._store(result)
+
+    # ---- async API --------------------------------------------------
+
+    def _primitives(self) -> Tuple[asyncio.Semaphore, AsyncTokenBucket]:
+        # asyncio primitives are bound to one loop; rebuild them per asyncio.run()
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._bucket = AsyncTokenBucket(self.requests_per_minute, capacity=self.max_in_flight, name="firecrawl")
+        return self._semaphore, self._bucket
+
+    async def scrape(self, profile_url: str) -> Dict[str, Any]:
+        cached = self._cached(profile_url)
+        if cached is not None:
+            return cached
+        semaphore, bucket = self._primitives()
+        result: Dict[str, Any] = {}
+        for attempt in range(MAX_RETRIES + 1):
+            await bucket.acquire()
+            async with semaphore:
+                result, retry_after = await asyncio.to_thread(self._attempt, profile_url)
+            if retry_after is None or attempt == MAX_RETRIES:
+                break
+            # Back off outside the semaphore so other URLs keep their slots
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+        return self._store(result)
+
+    async def stream(self, urls: Iterable[str]) -> AsyncIterator[Dict[str, Any]]:
+        """Scrape all URLs concurrently, yielding results in completion order."""
+        tasks = [asyncio.ensure_future(self.scrape(u)) for u in urls]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                yield await fut
+        finally:
+            for t in tasks:
+                t.cancel()
+
+    def close(self) -> None:
+        self.session.close()
@@ -7,10 +7,18 @@ Targets Indian founders building in specific verticals for Antler
 import os
 import json
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 import requests
 from serpapi import GoogleSearch
 
+from query_scheduler import QueryScheduler
+from region_classifier import build_indian_founder_classifier
+from profile_merge import profile_id
+from url_frontier import UrlFrontier, canonicalize, unique_profile_urls
+
+# Search budget per run (SerpAPI credits, one per results page)
+SEARCH_BUDGET = int(os.getenv("DISCOVERY_SEARCH_BUDGET", "30"))
+
 # API Keys
 SERPAPI_KEY = os.getenv("SERPAPI_KEY")
 APIFY_TOKEN = os.getenv("APIFY_TOKEN")
@@ -49,9 +57,12 @@ AI_KEYWORDS = [
     "data science", "algorithm", "automation", "intelligent", "smart"
 ]
 
-def generate_search_queries() -> List[str]:
-    """Generate targeted search queries for Indian founders in health/consumer tech"""
-    queries = []
+# Region/vertical keyword classifier, compiled once
+CLASSIFIER = build_indian_founder_classifier(HEALTH_KEYWORDS, CONSUMER_TECH_KEYWORDS, AI_KEYWORDS)
+
+def generate_search_query_plan() -> List[Tuple[str, str]]:
+    """Targeted (template, query) pairs for Indian founders in health/consumer tech"""
+    plan = []
     
     # Base patterns for Indian founders
     base_patterns = [
@@ -66,24 +77,24 @@ def generate_search_queries() -> List[str]:
     # Health-specific queries
     for health_keyword in HEALTH_KEYWORDS[:15]:  # Top 15 health keywords
         for location in INDIAN_LOCATIONS[:10]:   # Top 10 locations
-            queries.append(f'site:linkedin.com/in/ "{health_keyword}" AND "{location}" AND ("founder" OR "building" OR "startup")')
-            queries.append(f'site:linkedin.com/in/ "{health_keyword}" AND "India" AND ("founder" OR "building" OR "startup")')
+            plan.append(("health x city", f'site:linkedin.com/in/ "{health_keyword}" AND "{location}" AND ("founder" OR "building" OR "startup")'))
+            plan.append(("health x india", f'site:linkedin.com/in/ "{health_keyword}" AND "India" AND ("founder" OR "building" OR "startup")'))
     
     # Consumer tech queries
     for consumer_keyword in CONSUMER_TECH_KEYWORDS[:15]:  # Top 15 consumer keywords
         for location in INDIAN_LOCATIONS[:10]:   # Top 10 locations
-            queries.append(f'site:linkedin.com/in/ "{consumer_keyword}" AND "{location}" AND ("founder" OR "building" OR "startup")')
-            queries.append(f'site:linkedin.com/in/ "{consumer_keyword}" AND "India" AND ("founder" OR "building" OR "startup")')
+            plan.append(("consumer x city", f'site:linkedin.com/in/ "{consumer_keyword}" AND "{location}" AND ("founder" OR "building" OR "startup")'))
+            plan.append(("consumer x india", f'site:linkedin.com/in/ "{consumer_keyword}" AND "India" AND ("founder" OR "building" OR "startup")'))
     
     # Health x AI queries
     for health_keyword in HEALTH_KEYWORDS[:10]:
         for ai_keyword in AI_KEYWORDS[:8]:
-            queries.append(f'site:linkedin.com/in/ "{health_keyword}" AND "{ai_keyword}" AND "India" AND ("founder" OR "building" OR "startup")')
+            plan.append(("health x ai", f'site:linkedin.com/in/ "{health_keyword}" AND "{ai_keyword}" AND "India" AND ("founder" OR "building" OR "startup")'))
     
     # Consumer x AI queries
     for consumer_keyword in CONSUMER_TECH_KEYWORDS[:10]:
         for ai_keyword in AI_KEYWORDS[:8]:
-            queries.append(f'site:linkedin.com/in/ "{consumer_keyword}" AND "{ai_keyword}" AND "India" AND ("founder" OR "building" OR "startup")')
+            plan.append(("consumer x ai", f'site:linkedin.com/in/ "{consumer_keyword}" AND "{ai_keyword}" AND "India" AND ("founder" OR "building" OR "startup")'))
     
     # Recent graduates and transitions
     recent_patterns = [
@@ -92,17 +103,43 @@ def generate_search_queries() -> List[str]:
         'site:linkedin.com/in/ ("ex-Flipkart" OR "ex-Paytm" OR "ex-Ola" OR "ex-Swiggy" OR "ex-Zomato") AND ("founder" OR "building" OR "startup")',
     ]
     
-    queries.extend(base_patterns)
-    queries.extend(recent_patterns)
+    plan.extend(("base", q) for q in base_patterns)
+    plan.extend(("recent transitions", q) for q in recent_patterns)
     
-    return list(set(queries))  # Remove duplicates
+    # Remove duplicates (first template wins)
+    seen = set()
+    unique_plan = []
+    for template, query in plan:
+        if query not in seen:
+            seen.add(query)
+            unique_plan.append((template, query))
+    return unique_plan
+
+def generate_search_queries() -> List[str]:
+    """Generate targeted search queries for Indian founders in health/consumer tech"""
+    return [query for _, query in generate_search_query_plan()]
+
+def seed_frontier(frontier: UrlFrontier) -> None:
+    """Make sure profiles enriched in earlier output files count as already seen"""
+    for path in ("indian_founders_raw.json", "apimaestro_full_sections_raw.json", "serpapi_apify_linkedin_raw.json"):
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                try:
+                    items = json.load(f)
+                except json.JSONDecodeError:
+                    continue
+            for item in items if isinstance(items, list) else []:
+                pid = profile_id(item) if isinstance(item, dict) else ""
+                if pid:
+                    frontier.add(f"https://www.linkedin.com/in/{pid}", source=path)
+    frontier.flush()
 
-def search_serpapi(query: str, num_pages: int = 2) -> List[str]:
+def search_serpapi(query: str, num_pages: int = 2, start_page: int = 0) -> List[str]:
     """Search Google via SerpAPI and extract LinkedIn URLs"""
     linkedin_urls = []
     
     try:
-        for page in range(num_pages):
+        for page in range(start_page, start_page + num_pages):
             search = GoogleSearch({
                 "q": query,
                 "api_key": SERPAPI_KEY,
@@ -178,40 +215,15 @@ def filter_indian_health_consumer_profiles(profiles: List[Dict[str, Any]]) -> Li
     """Filter profiles for Indian founders in health/consumer tech"""
     filtered_profiles = []
     
-    for profile in profiles:
+    for profile, flags in zip(profiles, CLASSIFIER.classify_many(profiles)):
         if not profile:
             continue
-            
-        # Extract text content for analysis
-        headline = profile.get("headline", "").lower()
-        about = profile.get("about", "").lower()
-        location = profile.get("location", "").lower()
-        
-        # Check for Indian indicators
-        indian_indicators = [
-            "india", "indian", "bangalore", "mumbai", "delhi", "hyderabad", 
-            "chennai", "pune", "gurgaon", "noida", "ahmedabad", "kolkata",
-            "iit", "iim", "bits", "nit", "indian institute"
-        ]
-        
-        is_indian = any(indicator in location or indicator in about for indicator in indian_indicators)
-        
-        # Check for health/consumer tech indicators
-        health_indicators = [kw.lower() for kw in HEALTH_KEYWORDS]
-        consumer_indicators = [kw.lower() for kw in CONSUMER_TECH_KEYWORDS]
-        ai_indicators = [kw.lower() for kw in AI_KEYWORDS]
-        
-        has_health = any(indicator in headline or indicator in about for indicator in health_indicators)
-        has_consumer = any(indicator in headline or indicator in about for indicator in consumer_indicators)
-        has_ai = any(indicator in headline or indicator in about for indicator in ai_indicators)
         
-        # Check for founder/startup indicators
-        founder_indicators = [
-            "founder", "co-founder", "cofounder", "ceo", "startup", "building", 
-            "stealth", "working on", "exploring", "launching"
-        ]
-        
-        is_founder = any(indicator in headline or indicator in about for indicator in founder_indicators)
+        is_indian = flags["is_indian"]
+        has_health = flags["has_health"]
+        has_consumer = flags["has_consumer"]
+        has_ai = flags["has_ai"]
+        is_founder = flags["is_founder"]
         
         # Filter criteria: Indian + (Health OR Consumer) + (AI OR no AI) + Founder
         if is_indian and (has_health or has_consumer) and is_founder:
@@ -241,21 +253,48 @@ def main():
     
     # Step 1: Generate search queries
     print("\n1️⃣ Generating targeted search queries...")
-    queries = generate_search_queries()
-    print(f"Generated {len(queries)} search queries")
+    plan = generate_search_query_plan()
+    print(f"Generated {len(plan)} search queries")
     
-    # Step 2: Search for LinkedIn URLs
-    print("\n2️⃣ Searching for LinkedIn profiles...")
+    # Step 2: Search for LinkedIn URLs, highest-yield queries first
+    print(f"\n2️⃣ Searching for LinkedIn profiles (budget: {SEARCH_BUDGET} credits)...")
     all_urls = []
+    frontier = UrlFrontier()
+    seed_frontier(frontier)
+    # Novel = not enriched before and not already found this run; nothing is
+    # recorded in the frontier until Apify has answered for it (below)
+    found_ids = set()
+
+    def is_new(url: str) -> bool:
+        pid = canonicalize(url)
+        if not pid or pid in found_ids or frontier.seen(url):
+            return False
+        found_ids.add(pid)
+        return True
+
+    scheduler = QueryScheduler(plan, is_new=is_new)
     
-    for i, query in enumerate(queries[:30]):  # Limit to top 30 queries for speed
-        print(f"Searching query {i+1}/{min(30, len(queries))}: {query[:80]}...")
-        urls = search_serpapi(query, num_pages=1)
+    for i in range(SEARCH_BUDGET):
+        pick = scheduler.next_query()
+        if pick is None:
+            print("No live queries left (all used or pruned)")
+            break
+        print(f"Searching {i+1}/{SEARCH_BUDGET} [{pick.template}] p{pick.page+1}: {pick.query[:80]}...")
+        urls = search_serpapi(pick.query, num_pages=1, start_page=pick.page)
+        new = scheduler.record(pick, urls, credits=1)
+        print(f"   ↳ {len(urls)} URLs, {new} new")
         all_urls.extend(urls)
         time.sleep(1)  # Rate limiting
     
+    print("\n📈 Yield by template (new URLs per credit, all runs):")
+    for template, credits, new_urls, per_credit in scheduler.template_report():
+        if credits:
+            print(f"   {template}: {new_urls} new / {credits} credits = {per_credit:.2f}")
+    scheduler.close()
+    frontier.close()
+    
     # Remove duplicates
-    unique_urls = list(set(all_urls))
+    unique_urls = unique_profile_urls(all_urls)
     print(f"\nFound {len(unique_urls)} unique LinkedIn URLs")
     
     # Save URLs
@@ -266,6 +305,10 @@ def main():
     print("\n3️⃣ Enriching profiles via Apify...")
     enriched_profiles = run_apify_batch_scrape(unique_urls)
     print(f"Enriched {len(enriched_profiles)} profiles")
+    frontier = UrlFrontier()
+    frontier.add_answered(unique_urls, {profile_id(p) for p in enriched_profiles if isinstance(p, dict)},
+                          source="indian_founders_discovery")
+    frontier.close()
     
     # Save raw enriched data
     with open("indian_founders_raw.json", "w") as f:
@@ -10,6 +10,9 @@ import time
 import requests
 from typing import List, Dict, Any
 
+from score_indian_founders import run_scoring
+from url_frontier import canonicalize, unique_profile_urls
+
 # API Keys
 APIFY_TOKEN = os.getenv("APIFY_TOKEN")
 
@@ -23,12 +26,10 @@ def filter_indian_urls() -> List[str]:
         return []
     
     indian_urls = []
-    for url in all_urls:
-        if "in.linkedin.com" in url or "linkedin.com/in/" in url:
-            # Additional check for Indian names/patterns in URL
-            username = url.split("linkedin.com/in/")[-1].split("/")[0].split("?")[0]
-            if username and len(username) > 2:
-                indian_urls.append(url)
+    for url in unique_profile_urls(all_urls):
+        # Additional check for Indian names/patterns in URL
+        if len(canonicalize(url)) > 2:
+            indian_urls.append(url)
     
     print(f"📊 Found {len(indian_urls)} Indian LinkedIn URLs from {len(all_urls)} total URLs")
     return indian_urls
@@ -41,10 +42,9 @@ def run_apify_batch_scrape(profile_urls: List[str]) -> List[Dict[str, Any]]:
     # Extract usernames from URLs
     usernames = []
     for url in profile_urls:
-        if "linkedin.com/in/" in url:
-            username = url.split("linkedin.com/in/")[-1].split("/")[0].split("?")[0]
-            if username and len(username) > 2:
-                usernames.append(username)
+        username = canonicalize(url)
+        if len(username) > 2:
+            usernames.append(username)
     
     if not usernames:
         return []
@@ -261,20 +261,11 @@ def main():
     # Step 5: Run scoring if we have profiles
     if filtered_profiles:
         print("\n5️⃣ Running scoring system...")
-        try:
-            # Save filtered profiles in the format expected by scoring script
-            with open("indian_founders_filtered.json", "w") as f:
-                json.dump(filtered_profiles, f, indent=2)
-            
-            # Run scoring
-            import subprocess
-            result = subprocess.run(["python3", "score_indian_founders.py"], capture_output=True, text=True)
-            print(result.stdout)
-            if result.stderr:
-                print("Warnings:", result.stderr)
-                
-        except Exception as e:
-            print(f"❌ Error running scoring: {e}")
+        # Keep the filtered list on disk for standalone re-scoring
+        with open("indian_founders_filtered.json", "w") as f:
+            json.dump(filtered_profiles, f, indent=2)
+        
+        run_scoring(filtered_profiles, source="indian_founders_filtered_final.json")
 
 if __name__ == "__main__":
     main()
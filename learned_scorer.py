@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Learned Tier Model over Rule Hit Features
+=========================================
+
+The rule weights in score_apimaestro.score_profile (20/10/12/8/9/6/...) are
+hand-set. This fits them instead: every fired rule and matched term is
+already a bit in the profile's explain_bits (score_explain.py), so a scored
+run is a sparse 0/1 feature matrix for free.
+
+- train: explain_bits -> CSR matrix (one column per registered bit), fit a
+  multinomial logistic regression against analyst tier labels, report
+  cross-validated agreement and the strongest weights, export the model
+- The exported model is plain JSON (feature keys, classes, coefficients,
+  intercepts): scoring a batch unpacks the bitsets into a 0/1 matrix
+  (np.unpackbits) and is one matrix multiply plus argmax, no scikit-learn
+  needed at scoring time
+- bench: tier agreement with the rule scorer, and two throughput figures.
+  "bits -> tier" compares summing the rule breakdown against the matmul,
+  with the bits already computed; it does not include the text scan. With
+  --raw, "end to end" times the real scorer (score_profile / score_item /
+  calculate_score) on raw profiles against the learned path. The learned
+  path still runs that scan to get its bits, then adds the matmul.
+
+Labels: a CSV with a profile URL column (url / linkedin_url) and a tier
+column (analyst_tier / label / tier), e.g. a copy of apimaestro_scored.csv
+whose tier column analysts corrected. Without --labels the rule tiers are
+used, which only distills the rules (useful to check the pipeline).
+
+Feature columns are the registry's bit keys; registries are append-only,
+so a model keeps working after new rules are added (their bits are ignored
+until the next fit).
+
+Usage:
+    python learned_scorer.py train --scored apimaestro_scored.json --labels analyst_labels.csv
+    python learned_scorer.py bench --scored apimaestro_scored.json --raw apimaestro_batch_raw.json
+    python learned_scorer.py train --scorer score_and_tier --scored scored_profiles.json --labels analyst_labels.csv
+
+Env override: LEARNED_MODEL_PATH (default learned_scorer_model.json)
+"""
+
+import os
+import csv
+import json
+import time
+import argparse
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from compact_profile import iter_json_array
+from score_explain import SCORER_MODULES, from_hex, get_registry
+from url_frontier import canonicalize
+
+LEARNED_MODEL_PATH = os.getenv("LEARNED_MODEL_PATH", "learned_scorer_model.json")
+TIER_THRESHOLDS = {"apimaestro": ((75, "A"), (60, "B")), "indian_founders": ((75, "A"), (60, "B")),
+                   "score_and_tier": ((7.5, "A"), (6.0, "B"))}
+# Score clamp per scorer (default 0-100); score_and_tier scores 0-10 in steps of 0.05
+SCORE_RANGE = {"score_and_tier": (0.0, 10.0)}
+URL_COLUMNS = ("url", "linkedin_url", "profile_url")
+LABEL_COLUMNS = ("analyst_tier", "label", "tier")
+
+
+def bits_array(bit_values: Iterable[Any], n_features: int) -> np.ndarray:
+    """Dense 0/1 uint8 array, one row per bitset (int or hex); bits >= n_features are dropped."""
+    width = (n_features + 7) // 8
+    mask = (1 << n_features) - 1
+    buf = b"".join((from_hex(v or 0) & mask).to_bytes(width, "little") for v in bit_values)
+    packed = np.frombuffer(buf, dtype=np.uint8).reshape(-1, width)
+    return np.unpackbits(packed, axis=1, bitorder="little")[:, :n_features]
+
+
+def bits_matrix(bit_values: Iterable[Any], n_features: int) -> sp.csr_matrix:
+    """The same rows as a sparse float matrix (for fitting)."""
+    return sp.csr_matrix(bits_array(bit_values, n_features), dtype=np.float32)
+
+
+class LearnedScorer:
+    """Exported linear tier model: tiers = argmax(X @ coef.T + intercept)."""
+
+    def __init__(self, scorer: str, features: List[str], classes: List[str], coef: Any, intercept: Any,
+                 meta: Optional[Dict[str, Any]] = None):
+        self.scorer = scorer
+        self.features = features
+        self.classes = classes
+        coef = np.atleast_2d(np.asarray(coef, dtype=np.float32))
+        intercept = np.atleast_1d(np.asarray(intercept, dtype=np.float32))
+        if len(classes) == 2 and coef.shape[0] == 1:
+            # Binary fits give one row scoring classes[1]; a zero row for classes[0] keeps
+            # argmax and softmax (= the fitted sigmoid) right
+            coef = np.vstack([np.zeros_like(coef), coef])
+            intercept = np.concatenate([np.zeros_like(intercept), intercept])
+        self.coef_t = coef.T.copy()  # (features, classes)
+        self.intercept = intercept
+        self.meta = meta or {}
+
+    def logits(self, bit_values: Iterable[Any]) -> np.ndarray:
+        X = bits_array(bit_values, len(self.features))
+        return X @ self.coef_t + self.intercept
+
+    def predict(self, bit_values: Iterable[Any]) -> List[str]:
+        return [self.classes[i] for i in self.logits(bit_values).argmax(axis=1)]
+
+    def predict_proba(self, bit_values: Iterable[Any]) -> np.ndarray:
+        z = self.logits(bit_values)
+        z -= z.max(axis=1, keepdims=True)
+        p = np.exp(z)
+        return p / p.sum(axis=1, keepdims=True)
+
+    def weights(self) -> Dict[str, Dict[str, float]]:
+        """Per class, feature key -> weight."""
+        return {c: dict(zip(self.features, self.coef_t[:, i].round(4).tolist())) for i, c in enumerate(self.classes)}
+
+    def save(self, path: str = LEARNED_MODEL_PATH) -> None:
+        with open(path, "w") as f:
+            json.dump({"scorer": self.scorer, "features": self.features, "classes": self.classes,
+                       "coef": self.coef_t.T.round(6).tolist(), "intercept": self.intercept.round(6).tolist(),
+                       "meta": self.meta}, f, indent=2)
+
+    @classmethod
+    def load(cls, path: str = LEARNED_MODEL_PATH) -> "LearnedScorer":
+        with open(path, "r") as f:
+            m = json.load(f)
+        return cls(m["scorer"], m["features"], m["classes"], m["coef"], m["intercept"], m.get("meta"))
+
+
+# ---- training data ---------------------------------------------------------
+
+def load_labels(path: str) -> Dict[str, str]:
+    """Canonical identifier -> tier from an analyst CSV."""
+    labels: Dict[str, str] = {}
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        fields = reader.fieldnames or []
+        url_col = next((c for c in URL_COLUMNS if c in fields), None)
+        label_col = next((c for c in LABEL_COLUMNS if c in fields), None)
+        if not url_col or not label_col:
+            raise ValueError(f"{path}: need one of {URL_COLUMNS} and one of {LABEL_COLUMNS} columns")
+        for row in reader:
+            pid = canonicalize(row.get(url_col) or "")
+            tier = (row.get(label_col) or "").strip().upper()
+            if pid and tier:
+                labels[pid] = tier
+    return labels
+
+
+def load_scored(path: str) -> List[Dict[str, Any]]:
+    rows = [r for r in iter_json_array(path) if isinstance(r, dict)]
+    if rows and not any("explain_bits" in r for r in rows):
+        raise ValueError(f"{path} has no explain_bits (re-run the scorer to add them)")
+    return [r for r in rows if "explain_bits" in r]
+
+
+def training_set(rows: List[Dict[str, Any]], labels: Optional[Dict[str, str]]) -> Tuple[List[str], List[str]]:
+    """(explain_bits, label) pairs; rule tiers stand in when no labels are given."""
+    bits, y = [], []
+    for r in rows:
+        tier = labels.get(canonicalize(r.get("url") or "")) if labels is not None else r.get("tier")
+        if tier:
+            bits.append(r["explain_bits"])
+            y.append(tier)
+    return bits, y
+
+
+def train(rows: List[Dict[str, Any]], labels: Optional[Dict[str, str]], scorer: str = "apimaestro",
+          c: float = 1.0) -> Tuple[LearnedScorer, Dict[str, Any]]:
+    """Fit the tier model; returns it and a report (cross-validated agreement when there is enough data)."""
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import StratifiedKFold, cross_val_predict
+
+    registry = get_registry(scorer)
+    bits, y = training_set(rows, labels)
+    counts = Counter(y)
+    if len(counts) < 2:
+        raise ValueError(f"Need at least two tiers among the labels, got {dict(counts)}")
+    X = bits_matrix(bits, len(registry.keys))
+    model = LogisticRegression(C=c, max_iter=2000, class_weight="balanced")
+
+    report: Dict[str, Any] = {"rows": len(y), "labels": dict(counts)}
+    folds = min(5, min(counts.values()))
+    if folds >= 2:
+        cv = StratifiedKFold(n_splits=folds, shuffle=True, random_state=0)
+        predicted = cross_val_predict(model, X, y, cv=cv)
+        report["cv_folds"] = folds
+        report["cv_agreement"] = round(float(np.mean(np.asarray(predicted) == np.asarray(y))), 4)
+    model.fit(X, y)
+    learned = LearnedScorer(scorer, list(registry.keys), [str(c) for c in model.classes_], model.coef_,
+                            model.intercept_, meta={"rows": len(y), "labels": dict(counts),
+                                                    "label_source": "analyst" if labels is not None else "rules"})
+    return learned, report
+
+
+# ---- rule scorer from bits (the benchmark baseline) --------------------------
+
+def rule_tier(scorer: str, breakdown: Dict[str, float]) -> str:
+    low, high = SCORE_RANGE.get(scorer, (0, 100))
+    score = max(low, min(high, round(sum(breakdown.values()), 2)))
+    for threshold, tier in TIER_THRESHOLDS[scorer]:
+        if score >= threshold:
+            return tier
+    return "C"
+
+
+def bench(rows: List[Dict[str, Any]], model: LearnedScorer, repeat: int = 20) -> Dict[str, Any]:
+    """Bits -> tier only: rule breakdown sum vs learned matmul on already-computed bits, `repeat` passes."""
+    registry = get_registry(model.scorer)
+    bits = [from_hex(r["explain_bits"]) for r in rows] * repeat
+
+    start = time.perf_counter()
+    rule = [rule_tier(model.scorer, registry.breakdown(b)) for b in bits]
+    rule_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    learned = model.predict(bits)
+    learned_s = time.perf_counter() - start
+
+    n = len(bits)
+    agree = sum(1 for a, b in zip(rule, learned) if a == b)
+    confusion = Counter(f"{a}→{b}" for a, b in zip(rule[:len(rows)], learned[:len(rows)]) if a != b)
+    return {
+        "profiles": n,
+        "rule_per_sec": round(n / rule_s) if rule_s else None,
+        "learned_per_sec": round(n / learned_s) if learned_s else None,
+        "speedup": round(rule_s / learned_s, 1) if learned_s else None,
+        "tier_agreement": round(agree / n, 4) if n else None,
+        "disagreements": dict(confusion.most_common()),
+    }
+
+
+def profile_scorer(scorer: str) -> Tuple[Callable[[Dict[str, Any]], Any], Callable[[Any], Dict[str, Any]]]:
+    """(prepare, score) for a scorer's raw input: prepare is untimed setup, score the real rule scorer."""
+    if scorer == "indian_founders":
+        from score_indian_founders import calculate_score, extract_signals
+        return (lambda item: item), (lambda p: calculate_score(extract_signals(p), p))
+    from profile_merge import normalize_profile
+    if scorer == "score_and_tier":
+        from score_and_tier import score_item
+        return normalize_profile, score_item
+    from score_apimaestro import score_profile
+    return normalize_profile, score_profile
+
+
+def bench_raw(items: Iterable[Any], model: LearnedScorer, repeat: int = 5) -> Dict[str, Any]:
+    """End to end from raw profiles: the rule scorer vs scanning for bits plus the learned matmul."""
+    prepare, score = profile_scorer(model.scorer)
+    inputs = [prepare(it) for it in items if isinstance(it, dict)] * repeat
+
+    start = time.perf_counter()
+    for x in inputs:
+        score(x)
+    rule_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model.predict([score(x)["explain_bits"] for x in inputs])
+    learned_s = time.perf_counter() - start
+
+    n = len(inputs)
+    return {
+        "profiles": n,
+        "rule_per_sec": round(n / rule_s) if rule_s else None,
+        "learned_per_sec": round(n / learned_s) if learned_s else None,
+        "speedup": round(rule_s / learned_s, 2) if learned_s else None,
+    }
+
+
+def _top_weights(model: LearnedScorer, tier: str, n: int = 8) -> List[Tuple[str, float]]:
+    weights = model.weights().get(tier, {})
+    return sorted(weights.items(), key=lambda kv: -abs(kv[1]))[:n]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train / benchmark a learned tier model over explain bits")
+    parser.add_argument("--model", default=LEARNED_MODEL_PATH, help="Exported model (JSON)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    tr = sub.add_parser("train", help="Fit against analyst labels and export the model")
+    tr.add_argument("--scored", default="apimaestro_scored.json", help="Scored JSON with explain_bits")
+    tr.add_argument("--labels", help="Analyst CSV (url + tier columns); default: the rule tiers")
+    tr.add_argument("--scorer", default="apimaestro", choices=sorted(SCORER_MODULES))
+    tr.add_argument("--c", type=float, default=1.0, help="Inverse regularization strength")
+    bn = sub.add_parser("bench", help="Throughput + agreement vs the rule scorer")
+    bn.add_argument("--scored", default="apimaestro_scored.json", help="Scored JSON with explain_bits")
+    bn.add_argument("--repeat", type=int, default=20, help="Passes over the rows, for stable timings")
+    bn.add_argument("--raw", help="Raw profiles (JSON array) for the end-to-end timing")
+    args = parser.parse_args()
+
+    try:
+        rows = load_scored(args.scored)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+
+    if args.command == "train":
+        labels = load_labels(args.labels) if args.labels else None
+        if labels is None:
+            print("⚠️ No --labels: fitting the rule tiers (distillation only)")
+        try:
+            model, report = train(rows, labels, args.scorer, args.c)
+        except ValueError as e:
+            print(f"❌ {e}")
+            raise SystemExit(1)
+        model.save(args.model)
+        print(f"✅ Trained on {report['rows']} profiles {report['labels']} -> {args.model}")
+        if "cv_agreement" in report:
+            print(f"🎯 {report['cv_folds']}-fold cross-validated agreement: {report['cv_agreement']:.1%}")
+        for tier in model.classes:
+            print(f"   {tier}: " + ", ".join(f"{k} {w:+.2f}" for k, w in _top_weights(model, tier, 6)))
+        return
+
+    if not os.path.exists(args.model):
+        print(f"❌ No model at {args.model} (run: python learned_scorer.py train)")
+        raise SystemExit(1)
+    model = LearnedScorer.load(args.model)
+    result = bench(rows, model, args.repeat)
+    print(f"⏱️ bits -> tier only (bits precomputed, no text scan), {result['profiles']} profiles: "
+          f"rule breakdown {result['rule_per_sec']}/s, learned matmul {result['learned_per_sec']}/s "
+          f"({result['speedup']}x)")
+    if args.raw:
+        e2e = bench_raw(iter_json_array(args.raw), model, max(1, args.repeat // 4))
+        print(f"⏱️ end to end from raw profiles, {e2e['profiles']} profiles: rule scorer {e2e['rule_per_sec']}/s, "
+              f"scan for bits + learned {e2e['learned_per_sec']}/s ({e2e['speedup']}x)")
+    print(f"🎯 Tier agreement with the rule scorer: {result['tier_agreement']:.1%}")
+    if result["disagreements"]:
+        print(f"   rule→learned: {result['disagreements']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Async OpenAI Profile Analysis Pool
+==================================
+
+Runs LLM profile analyses concurrently instead of one blocking call per
+profile with a sleep in between.
+
+- Bounded concurrency (asyncio.Semaphore) and token-per-minute limiting
+  (shared AsyncTokenBucket, cost = estimated prompt + completion tokens)
+- Optional micro-batching: up to `batch_size` profiles are packed into one
+  chat request and answered as a JSON array keyed by `profile_key`
+- Every returned object is validated against the ProfileAnalysis model
+- Optional ResponseCache: successful analyses are stored under a hash of
+  model + prompt version + content and returned without an API call
+- Response statuses and token-bucket waits are counted in metrics.py
+  (service="openai", limiter="openai")
+
+Results use the same dict shape as the scripts' analyze_profile_with_openai:
+the analysis fields plus "success": True, or {"success": False, "error": ...}.
+
+Env overrides: OPENAI_CONCURRENCY, OPENAI_TPM, OPENAI_BATCH_SIZE
+"""
+
+import os
+import json
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from openai import AsyncOpenAI, RateLimitError, APIConnectionError, APIStatusError, APITimeoutError
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+
+from metrics import HTTP_RESPONSES
+from rate_limiter import AsyncTokenBucket
+from response_cache import ResponseCache, make_key
+
+DEFAULT_MODEL = "gpt-3.5-turbo"
+DEFAULT_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY", "8"))
+DEFAULT_TPM = int(os.getenv("OPENAI_TPM", "90000"))
+DEFAULT_BATCH_SIZE = int(os.getenv("OPENAI_BATCH_SIZE", "1"))
+MAX_RETRIES = 4
+
+# Rough chars-per-token ratio for English prose; only used for rate budgeting
+CHARS_PER_TOKEN = 4
+
+
+class ProfileAnalysis(BaseModel):
+    """Structured analysis returned by the LLM for one profile."""
+
+    model_config = ConfigDict(extra="allow")
+
+    name: str = ""
+    headline: str = ""
+    location: str = ""
+    current_company: str = ""
+    background: Any = ""
+    education: Any = ""
+    skills: List[str] = Field(default_factory=list)
+    stealth_indicators: List[str] = Field(default_factory=list)
+    antler_fit_score: int = Field(default=0, ge=0, le=10)
+    investment_readiness: str = ""
+    conversation_potential: str = ""
+    key_insights: str = ""
+
+    @field_validator("antler_fit_score", mode="before")
+    @classmethod
+    def _round_score(cls, v: Any) -> Any:
+        if isinstance(v, str):
+            v = v.split("/")[0].strip()
+        try:
+            return max(0, min(10, round(float(v))))
+        except (TypeError, ValueError):
+            return v
+
+    @field_validator("skills", "stealth_indicators", mode="before")
+    @classmethod
+    def _listify(cls, v: Any) -> Any:
+        if v is None:
+            return []
+        if isinstance(v, str):
+            return [s.strip() for s in v.split(",") if s.strip()]
+        return v
+
+
+@dataclass
+class AnalysisJob:
+    """One profile to analyze: `key` identifies it (usually the URL)."""
+
+    key: str
+    content: str
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def parse_json_payload(text: str) -> Any:
+    """Parse a JSON reply, tolerating ```json fences around it."""
+    text = (text or "").strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rsplit("```", 1)[0]
+    return json.loads(text)
+
+
+class AnalysisPool:
+    """Concurrent, rate-limited, optionally batched LLM analysis."""
+
+    def __init__(
+        self,
+        instructions: str,
+        system_prompt: str,
+        model: str = DEFAULT_MODEL,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        tokens_per_minute: int = DEFAULT_TPM,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_linger: float = 0.05,
+        max_tokens_per_profile: int = 1000,
+        temperature: float = 0.3,
+        client: Optional[AsyncOpenAI] = None,
+        cache: Optional[ResponseCache] = None,
+        prompt_version: str = "",
+    ):
+        self.instructions = instructions
+        self.system_prompt = system_prompt
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        self.batch_linger = batch_linger
+        self.max_tokens_per_profile = max_tokens_per_profile
+        self.temperature = temperature
+        self.client = client or AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.cache = cache
+        self.prompt_version = prompt_version
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._bucket = AsyncTokenBucket(tokens_per_minute, name="openai")
+        self._pending: List[Tuple[AnalysisJob, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+    # ---- public API -------------------------------------------------
+
+    async def analyze(self, job: AnalysisJob) -> Dict[str, Any]:
+        """Queue one profile; it is sent alone or packed with its neighbours."""
+        if self.cache is not None:
+            cached = self.cache.get(self.cache_key(job))
+            if cached is not None:
+                return cached
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((job, fut))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_linger, self._flush)
+        return await fut
+
+    async def analyze_many(self, jobs: List[AnalysisJob]) -> List[Dict[str, Any]]:
+        """Analyze all jobs concurrently; results are returned in input order."""
+        return list(await asyncio.gather(*(self.analyze(j) for j in jobs)))
+
+    def cache_key(self, job: AnalysisJob) -> str:
+        return make_key(self.model, self.prompt_version, job.content)
+
+    # ---- batching ---------------------------------------------------
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._pending:
+            batch = self._pending[: self.batch_size]
+            self._pending = self._pending[self.batch_size:]
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def build_prompt(self, jobs: List[AnalysisJob]) -> str:
+        if len(jobs) == 1:
+            return f"{self.instructions}\n\nProfile:\n{jobs[0].content}\n\nReturn only the JSON object."
+        sections = "\n\n".join(f"### profile_key: {j.key}\n{j.content}" for j in jobs)
+        return (
+            f"{self.instructions}\n\n"
+            f"Analyze each of the following {len(jobs)} profiles. Return only a JSON array with one "
+            f"object per profile, in the same order, each including a \"profile_key\" field copied "
+            f"from its header.\n\n{sections}"
+        )
+
+    async def _run_batch(self, batch: List[Tuple[AnalysisJob, asyncio.Future]]) -> None:
+        jobs = [job for job, _ in batch]
+        try:
+            results = await self._analyze_jobs(jobs)
+        except Exception as e:
+            results = [{"success": False, "error": str(e)} for _ in jobs]
+        for (job, fut), result in zip(batch, results):
+            if self.cache is not None and result.get("success"):
+                self.cache.set(self.cache_key(job), result)
+            if not fut.done():
+                fut.set_result(result)
+
+    # ---- API call ---------------------------------------------------
+
+    async def _complete(self, prompt: str, max_tokens: int) -> str:
+        await self._bucket.acquire(estimate_tokens(self.system_prompt) + estimate_tokens(prompt) + max_tokens)
+        delay = 2.0
+        async with self._semaphore:
+            for attempt in range(MAX_RETRIES + 1):
+                try:
+                    response = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=[
+                            {"role": "system", "content": self.system_prompt},
+                            {"role": "user", "content": prompt},
+                        ],
+                        temperature=self.temperature,
+                        max_tokens=max_tokens,
+                    )
+                except (RateLimitError, APIConnectionError, APITimeoutError) as e:
+                    # Connection errors and timeouts carry no status code
+                    HTTP_RESPONSES.inc(service="openai", status=getattr(e, "status_code", "error"))
+                    if attempt == MAX_RETRIES:
+                        raise
+                    await asyncio.sleep(delay)
+                    delay *= 2
+                    continue
+                except APIStatusError as e:
+                    HTTP_RESPONSES.inc(service="openai", status=e.status_code)
+                    raise
+                HTTP_RESPONSES.inc(service="openai", status=200)
+                return response.choices[0].message.content or ""
+        return ""
+
+    async def _analyze_jobs(self, jobs: List[AnalysisJob]) -> List[Dict[str, Any]]:
+        prompt = self.build_prompt(jobs)
+        text = await self._complete(prompt, self.max_tokens_per_profile * len(jobs))
+        try:
+            payload = parse_json_payload(text)
+        except json.JSONDecodeError:
+            return [{"success": False, "error": "Failed to parse OpenAI response"} for _ in jobs]
+
+        if len(jobs) == 1:
+            if isinstance(payload, list) and payload:
+                payload = payload[0]
+            return [validate_analysis(payload)]
+
+        if isinstance(payload, dict):
+            payload = payload.get("results") or payload.get("profiles") or [payload]
+        by_key = {str(p.get("profile_key")): p for p in payload if isinstance(p, dict) and p.get("profile_key")}
+        out: List[Dict[str, Any]] = []
+        for i, job in enumerate(jobs):
+            item = by_key.get(job.key)
+            if item is None and not by_key and i < len(payload):
+                item = payload[i]  # model dropped the keys; fall back to order
+            if item is None:
+                out.append({"success": False, "error": "Missing from batched response"})
+            else:
+                out.append(validate_analysis(item))
+        return out
+
+
+def validate_analysis(payload: Any) -> Dict[str, Any]:
+    """Validate one analysis object; returns the repo's success/error dict shape."""
+    if not isinstance(payload, dict):
+        return {"success": False, "error": "Analysis is not a JSON object"}
+    payload = {k: v for k, v in payload.items() if k != "profile_key"}
+    try:
+        analysis = ProfileAnalysis.model_validate(payload).model_dump()
+    except ValidationError as e:
+        return {"success": False, "error": f"Invalid analysis: {e.errors()[0].get('msg', 'validation failed')}"}
+    analysis["success"] = True
+    return analysis
+
+
+def run_analyses(jobs: List[AnalysisJob], **pool_kwargs: Any) -> List[Dict[str, Any]]:
+    """Synchronous entry point for the batch scripts."""
+    async def _run() -> List[Dict[str, Any]]:
+        pool = AnalysisPool(**pool_kwargs)
+        return await pool.analyze_many(jobs)
+    return asyncio.run(_run())
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Lookalike Founder Index (TF-IDF, local)
+=======================================
+
+"Top 50 profiles most like these tier-A seeds" without an LLM round trip
+(real_profile_discovery.find_similar_profiles_with_openai): a sparse
+TF-IDF matrix over normalized profile text and a cosine nearest-neighbor
+search over it.
+
+- Text per profile: headline (weighted x2), about, experience titles and
+  companies, schools, location
+- HashingVectorizer (unigrams + bigrams, 2^20 features): no vocabulary to
+  refit, so new profiles are vectorized independently
+- Rows keep sublinear term frequencies; document frequencies are updated
+  on every add, and IDF weights / row norms are recomputed lazily (one
+  sparse pass) on the next query -- so incremental adds never go stale
+- Query: the seeds' normalized TF-IDF vectors are averaged and every row
+  is scored with one sparse matrix-vector product (exact brute-force
+  cosine, milliseconds for tens of thousands of profiles)
+- Re-adding an identifier replaces its row (the old one is masked out
+  until the next compaction on save)
+
+Usage:
+    python lookalike_index.py build apimaestro_full_sections_raw.json apimaestro_batch_raw.json
+    python lookalike_index.py query --tier-a apimaestro_scored.json --k 50
+    python lookalike_index.py query someone https://www.linkedin.com/in/other
+
+    index = LookalikeIndex.load()
+    index.add(new_records)            # canonical records (profile_merge.normalize_profile)
+    index.most_similar(["someone"], k=50)
+
+discovery_daemon.py and reenrich_planner.py add what they enrich to an
+existing index file (update_index), so it keeps up without rebuilds.
+
+Env override: LOOKALIKE_INDEX_PATH (default lookalike_index.npz)
+"""
+
+import os
+import time
+import argparse
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from compact_profile import iter_json_array
+from profile_merge import is_failed, normalize_profile
+from url_frontier import canonicalize
+
+LOOKALIKE_INDEX_PATH = os.getenv("LOOKALIKE_INDEX_PATH", "lookalike_index.npz")
+N_FEATURES = 2 ** 20
+
+_VECTORIZER = HashingVectorizer(
+    n_features=N_FEATURES, ngram_range=(1, 2), stop_words="english",
+    alternate_sign=False, norm=None, dtype=np.float32,
+)
+
+
+def _key(id_or_url: str) -> str:
+    if "linkedin.com/" in id_or_url.lower():
+        return canonicalize(id_or_url)
+    return canonicalize(f"linkedin.com/in/{id_or_url}")
+
+
+def profile_text(record: Dict[str, Any]) -> str:
+    """Searchable text of a canonical record."""
+    basic = record.get("basic_info") or {}
+    parts = [basic.get("headline") or "", basic.get("headline") or "", basic.get("about") or "",
+             (basic.get("location") or {}).get("full") or ""]
+    for exp in record.get("experience") or []:
+        parts.append(exp.get("title") or "")
+        parts.append(exp.get("company") or "")
+    for ed in record.get("education") or []:
+        parts.append(ed.get("school") or "")
+    return " \n".join(p for p in parts if p)
+
+
+class LookalikeIndex:
+    """Incrementally updatable TF-IDF matrix with cosine top-k queries."""
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self._row: Dict[str, int] = {}
+        self._alive: List[bool] = []
+        self.df = np.zeros(N_FEATURES, dtype=np.int32)
+        self._matrix = sp.csr_matrix((0, N_FEATURES), dtype=np.float32)
+        self._pending: List[sp.csr_matrix] = []
+        self._weights: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self._row)
+
+    def __contains__(self, id_or_url: str) -> bool:
+        return _key(id_or_url) in self._row
+
+    # ---- updates ----------------------------------------------------------
+
+    def add(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Vectorize and append canonical records; an identifier seen before is replaced."""
+        by_pid: Dict[str, str] = {}
+        for rec in records:
+            pid = (rec.get("basic_info") or {}).get("public_identifier") or ""
+            if pid:
+                by_pid[pid] = profile_text(rec)
+        if not by_pid:
+            return 0
+
+        replaced = [self._row[pid] for pid in by_pid if pid in self._row]
+        if replaced:
+            self._consolidate()
+            old = self._matrix[replaced]
+            self.df -= np.bincount(old.indices, minlength=N_FEATURES).astype(np.int32)
+            for row in replaced:
+                self._alive[row] = False
+
+        X = _VECTORIZER.transform(list(by_pid.values())).tocsr()
+        np.log1p(X.data, out=X.data)
+        self.df += np.bincount(X.indices, minlength=N_FEATURES).astype(np.int32)
+        start = len(self.ids)
+        for i, pid in enumerate(by_pid):
+            self.ids.append(pid)
+            self._row[pid] = start + i
+            self._alive.append(True)
+        self._pending.append(X)
+        self._weights = None
+        return len(by_pid)
+
+    def _consolidate(self) -> None:
+        if self._pending:
+            self._matrix = sp.vstack([self._matrix, *self._pending], format="csr")
+            self._pending = []
+
+    def compact(self) -> None:
+        """Drop replaced rows (row numbers change)."""
+        self._consolidate()
+        keep = np.flatnonzero(np.asarray(self._alive, dtype=bool))
+        if len(keep) == len(self.ids):
+            return
+        self._matrix = self._matrix[keep]
+        self.ids = [self.ids[i] for i in keep]
+        self._row = {pid: i for i, pid in enumerate(self.ids)}
+        self._alive = [True] * len(self.ids)
+        self._weights = None
+
+    # ---- queries ----------------------------------------------------------
+
+    def prepare(self) -> None:
+        """Compute IDF weights and row norms now instead of on the first query after an add."""
+        self._idf_and_norms()
+
+    def _idf_and_norms(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._weights is None:
+            self._consolidate()
+            n = len(self._row)
+            idf = (np.log((1.0 + n) / (1.0 + self.df)) + 1.0).astype(np.float32)
+            norms = np.sqrt(self._matrix.multiply(self._matrix) @ (idf * idf))
+            norms[norms == 0] = 1.0
+            self._weights = (idf, norms.astype(np.float32))
+        return self._weights
+
+    def _top_k(self, query: np.ndarray, k: int, exclude: Iterable[int] = ()) -> List[Tuple[str, float]]:
+        idf, norms = self._idf_and_norms()
+        qnorm = float(np.linalg.norm(query))
+        if not qnorm:
+            return []
+        scores = (self._matrix @ (query * idf)) / (norms * qnorm)
+        scores[~np.asarray(self._alive, dtype=bool)] = -1.0
+        for row in exclude:
+            scores[row] = -1.0
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[i], round(float(scores[i]), 4)) for i in top if scores[i] > 0]
+
+    def most_similar(self, seeds: Iterable[str], k: int = 50, include_seeds: bool = False) -> List[Tuple[str, float]]:
+        """Top-k (public identifier, cosine) pairs closest to the centroid of the seed profiles."""
+        idf, norms = self._idf_and_norms()
+        rows = [self._row[pid] for pid in (_key(s) for s in seeds) if pid in self._row]
+        if not rows:
+            return []
+        # Centroid of the seeds' unit-length TF-IDF vectors
+        seed = self._matrix[rows].multiply((1.0 / norms[rows])[:, None]).tocsr()
+        centroid = np.asarray(seed.sum(axis=0)).ravel() * idf
+        return self._top_k(centroid, k, () if include_seeds else rows)
+
+    def similar_to_text(self, text: str, k: int = 50) -> List[Tuple[str, float]]:
+        """Top-k profiles for free text (e.g. "ex-Google ML engineer building in stealth")."""
+        idf, _ = self._idf_and_norms()
+        X = _VECTORIZER.transform([text]).tocsr()
+        np.log1p(X.data, out=X.data)
+        return self._top_k(X.toarray().ravel() * idf, k)
+
+    # ---- persistence --------------------------------------------------------
+
+    def save(self, path: str = LOOKALIKE_INDEX_PATH) -> None:
+        self.compact()
+        m = self._matrix
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(tmp, data=m.data, indices=m.indices, indptr=m.indptr, df=self.df,
+                            ids=np.array(self.ids, dtype=str))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = LOOKALIKE_INDEX_PATH) -> "LookalikeIndex":
+        index = cls()
+        with np.load(path) as z:
+            index.ids = [str(pid) for pid in z["ids"]]
+            index._matrix = sp.csr_matrix((z["data"], z["indices"], z["indptr"]),
+                                          shape=(len(index.ids), N_FEATURES))
+            index.df = z["df"].astype(np.int32)
+        index._row = {pid: i for i, pid in enumerate(index.ids)}
+        index._alive = [True] * len(index.ids)
+        return index
+
+    @classmethod
+    def open(cls, path: str = LOOKALIKE_INDEX_PATH) -> "LookalikeIndex":
+        """Load `path` if it exists, else start empty."""
+        return cls.load(path) if os.path.exists(path) else cls()
+
+
+def load_records(paths: Iterable[str]) -> List[Dict[str, Any]]:
+    """Canonical records from raw Apify JSON-array files (failed scrapes skipped)."""
+    records = []
+    for path in paths:
+        for item in iter_json_array(path):
+            if isinstance(item, dict) and not is_failed(item):
+                records.append(normalize_profile(item, os.path.basename(path)))
+    return records
+
+
+def update_index(records: List[Dict[str, Any]], path: str = LOOKALIKE_INDEX_PATH) -> int:
+    """Add freshly enriched records to an existing index file (no-op without one); returns rows added."""
+    if not records or not os.path.exists(path):
+        return 0
+    index = LookalikeIndex.load(path)
+    added = index.add(records)
+    index.save(path)
+    return added
+
+
+def tier_seeds(scored_json: str, tier: str = "A") -> List[str]:
+    """Identifiers of one tier in a scored JSON (score_apimaestro output)."""
+    return [r["url"] for r in iter_json_array(scored_json) if r.get("tier") == tier and r.get("url")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the lookalike founder index")
+    parser.add_argument("--index", default=LOOKALIKE_INDEX_PATH, help="Index file (.npz)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Add raw Apify JSON-array files to the index")
+    build.add_argument("inputs", nargs="+")
+    build.add_argument("--fresh", action="store_true", help="Start a new index instead of updating")
+    query = sub.add_parser("query", help="Profiles most like the seeds")
+    query.add_argument("seeds", nargs="*", help="Public identifiers or profile URLs")
+    query.add_argument("--tier-a", metavar="SCORED_JSON", help="Use every tier-A row of a scored JSON as seeds")
+    query.add_argument("--text", help="Free-text query instead of seed profiles")
+    query.add_argument("--k", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        index = LookalikeIndex() if args.fresh else LookalikeIndex.open(args.index)
+        before = len(index)
+        start = time.perf_counter()
+        added = index.add(load_records(args.inputs))
+        index.save(args.index)
+        print(f"✅ {added} profiles vectorized ({len(index) - before} new) -> {args.index} "
+              f"({len(index)} total, {time.perf_counter() - start:.1f}s)")
+        return
+
+    if not os.path.exists(args.index):
+        print(f"❌ No index at {args.index} (run: python lookalike_index.py build <raw json>)")
+        raise SystemExit(1)
+    index = LookalikeIndex.load(args.index)
+    seeds = list(args.seeds) + (tier_seeds(args.tier_a) if args.tier_a else [])
+    if not seeds and not args.text:
+        print("❌ Give seed identifiers, --tier-a or --text")
+        raise SystemExit(1)
+    index.prepare()
+    start = time.perf_counter()
+    hits = index.similar_to_text(args.text, args.k) if args.text else index.most_similar(seeds, args.k)
+    elapsed = (time.perf_counter() - start) * 1000
+    known = sum(1 for s in seeds if s in index)
+    print(f"🔎 {len(hits)} lookalikes from {known}/{len(seeds)} seeds over {len(index)} profiles ({elapsed:.1f} ms)"
+          if not args.text else f"🔎 {len(hits)} matches over {len(index)} profiles ({elapsed:.1f} ms)")
+    for pid, score in hits:
+        print(f"  {score:.3f}  https://www.linkedin.com/in/{pid}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Pipeline Metrics (Prometheus text format)
+=========================================
+
+Throughput and health numbers for unattended runs, without log scraping.
+One process-wide registry of counters, gauges and histograms (stdlib only,
+thread-safe) is shared by the fetch and scoring modules and served as
+Prometheus text on a local port:
+
+- founder_profiles_enriched_total{source}       profiles returned by Apify
+                                                (per minute: rate(...[5m]) * 60)
+- founder_requests_in_flight{service}           Apify runs / Firecrawl requests
+                                                currently open
+- founder_http_responses_total{service,status}  429 rate: status="429" over all
+- founder_rate_limit_wait_seconds_total{limiter} time spent waiting for a slot
+- founder_cache_lookups_total{namespace,result} result="hit" | "miss"
+- founder_apify_call_seconds{service}           Apify call latency
+- founder_score_seconds{scorer}                 scoring latency per profile
+
+Served by the long-running workers: discovery_daemon.py and the Celery
+enrichment workers (enrichment_tasks.py) start serve(); scoring_service.py
+answers GET /metrics on its own port. With several worker processes on one
+machine each takes the next free port after METRICS_PORT.
+
+Usage:
+    from metrics import HTTP_RESPONSES
+    HTTP_RESPONSES.inc(service="apify", status=r.status_code)
+    python metrics.py                     # serve this process's registry (smoke test)
+    curl -s localhost:9108/metrics
+
+Env overrides: METRICS_PORT (0 disables serving), METRICS_HOST
+"""
+
+import os
+import math
+import time
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+PORT_ATTEMPTS = 16
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelKey = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: Dict[LabelKey, Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> LabelKey:
+        if len(labels) != len(self.labelnames) or any(n not in labels for n in self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _labels(self, key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key)) + ([extra] if extra else [])
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in pairs) + "}"
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{self._labels(key)} {_format_value(value)}"
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonic count; Prometheus derives rates (profiles per minute, 429s per second)."""
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("Counters only go up")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+
+class Gauge(_Metric):
+    """Current level (in-flight requests, queue depth)."""
+    type = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    @contextmanager
+    def track(self, **labels: Any) -> Iterator[None]:
+        """+1 while the block runs."""
+        self.inc(1, **labels)
+        try:
+            yield
+        finally:
+            self.dec(1, **labels)
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket latency distribution (with _sum and _count)."""
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = ()):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def timed(self, **labels: Any) -> Callable[[Callable], Callable]:
+        """Decorator form of time()."""
+        def decorate(fn: Callable) -> Callable:
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - start, **labels)
+            return wrapper
+        return decorate
+
+    def count(self, **labels: Any) -> int:
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted((k, ([*v[0]], v[1], v[2])) for k, v in self._values.items())
+        for key, (counts, total, n) in items:
+            cumulative = 0
+            for bound, c in zip(self.buckets, counts):
+                cumulative += c
+                le = ("le", _format_value(bound))
+                yield f"{self.name}_bucket{self._labels(key, le)} {cumulative}"
+            yield f"{self.name}_sum{self._labels(key)} {_format_value(total)}"
+            yield f"{self.name}_count{self._labels(key)} {n}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric, or return the one already registered under its name."""
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is None:
+                self._metrics[metric.name] = metric
+                return metric
+        if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+            raise ValueError(f"Metric {metric.name} already registered as a different {existing.type}")
+        return existing
+
+    def metrics(self) -> List[_Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self.metrics()) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, help, labels))
+
+
+def gauge(name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, help, labels))
+
+
+def histogram(name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = ()) -> Histogram:
+    return REGISTRY.register(Histogram(name, help, labels, buckets))
+
+
+# ---- shared pipeline metrics ---------------------------------------------------
+
+PROFILES_ENRICHED = counter("founder_profiles_enriched_total", "Profiles returned by enrichment calls", ["source"])
+IN_FLIGHT = gauge("founder_requests_in_flight", "Enrichment runs / scrape requests currently open", ["service"])
+HTTP_RESPONSES = counter("founder_http_responses_total", "HTTP responses from external APIs by status",
+                         ["service", "status"])
+RATE_LIMIT_WAIT = counter("founder_rate_limit_wait_seconds_total", "Seconds spent waiting for a rate-limit slot",
+                          ["limiter"])
+CACHE_LOOKUPS = counter("founder_cache_lookups_total", "Response cache lookups by result", ["namespace", "result"])
+APIFY_CALL_SECONDS = histogram("founder_apify_call_seconds", "Apify call latency (start to items)", ["service"],
+                               buckets=(1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200))
+SCORE_SECONDS = histogram("founder_score_seconds", "Scoring latency per profile", ["scorer"],
+                          buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1))
+
+
+# ---- HTTP exposition -------------------------------------------------------------
+
+class _Handler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+
+
+def serve(port: Optional[int] = None, host: Optional[str] = None) -> Optional[int]:
+    """Serve /metrics from a daemon thread; returns the bound port (None if disabled or no port free).
+
+    Takes the first free port of port, port + 1, ... so several worker processes can share a host."""
+    global _server
+    port = METRICS_PORT if port is None else port
+    host = host or METRICS_HOST
+    if _server is not None:
+        return _server.server_address[1]
+    if port <= 0:
+        return None
+    for candidate in range(port, port + PORT_ATTEMPTS):
+        try:
+            _server = ThreadingHTTPServer((host, candidate), _Handler)
+        except OSError:
+            continue
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+        print(f"📊 Metrics on http://{host}:{candidate}/metrics")
+        return candidate
+    print(f"⚠️ No free metrics port in {port}-{port + PORT_ATTEMPTS - 1}; metrics not served")
+    return None
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve the pipeline metrics registry")
+    parser.add_argument("--port", type=int, default=METRICS_PORT)
+    parser.add_argument("--host", default=METRICS_HOST)
+    args = parser.parse_args()
+    if serve(args.port, args.host) is None:
+        raise SystemExit(1)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Person Detection (MinHash + LSH)
+===============================================
+
+The same founder turns up under different identifiers
+(linkedin.com/in/x vs linkedin.com/in/x-123abc) and from different actors,
+so exact-identifier merging (profile_merge.py) misses them and they are
+enriched and scored twice.
+
+- Each person becomes a set of features: name tokens, headline words and
+  word bigrams, SERP snippet words (before enrichment), title@company and
+  company of every role, city, and the identifier stem (trailing LinkedIn
+  hash suffix removed)
+- MinHash signatures (NEAR_DUP_PERMUTATIONS hashes, vectorized) are cut
+  into LSH bands; only people sharing a band bucket are compared, so
+  clustering is roughly linear in the number of people
+- A candidate pair is a duplicate when the names agree (same first and
+  last name, or one name's tokens contain the other's), something beyond
+  name and headline agrees (a real company, the city, or
+  NEAR_DUP_SNIPPET_WORDS snippet words), and either the estimated Jaccard
+  similarity reaches NEAR_DUP_THRESHOLD or the identifier stems are equal
+  -- a shared "Building something new" headline never merges two people
+- Placeholder employers ("Stealth Startup", "Self-employed", "Freelance",
+  "Confidential", ...) are not company features: every stealth SERP
+  carries them
+- Two identifiers with different hash suffixes (rahul-sharma-1a2b3c4d vs
+  rahul-sharma-9f8e7d6c) are different LinkedIn accounts, never merged
+- Pairs are joined with union-find into clusters
+
+Used twice:
+- before enrichment, on SERP titles/snippets (serpapi_to_apify.py,
+  discovery_daemon.py): only one URL per cluster is sent to Apify
+- after enrichment, on merged records (score_apimaestro.py): one record
+  per cluster is scored, the others' sources are folded into it
+
+Usage:
+    python near_duplicates.py apimaestro_full_sections_stealth.json apimaestro_batch_raw.json
+
+Env overrides: NEAR_DUP_THRESHOLD, NEAR_DUP_PERMUTATIONS, NEAR_DUP_BANDS,
+NEAR_DUP_SNIPPET_WORDS
+"""
+
+import os
+import re
+import hashlib
+import argparse
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from profile_merge import get_field
+from url_frontier import canonicalize
+
+THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.5"))
+PERMUTATIONS = int(os.getenv("NEAR_DUP_PERMUTATIONS", "64"))
+BANDS = int(os.getenv("NEAR_DUP_BANDS", "16"))
+# Shared snippet words (name and SERP boilerplate excluded) that corroborate a pair
+SNIPPET_WORDS = int(os.getenv("NEAR_DUP_SNIPPET_WORDS", "3"))
+# Compare a newcomer with at most this many members of one bucket (generic headlines make big buckets)
+MAX_BUCKET_COMPARISONS = 25
+
+_PRIME = np.uint64(4294967311)  # smallest prime above 2^32: (a * x + b) fits in uint64
+_rng = np.random.RandomState(1)
+_A = _rng.randint(1, 2 ** 32 - 1, size=PERMUTATIONS, dtype=np.uint64)
+_B = _rng.randint(0, 2 ** 32 - 1, size=PERMUTATIONS, dtype=np.uint64)
+
+WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.&'-]*")
+ID_SUFFIX_RE = re.compile(r"-(?=[0-9a-z]*\d)[0-9a-z]{5,12}$|-\d+$")
+NAME_NOISE = {"dr", "mr", "ms", "mrs", "jr", "sr", "ii", "iii", "phd", "mba", "cfa", "md", "linkedin"}
+STOPWORDS = {"a", "an", "and", "at", "for", "in", "of", "on", "the", "to", "with", "|", "-", "@"}
+SNIPPET_NOISE = {"view", "profile", "linkedin", "professional", "community", "billion", "million", "members",
+                 "experience", "education", "location", "connections", "followers", "500+", "·", "...", "'s"}
+# Feature kinds that vouch for a pair beyond name + headline: company, title@company, city
+CORROBORATING = ("c:", "r:", "l:")
+# Placeholder employers shared by unrelated people (and by every stealth SERP); never company features
+PLACEHOLDER_COMPANIES = {
+    "startup", "my startup", "new venture", "building something new", "something new", "self-employed",
+    "self employed", "freelance", "freelancer", "independent", "independent consultant", "consultant",
+    "confidential", "undisclosed", "company", "n/a", "na", "none", "various", "unemployed", "open to work",
+    "career break", "sabbatical", "entrepreneur", "founder",
+}
+
+
+class Person(NamedTuple):
+    key: str            # URL or public identifier
+    name: List[str]     # normalized name tokens
+    stem: str           # identifier without LinkedIn's hash suffix
+    suffix: str         # that hash suffix ("" for vanity identifiers)
+    features: Set[str]
+
+
+class UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, i: int, j: int) -> None:
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+    def groups(self) -> List[List[int]]:
+        out: Dict[int, List[int]] = {}
+        for i in range(len(self.parent)):
+            out.setdefault(self.find(i), []).append(i)
+        return list(out.values())
+
+
+# ---- features ----------------------------------------------------------------
+
+def words(text: Any) -> List[str]:
+    return [w for w in WORD_RE.findall(str(text or "").lower()) if w not in STOPWORDS]
+
+
+def name_tokens(name: Any) -> List[str]:
+    return [w.strip(".'") for w in words(name) if w.strip(".'") not in NAME_NOISE]
+
+
+def placeholder_company(company: str) -> bool:
+    """Normalized company text that names no real employer ("Stealth Startup", "Self-employed")."""
+    return company in PLACEHOLDER_COMPANIES or "stealth" in company.split()
+
+
+def id_parts(id_or_url: str) -> Tuple[str, str]:
+    """(stem, hash suffix) of an identifier or profile URL."""
+    pid = canonicalize(id_or_url) if "linkedin.com/" in id_or_url.lower() else id_or_url.lower()
+    m = ID_SUFFIX_RE.search(pid)
+    return (pid[:m.start()], m.group()) if m else (pid, "")
+
+
+def id_stem(id_or_url: str) -> str:
+    return id_parts(id_or_url)[0]
+
+
+def person(key: str, name: Any, headline: Any = "", roles: Iterable[Tuple[Any, Any]] = (), snippet: Any = "",
+           city: Any = "") -> Person:
+    tokens = name_tokens(name)
+    stem, suffix = id_parts(key) if key else ("", "")
+    features = {f"n:{t}" for t in tokens}
+    head = words(headline)
+    features.update(f"h:{w}" for w in head)
+    features.update(f"h:{a} {b}" for a, b in zip(head, head[1:]))
+    features.update(f"s:{w}" for w in words(snippet) if w not in SNIPPET_NOISE and w not in tokens)
+    if words(city):
+        features.add(f"l:{' '.join(words(city))}")
+    for title, company in roles:
+        company = " ".join(words(company))
+        if company and not placeholder_company(company):
+            features.add(f"c:{company}")
+            features.add(f"r:{' '.join(words(title))}@{company}")
+    if stem:
+        features.add(f"id:{stem}")
+    return Person(key, tokens, stem, suffix, features)
+
+
+def record_person(rec: Any) -> Person:
+    """Person of a canonical dict record or a compact record (compact_profile)."""
+    roles = []
+    for exp in get_field(rec, "experience") or ():
+        if isinstance(exp, dict):
+            roles.append((exp.get("title"), exp.get("company")))
+        else:
+            roles.append((exp.title, exp.company))
+    location = get_field(rec, "location") or {}
+    city = location.get("city") if isinstance(location, dict) else location[1]
+    return person(get_field(rec, "public_identifier") or "", get_field(rec, "fullname"),
+                  get_field(rec, "headline"), roles, city=city)
+
+
+def serp_person(url: str, title: str, snippet: str = "") -> Person:
+    """Person from a Google result: title is "Name - Headline - Company | LinkedIn"."""
+    title = re.sub(r"\s*[|·]\s*linkedin.*$", "", title or "", flags=re.I)
+    parts = [p.strip() for p in re.split(r"\s+[-–—]\s+", title) if p.strip()]
+    name = parts[0] if parts else ""
+    roles = [("", parts[-1])] if len(parts) >= 3 else []
+    return person(url, name, " ".join(parts[1:]), roles, snippet=snippet)
+
+
+# ---- MinHash / LSH -------------------------------------------------------------
+
+def signature(features: Set[str]) -> np.ndarray:
+    x = np.fromiter((int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=4).digest(), "little")
+                     for f in features), dtype=np.uint64, count=len(features))
+    return ((np.outer(x, _A) + _B) % _PRIME).min(axis=0)
+
+
+def same_name(a: List[str], b: List[str]) -> bool:
+    if not a or not b:
+        return False
+    if a[0] == b[0] and a[-1] == b[-1]:
+        return True
+    sa, sb = set(a), set(b)
+    return len(sa & sb) >= 2 and (sa <= sb or sb <= sa)
+
+
+def corroborated(a: Person, b: Person) -> bool:
+    """Agreement beyond name and headline: a company, the city, or enough snippet words."""
+    shared = a.features & b.features
+    if any(f.startswith(CORROBORATING) for f in shared):
+        return True
+    return sum(1 for f in shared if f.startswith("s:")) >= SNIPPET_WORDS
+
+
+def is_duplicate(a: Person, b: Person, sig_a: np.ndarray, sig_b: np.ndarray, threshold: float = THRESHOLD) -> bool:
+    if not same_name(a.name, b.name):
+        return False
+    if a.suffix and b.suffix and a.suffix != b.suffix:
+        return False  # two distinct LinkedIn accounts
+    if not corroborated(a, b):
+        return False
+    if a.stem and a.stem == b.stem:
+        return True
+    return float(np.mean(sig_a == sig_b)) >= threshold
+
+
+def cluster(people: List[Person], threshold: float = THRESHOLD) -> List[List[int]]:
+    """Index groups of near-duplicate people (singletons included), in input order."""
+    uf = UnionFind(len(people))
+    rows = PERMUTATIONS // BANDS
+    sigs: List[Optional[np.ndarray]] = []
+    buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(BANDS)]
+    for i, p in enumerate(people):
+        if not p.features:
+            sigs.append(None)
+            continue
+        sig = signature(p.features)
+        sigs.append(sig)
+        compared: Set[int] = set()
+        for band in range(BANDS):
+            members = buckets[band].setdefault(sig[band * rows:(band + 1) * rows].tobytes(), [])
+            for j in members[:MAX_BUCKET_COMPARISONS]:
+                if j not in compared:
+                    compared.add(j)
+                    if is_duplicate(people[j], p, sigs[j], sig, threshold):
+                        uf.union(j, i)
+            members.append(i)
+    return sorted((sorted(g) for g in uf.groups()), key=lambda g: g[0])
+
+
+# ---- pipeline helpers ------------------------------------------------------------
+
+def dedupe_serp(entries: Dict[str, Dict[str, str]]) -> Tuple[List[str], Dict[str, str]]:
+    """entries: url -> {"title", "snippet"}. Returns (one URL per person, dropped URL -> kept URL).
+
+    The kept URL of a cluster is the shortest (usually the vanity identifier)."""
+    urls = list(entries)
+    people = [serp_person(u, e.get("title", ""), e.get("snippet", "")) for u, e in entries.items()]
+    kept, dropped = [], {}
+    for group in cluster(people):
+        members = sorted((urls[i] for i in group), key=lambda u: (len(u), u))
+        kept.append(members[0])
+        for url in members[1:]:
+            dropped[url] = members[0]
+    return kept, dropped
+
+
+def _completeness(rec: Any) -> Tuple[int, int]:
+    filled = sum(1 for f in ("headline", "about", "email", "current_company") if get_field(rec, f))
+    return len(get_field(rec, "experience") or ()), filled
+
+
+def collapse_records(records: List[Any], threshold: float = THRESHOLD) -> Tuple[List[Any], List[List[str]]]:
+    """One record per near-duplicate cluster (the most complete; sources folded in), in input order.
+    Returns (records, clusters of public identifiers with more than one member)."""
+    groups = cluster([record_person(r) for r in records], threshold)
+    keep: Dict[int, Any] = {}
+    clusters: List[List[str]] = []
+    for group in groups:
+        best = max(group, key=lambda i: (_completeness(records[i]), -i))
+        keep[group[0]] = records[best]
+        if len(group) > 1:
+            clusters.append([get_field(records[i], "public_identifier") for i in group])
+            sources = get_field(records[best], "sources")
+            for i in group:
+                for src in get_field(records[i], "sources"):
+                    if src not in sources:
+                        sources.append(src)
+    return [keep[i] for i in sorted(keep)], clusters
+
+
+def main():
+    from compact_profile import iter_json_array
+    from profile_merge import ProfileMerger
+
+    parser = argparse.ArgumentParser(description="Report near-duplicate people across raw Apify files")
+    parser.add_argument("inputs", nargs="+", help="Raw JSON-array files")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args()
+
+    merger = ProfileMerger()
+    for path in args.inputs:
+        merger.add_many(iter_json_array(path), source=path)
+    records = merger.records()
+    kept, clusters = collapse_records(records, args.threshold)
+    print(f"🧬 {len(records)} profiles -> {len(kept)} people ({len(clusters)} near-duplicate clusters)")
+    for ids in clusters:
+        print("   " + "  ≈  ".join(ids))
+
+
+if __name__ == "__main__":
+    main()
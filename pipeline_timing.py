@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Pipeline Timing: Spans, Counters, Profiles
+==========================================
+
+Where does a run spend its time -- SerpAPI search, Apify polling, dataset
+download, JSON parse, scoring, CSV write? Stages are wrapped in spans:
+
+    with span("apify.poll"):
+        ...
+    count("serpapi.results", len(urls))
+
+- Spans nest ("score/write_csv") and aggregate per path: calls, total,
+  mean and max seconds; counters are plain sums. Both are thread-safe and
+  cost about a microsecond, so they stay on in production
+- run("name") wraps a script's main(): resets the numbers, prints a
+  per-run report at the end (share of wall time per stage), optionally
+  writes it as JSON, and optionally profiles the whole run
+
+Flags (env):
+- PIPELINE_PROFILE=cprofile   cProfile dump to <name>.prof (+ top functions)
+- PIPELINE_PROFILE=sample     stack sampler every PIPELINE_SAMPLE_MS ms;
+                              collapsed stacks to <name>.stacks.txt
+                              (flamegraph.pl / speedscope format)
+- PIPELINE_TIMING_JSON=path   also write the report as JSON
+- PIPELINE_TIMING=0           no report
+
+Usage:
+    PIPELINE_PROFILE=cprofile python score_apimaestro.py
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+PROFILE_MODE = os.getenv("PIPELINE_PROFILE", "").lower()
+TIMING_JSON = os.getenv("PIPELINE_TIMING_JSON", "")
+TIMING_ENABLED = os.getenv("PIPELINE_TIMING", "1").lower() not in ("0", "false", "no")
+SAMPLE_MS = float(os.getenv("PIPELINE_SAMPLE_MS", "5"))
+
+_lock = threading.Lock()
+_local = threading.local()
+# path -> [calls, total seconds, max seconds]
+_spans: Dict[str, List[float]] = {}
+_counters: Dict[str, float] = {}
+_started = time.perf_counter()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a stage; nested spans are recorded under "<outer>/<name>"."""
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    path = f"{stack[-1]}/{name}" if stack else name
+    stack.append(path)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stack.pop()
+        with _lock:
+            entry = _spans.get(path)
+            if entry is None:
+                _spans[path] = [1, elapsed, elapsed]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+                if elapsed > entry[2]:
+                    entry[2] = elapsed
+
+
+def count(name: str, n: float = 1) -> None:
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def reset() -> None:
+    global _started
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+        _started = time.perf_counter()
+
+
+def snapshot() -> Dict[str, Any]:
+    with _lock:
+        wall = time.perf_counter() - _started
+        spans = {path: {"calls": int(c), "total_s": round(t, 6), "mean_ms": round(t / c * 1000, 3),
+                        "max_ms": round(m * 1000, 3)}
+                 for path, (c, t, m) in _spans.items()}
+        return {"wall_s": round(wall, 6), "spans": spans, "counters": dict(_counters)}
+
+
+def report(title: str = "Timing") -> str:
+    snap = snapshot()
+    wall = snap["wall_s"] or 1e-9
+    lines = [f"⏱️ {title}: {snap['wall_s']:.2f}s wall"]
+    if snap["spans"]:
+        lines.append(f"   {'stage':<40} {'calls':>7} {'total s':>9} {'%':>6} {'mean ms':>9} {'max ms':>9}")
+        # Depth-first by path so children sit under their parent, largest first among siblings
+        totals = {p: s["total_s"] for p, s in snap["spans"].items()}
+        order = sorted(totals, key=lambda p: tuple((-totals.get("/".join(p.split("/")[:i + 1]), 0),
+                                                     p.split("/")[i]) for i in range(p.count("/") + 1)))
+        for path in order:
+            s = snap["spans"][path]
+            depth = path.count("/")
+            label = ("  " * depth + path.rsplit("/", 1)[-1])[:40]
+            lines.append(f"   {label:<40} {s['calls']:>7} {s['total_s']:>9.3f} {s['total_s'] / wall * 100:>5.1f}% "
+                         f"{s['mean_ms']:>9.2f} {s['max_ms']:>9.1f}")
+    if snap["counters"]:
+        lines.append("   counters: " + ", ".join(f"{k}={v:g}" for k, v in sorted(snap["counters"].items())))
+    return "\n".join(lines)
+
+
+# ---- profilers -----------------------------------------------------------------
+
+class StackSampler:
+    """Samples one thread's Python stack on a timer; collapsed-stack output."""
+
+    def __init__(self, interval_ms: float = SAMPLE_MS, thread_id: Optional[int] = None):
+        self.interval = interval_ms / 1000
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def dump(self, path: str) -> None:
+        with open(path, "w") as f:
+            for stack, n in self.stacks.most_common():
+                f.write(f"{stack} {n}\n")
+
+    def top(self, n: int = 10) -> List[str]:
+        leaves: Counter = Counter()
+        for stack, samples in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += samples
+        total = sum(leaves.values()) or 1
+        return [f"{samples / total:6.1%}  {leaf}" for leaf, samples in leaves.most_common(n)]
+
+
+@contextmanager
+def run(name: str, profile: Optional[str] = None, json_path: Optional[str] = None) -> Iterator[None]:
+    """Wrap a script's main(): fresh numbers, optional profiler, report at the end."""
+    profile = (PROFILE_MODE if profile is None else profile).lower()
+    json_path = TIMING_JSON if json_path is None else json_path
+    reset()
+    profiler = sampler = None
+    if profile == "cprofile":
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    elif profile == "sample":
+        sampler = StackSampler().start()
+    elif profile:
+        print(f"⚠️ Unknown PIPELINE_PROFILE={profile!r} (use cprofile or sample)")
+    try:
+        with span(name):
+            yield
+    finally:
+        if profiler is not None:
+            import pstats
+            profiler.disable()
+            profiler.dump_stats(f"{name}.prof")
+            print(f"\n🔬 cProfile dump: {name}.prof (top functions by cumulative time)")
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+        if sampler is not None:
+            sampler.stop()
+            sampler.dump(f"{name}.stacks.txt")
+            print(f"\n🔬 {sum(sampler.stacks.values())} stack samples: {name}.stacks.txt (hottest frames)")
+            for line in sampler.top():
+                print(f"   {line}")
+        if TIMING_ENABLED:
+            print("\n" + report(name))
+        if json_path:
+            with open(json_path, "w") as f:
+                json.dump({"run": name, **snapshot()}, f, indent=2)
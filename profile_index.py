@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Memory-Mapped Profile Index
+===========================
+
+Random access to single profiles by LinkedIn identifier without loading a
+whole raw JSON dump.
+
+- Store: NDJSON, one raw Apify item per line (profiles.ndjson)
+- Index: sorted fixed-width table next to it (profiles.ndjson.idx):
+    header  b"PIX1" + entry count (u64)
+    entry   public identifier (utf-8, NUL-padded to KEY_WIDTH bytes)
+            + byte offset (u64) + byte length (u32) of the record's line
+- Lookup memory-maps both files, binary-searches the index (O(log n)
+  page touches) and json-decodes only the requested line
+
+Keys are canonical public identifiers (url_frontier.canonicalize), so any
+URL variant of a profile finds it. When an identifier appears in several
+inputs the last one wins; failed scrapes are skipped.
+
+Usage:
+    python profile_index.py build apimaestro_full_sections_raw.json apimaestro_batch_raw.json
+    python profile_index.py get https://www.linkedin.com/in/someone
+
+    with ProfileIndex() as index:
+        item = index.get("someone")
+
+Env override: PROFILE_INDEX_PATH (store path; the index is <path>.idx)
+"""
+
+import os
+import sys
+import mmap
+import json
+import struct
+import argparse
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from compact_profile import iter_json_array
+from profile_merge import is_failed, profile_id
+from url_frontier import canonicalize
+
+PROFILE_INDEX_PATH = os.getenv("PROFILE_INDEX_PATH", "profiles.ndjson")
+INDEX_MAGIC = b"PIX1"
+KEY_WIDTH = 128
+ENTRY = struct.Struct(f"<{KEY_WIDTH}sQI")
+HEADER = struct.Struct("<4sQ")
+
+
+def index_path_for(store_path: str) -> str:
+    return store_path + ".idx"
+
+
+def _lookup_key(id_or_url: str) -> str:
+    """Canonical identifier for a bare id or any profile URL."""
+    if "linkedin.com/" in id_or_url.lower():
+        return canonicalize(id_or_url)
+    return canonicalize(f"linkedin.com/in/{id_or_url}")
+
+
+def build_index(inputs: Iterable[str], store_path: str = PROFILE_INDEX_PATH) -> Dict[str, int]:
+    """Write the NDJSON store and its sorted index from raw JSON-array files."""
+    offsets: Dict[bytes, Tuple[int, int]] = {}
+    stats = {"written": 0, "skipped": 0, "too_long": 0}
+    tmp_store = store_path + ".tmp"
+    with open(tmp_store, "wb") as out:
+        for path in inputs:
+            for item in iter_json_array(path):
+                if not isinstance(item, dict) or is_failed(item):
+                    stats["skipped"] += 1
+                    continue
+                pid = profile_id(item)
+                key = pid.encode("utf-8")
+                if not key:
+                    stats["skipped"] += 1
+                    continue
+                if len(key) > KEY_WIDTH:
+                    stats["too_long"] += 1
+                    continue
+                line = json.dumps(item, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+                offsets[key] = (out.tell(), len(line) - 1)
+                out.write(line)
+                stats["written"] += 1
+
+    tmp_index = index_path_for(store_path) + ".tmp"
+    with open(tmp_index, "wb") as f:
+        f.write(HEADER.pack(INDEX_MAGIC, len(offsets)))
+        for key in sorted(offsets):
+            offset, length = offsets[key]
+            f.write(ENTRY.pack(key, offset, length))
+    os.replace(tmp_store, store_path)
+    os.replace(tmp_index, index_path_for(store_path))
+    stats["indexed"] = len(offsets)
+    return stats
+
+
+class ProfileIndex:
+    """Read-only, memory-mapped lookup of raw profiles by public identifier."""
+
+    def __init__(self, store_path: str = PROFILE_INDEX_PATH, index_path: Optional[str] = None):
+        self.store_path = store_path
+        self.index_path = index_path or index_path_for(store_path)
+        self._store_file = open(self.store_path, "rb")
+        self._index_file = open(self.index_path, "rb")
+        self.store = self._map(self._store_file)
+        self.index = self._map(self._index_file)
+        magic, self.size = HEADER.unpack_from(self.index, 0) if len(self.index) >= HEADER.size else (b"", 0)
+        if magic != INDEX_MAGIC or len(self.index) != HEADER.size + self.size * ENTRY.size:
+            self.close()
+            raise ValueError(f"{self.index_path} is not a profile index (rebuild with: python profile_index.py build)")
+
+    @staticmethod
+    def _map(f) -> Any:
+        # mmap cannot map an empty file; an empty bytes object behaves the same for reads
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _entry(self, i: int) -> Tuple[bytes, int, int]:
+        key, offset, length = ENTRY.unpack_from(self.index, HEADER.size + i * ENTRY.size)
+        return key.rstrip(b"\0"), offset, length
+
+    def _find(self, key: bytes) -> Optional[Tuple[int, int]]:
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entry(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.size:
+            found, offset, length = self._entry(lo)
+            if found == key:
+                return offset, length
+        return None
+
+    def get(self, id_or_url: str) -> Optional[Dict[str, Any]]:
+        """Raw item for a public identifier or profile URL (None if absent)."""
+        key = _lookup_key(id_or_url).encode("utf-8")
+        if not key or len(key) > KEY_WIDTH:
+            return None
+        hit = self._find(key)
+        if hit is None:
+            return None
+        offset, length = hit
+        return json.loads(self.store[offset:offset + length])
+
+    def __contains__(self, id_or_url: str) -> bool:
+        key = _lookup_key(id_or_url).encode("utf-8")
+        return bool(key) and len(key) <= KEY_WIDTH and self._find(key) is not None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def keys(self) -> Iterator[str]:
+        """Identifiers in sorted order."""
+        for i in range(self.size):
+            yield self._entry(i)[0].decode("utf-8")
+
+    def close(self) -> None:
+        for m in (getattr(self, "store", None), getattr(self, "index", None)):
+            if isinstance(m, mmap.mmap):
+                m.close()
+        self._store_file.close()
+        self._index_file.close()
+
+    def __enter__(self) -> "ProfileIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the memory-mapped profile index")
+    parser.add_argument("--store", default=PROFILE_INDEX_PATH, help="NDJSON store path (index is <store>.idx)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Index raw Apify JSON-array files")
+    build.add_argument("inputs", nargs="+", help="Raw JSON files; later files win duplicate identifiers")
+    get = sub.add_parser("get", help="Print one profile by public identifier or URL")
+    get.add_argument("ids", nargs="+")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        stats = build_index(args.inputs, args.store)
+        print(f"✅ Indexed {stats['indexed']} profiles into {args.store} "
+              f"({stats['written']} written, {stats['skipped']} skipped, {stats['too_long']} keys too long)")
+        return
+
+    try:
+        index = ProfileIndex(args.store)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+    with index:
+        missing = 0
+        for id_or_url in args.ids:
+            item = index.get(id_or_url)
+            if item is None:
+                missing += 1
+                print(f"❌ Not found: {id_or_url}", file=sys.stderr)
+                continue
+            print(json.dumps(item, indent=2, ensure_ascii=False))
+    if missing:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
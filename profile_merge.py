@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Cross-Source Profile Merge
+==========================
+
+Maps items from every LinkedIn source we pull into one canonical profile
+record, then merges duplicates of the same person field by field.
+
+Sources handled:
+- nested (apimaestro full-sections / batch actors):
+  {basic_info: {...}, experience: [...], education: [...], profileUrl}
+- flat (linkedin-profile-details task and similar):
+  {headline, about|summary, positions|experiences: [{title, companyName, ...}],
+   educations|education, profileUrl|url|publicIdentifier, ...}
+
+Canonical record (the nested shape, so score_apimaestro.score_profile and
+profile_store read it unchanged):
+    {"basic_info": {fullname, headline, about, public_identifier, location:
+                    {full, city, country}, email, follower_count, current_company},
+     "experience": [{title, company, description, location, start_date,
+                     end_date, is_current, duration}],
+     "education": [{school, degree, degree_name, field_of_study, start_date, end_date}],
+     "profileUrl": canonical URL,
+     "sources": [...]}
+
+Merging uses a hash index on the canonical public identifier (see
+url_frontier.canonicalize). Every field keeps the fetch time of the item it
+came from -- the item's own scrape timestamp (scrapedAt, fetchedAt, ...)
+when the actor sets one, else the fetch time passed in -- so a newer
+non-empty value replaces an older one; on a tie the value added first
+stays. Empty values never overwrite. Failed scrapes (no profile data, just
+an error message) are skipped.
+
+The usual fallback fetch time is the input file's modification time
+(file_fetch_times). That is unreliable for committed JSON: a git checkout
+or copy resets every file's mtime to the same moment. So mtimes only
+override the files' precedence order when they are more than
+MTIME_TOLERANCE seconds apart; closer (or future) mtimes keep the order.
+
+Usage:
+    merger = ProfileMerger()
+    paths = ["apimaestro_full_sections_stealth.json", "apimaestro_batch_raw.json"]  # preferred first
+    for path, fetched_at in zip(paths, file_fetch_times(paths)):
+        merger.add_many(items_of(path), source=path, fetched_at=fetched_at)
+    profiles = merger.records()
+"""
+
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from url_frontier import canonical_url, canonicalize
+
+BASIC_FIELDS = ("fullname", "headline", "about", "location", "email", "follower_count", "current_company")
+LIST_FIELDS = ("experience", "education")
+# Scrape-time keys set by the actors / our own fetchers (top level or basic_info)
+FETCH_TIME_KEYS = ("scrapedAt", "scraped_at", "fetchedAt", "fetched_at", "crawledAt", "crawled_at", "retrievedAt")
+# Input files whose mtimes are closer than this keep their precedence order
+MTIME_TOLERANCE = 3600.0
+
+
+def _first(d: Dict[str, Any], *keys: str) -> Any:
+    for k in keys:
+        v = d.get(k)
+        if v not in (None, "", [], {}):
+            return v
+    return None
+
+
+def _empty(value: Any) -> bool:
+    return value in (None, "", [], {}, ()) or value == {"full": "", "city": "", "country": ""} or value == ("", "", "")
+
+
+def _date(value: Any) -> Dict[str, Any]:
+    """{year, month} from the nested dict form, flat {year, month}, or a 'YYYY[-MM]' string ({} if unknown)."""
+    if isinstance(value, dict):
+        year = value.get("year")
+        if year:
+            return {"year": year, "month": value.get("month")}
+        return {}
+    if isinstance(value, (int, float)) and value:
+        return {"year": int(value), "month": None}
+    if isinstance(value, str) and value[:4].isdigit():
+        parts = value.split("-")
+        month = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+        return {"year": int(parts[0]), "month": month}
+    return {}
+
+
+def _location(value: Any) -> Dict[str, str]:
+    if isinstance(value, dict):
+        full = value.get("full") or value.get("default") or ""
+        return {"full": full, "city": value.get("city") or "", "country": value.get("country") or ""}
+    full = str(value or "")
+    parts = [p.strip() for p in full.split(",") if p.strip()]
+    return {"full": full, "city": parts[0] if parts else "", "country": parts[-1] if len(parts) > 1 else ""}
+
+
+def is_nested(item: Dict[str, Any]) -> bool:
+    return isinstance(item.get("basic_info"), dict)
+
+
+def is_failed(item: Dict[str, Any]) -> bool:
+    """Apify error stub: input echo + message, no profile data."""
+    return not is_nested(item) and "message" in item and not _first(item, "headline", "fullName", "firstName", "about")
+
+
+def profile_id(item: Dict[str, Any]) -> str:
+    """Canonical public identifier of a raw item of either schema ("" if unknown)."""
+    basic = item.get("basic_info") if is_nested(item) else {}
+    pid = _first(basic, "public_identifier") or _first(item, "publicIdentifier", "public_identifier")
+    if pid:
+        return canonicalize(f"linkedin.com/in/{pid}")
+    url = _first(item, "profileUrl", "url", "linkedinUrl", "linkedin_url") or _first(basic, "profileUrl") or ""
+    return canonicalize(str(url))
+
+
+def _experience(exp: Dict[str, Any]) -> Dict[str, Any]:
+    period = exp.get("timePeriod") or {}
+    return {
+        "title": _first(exp, "title") or "",
+        "company": _first(exp, "company", "companyName") or "",
+        "description": _first(exp, "description") or "",
+        "location": _first(exp, "location", "locationName") or "",
+        "start_date": _date(_first(exp, "start_date", "startDate") or period.get("startDate")),
+        "end_date": _date(_first(exp, "end_date", "endDate") or period.get("endDate")),
+        "is_current": bool(exp.get("is_current") or exp.get("isCurrent")
+                           or (period and not period.get("endDate"))),
+        "duration": _first(exp, "duration") or "",
+    }
+
+
+def _education(ed: Dict[str, Any]) -> Dict[str, Any]:
+    period = ed.get("timePeriod") or {}
+    return {
+        "school": _first(ed, "school", "schoolName") or "",
+        "degree": _first(ed, "degree") or "",
+        "degree_name": _first(ed, "degree_name", "degreeName") or "",
+        "field_of_study": _first(ed, "field_of_study", "fieldOfStudy") or "",
+        "start_date": _date(_first(ed, "start_date", "startDate") or period.get("startDate")),
+        "end_date": _date(_first(ed, "end_date", "endDate") or period.get("endDate")),
+    }
+
+
+def normalize_profile(item: Dict[str, Any], source: str = "") -> Dict[str, Any]:
+    """Map one raw item (nested or flat schema) to the canonical record."""
+    pid = profile_id(item)
+    if is_nested(item):
+        basic = item["basic_info"]
+        experiences = item.get("experience")
+        educations = item.get("education")
+        fullname = _first(basic, "fullname") or " ".join(
+            p for p in (basic.get("first_name"), basic.get("last_name")) if p
+        )
+        current_company = basic.get("current_company")
+        fields = basic
+    else:
+        experiences = _first(item, "positions", "experiences", "experience")
+        educations = _first(item, "educations", "education")
+        fullname = _first(item, "fullName", "fullname", "name") or " ".join(
+            p for p in (item.get("firstName"), item.get("lastName")) if p
+        )
+        current_company = _first(item, "companyName", "current_company")
+        fields = {
+            "headline": _first(item, "headline", "title", "occupation"),
+            "about": _first(item, "about", "summary"),
+            "location": _first(item, "location", "locationName", "geoLocationName", "addressWithCountry"),
+            "email": _first(item, "email"),
+            "follower_count": _first(item, "followers", "followerCount", "follower_count"),
+        }
+    return {
+        "basic_info": {
+            "fullname": (fullname or "").strip(),
+            "headline": fields.get("headline") or "",
+            "about": fields.get("about") or "",
+            "public_identifier": pid,
+            "location": _location(fields.get("location")),
+            "email": fields.get("email"),
+            "follower_count": fields.get("follower_count") or 0,
+            "current_company": current_company or "",
+        },
+        "experience": [_experience(e) for e in experiences or [] if isinstance(e, dict)],
+        "education": [_education(e) for e in educations or [] if isinstance(e, dict)],
+        "profileUrl": canonical_url(pid) if pid else "",
+        "sources": [source] if source else [],
+    }
+
+
+def get_field(rec: Any, field: str) -> Any:
+    """Field of a canonical dict record or of a slotted record (compact_profile)."""
+    if isinstance(rec, dict):
+        return rec["basic_info"][field] if field in BASIC_FIELDS or field == "public_identifier" else rec[field]
+    return getattr(rec, field)
+
+
+def set_field(rec: Any, field: str, value: Any) -> None:
+    if isinstance(rec, dict):
+        (rec["basic_info"] if field in BASIC_FIELDS else rec)[field] = value
+    else:
+        setattr(rec, field, value)
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    """Epoch seconds from epoch seconds/milliseconds or an ISO-8601 string (None if unparseable)."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value / 1000.0 if value > 1e11 else float(value)
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def item_fetched_at(item: Dict[str, Any]) -> Optional[float]:
+    """The item's own scrape time (epoch seconds), if the source recorded one."""
+    basic = item.get("basic_info") if isinstance(item.get("basic_info"), dict) else {}
+    for d in (item, basic):
+        for key in FETCH_TIME_KEYS:
+            ts = _timestamp(d.get(key))
+            if ts is not None:
+                return ts
+    return None
+
+
+def file_fetch_times(paths: List[str], tolerance: float = MTIME_TOLERANCE) -> List[float]:
+    """Fallback fetch times for input files listed in precedence order (preferred first).
+
+    Each file's mtime (0 if missing, clamped to now if in the future) plus
+    `tolerance` per place it is ahead of the last file, so a later file only
+    outranks an earlier one when its mtime is newer by more than that."""
+    now = time.time()
+    times = []
+    for rank, path in enumerate(paths):
+        try:
+            mtime = min(os.path.getmtime(path), now)
+        except OSError:
+            mtime = 0.0
+        times.append(mtime + (len(paths) - 1 - rank) * tolerance)
+    return times
+
+
+class ProfileMerger:
+    """Hash-indexed merge of canonical records; newest non-empty value wins per field.
+
+    `factory` (e.g. CompactProfile.from_record) converts each canonical dict
+    before it is indexed, so only the converted form stays in memory."""
+
+    def __init__(self, factory: Optional[Callable[[Dict[str, Any]], Any]] = None):
+        self.factory = factory
+        self.index: Dict[str, Any] = {}
+        # fetched_at of the item that created each record ...
+        self._born: Dict[str, float] = {}
+        # ... and, only for merged records, field -> fetched_at of the value held
+        self._stamps: Dict[str, Dict[str, float]] = {}
+        self.unkeyed: List[Any] = []
+        self.skipped = 0
+        self.duplicates = 0
+
+    def add(self, item: Dict[str, Any], source: str = "", fetched_at: float = 0) -> Optional[Any]:
+        """Merge one raw item; returns its canonical record (None if skipped).
+
+        `fetched_at` applies only when the item carries no scrape timestamp of its own."""
+        if not isinstance(item, dict) or is_failed(item):
+            self.skipped += 1
+            return None
+        own = item_fetched_at(item)
+        if own is not None:
+            fetched_at = own
+        rec = normalize_profile(item, source)
+        if self.factory is not None:
+            rec = self.factory(rec)
+        pid = get_field(rec, "public_identifier")
+        if not pid:
+            self.unkeyed.append(rec)
+            return rec
+        current = self.index.get(pid)
+        if current is None:
+            self.index[pid] = rec
+            self._born[pid] = fetched_at
+            return rec
+        self.duplicates += 1
+        stamps = self._stamps.setdefault(pid, {})
+        born = self._born[pid]
+        for field in BASIC_FIELDS + LIST_FIELDS:
+            value = get_field(rec, field)
+            if _empty(value):
+                continue
+            if _empty(get_field(current, field)) or fetched_at > stamps.get(field, born):
+                set_field(current, field, value)
+                stamps[field] = fetched_at
+        sources = get_field(current, "sources")
+        for src in get_field(rec, "sources"):
+            if src not in sources:
+                sources.append(src)
+        return current
+
+    def add_many(self, items: Iterable[Dict[str, Any]], source: str = "", fetched_at: float = 0) -> None:
+        for item in items or []:
+            self.add(item, source, fetched_at)
+
+    def records(self) -> List[Any]:
+        """Merged records in first-seen order (unkeyed records last)."""
+        return list(self.index.values()) + self.unkeyed
+
+    def report(self) -> str:
+        return (f"🔀 Merged {len(self.index) + len(self.unkeyed)} profiles "
+                f"({self.duplicates} duplicates folded, {self.skipped} failed items skipped)")
+
+
+def merge_profiles(*sources: Tuple[str, Iterable[Dict[str, Any]], float]) -> List[Dict[str, Any]]:
+    """merge_profiles(("name", items, fetched_at), ...) -> canonical records."""
+    merger = ProfileMerger()
+    for source, items, fetched_at in sources:
+        merger.add_many(items, source, fetched_at)
+    return merger.records()
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Persistent Profile Store (SQLAlchemy: SQLite or Postgres)
+=========================================================
+
+Normalized home for enriched and scored profiles instead of loose JSON/CSV:
+
+- profiles     one row per public_identifier (unique index), with a
+               normalized city key (indexed) for location queries
+- experiences  child rows of a profile (replaced on every upsert)
+- education    child rows of a profile (replaced on every upsert)
+- scores       latest score per (profile, scorer), indexed on tier and score
+- runs         one row per scoring run (scorer, source, counts, timestamps)
+- fetch_state  last fetch time + content hash per profile, for change-driven
+               re-enrichment (reenrich_planner.py)
+
+Scorers call store_scored_run(raw_profiles, scored_rows, scorer=...) to
+bulk-upsert a whole run (in CHUNK_SIZE slices, so raw_profiles may be a
+generator). "Tier A in Bangalore" is then an indexed query:
+
+    python3 profile_store.py --tier A --city Bangalore
+
+Database URL: DATABASE_URL env var (default sqlite:///founder_sourcing.db)
+"""
+
+import os
+import argparse
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import (
+    Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text,
+    create_engine, delete, inspect, select, text,
+)
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, relationship
+
+DEFAULT_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///founder_sourcing.db")
+
+# Normalized city keys so "Bengaluru, Karnataka" and "Bangalore" match
+CITY_ALIASES = {
+    "bengaluru": "bangalore",
+    "gurugram": "gurgaon",
+    "bombay": "mumbai",
+    "new delhi": "delhi",
+    "madras": "chennai",
+    "calcutta": "kolkata",
+    "nyc": "new york",
+    "new york city": "new york",
+}
+
+# Keep bulk statements well under SQLite's bound-parameter limit
+CHUNK_SIZE = 500
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Run(Base):
+    __tablename__ = "runs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    scorer: Mapped[str] = mapped_column(String(64), index=True)
+    source: Mapped[str] = mapped_column(String(255), default="")
+    profile_count: Mapped[int] = mapped_column(Integer, default=0)
+    started_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+class Profile(Base):
+    __tablename__ = "profiles"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    public_identifier: Mapped[str] = mapped_column(String(255), unique=True, index=True)
+    url: Mapped[str] = mapped_column(String(512), default="")
+    fullname: Mapped[str] = mapped_column(String(255), default="")
+    headline: Mapped[str] = mapped_column(Text, default="")
+    about: Mapped[str] = mapped_column(Text, default="")
+    location: Mapped[str] = mapped_column(String(255), default="")
+    city: Mapped[str] = mapped_column(String(128), default="", index=True)
+    country: Mapped[str] = mapped_column(String(128), default="")
+    email: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    follower_count: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    experiences: Mapped[List["Experience"]] = relationship(back_populates="profile", order_by="Experience.position")
+    education: Mapped[List["Education"]] = relationship(back_populates="profile", order_by="Education.position")
+    scores: Mapped[List["Score"]] = relationship(back_populates="profile")
+    fetch_state: Mapped[Optional["FetchState"]] = relationship(back_populates="profile")
+
+
+class Experience(Base):
+    __tablename__ = "experiences"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    profile_id: Mapped[int] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"), index=True)
+    position: Mapped[int] = mapped_column(Integer, default=0)
+    title: Mapped[str] = mapped_column(String(512), default="")
+    company: Mapped[str] = mapped_column(String(255), default="")
+    start_year: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    end_year: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    is_current: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    profile: Mapped[Profile] = relationship(back_populates="experiences")
+
+
+class Education(Base):
+    __tablename__ = "education"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    profile_id: Mapped[int] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"), index=True)
+    position: Mapped[int] = mapped_column(Integer, default=0)
+    school: Mapped[str] = mapped_column(String(255), default="")
+    degree: Mapped[str] = mapped_column(String(255), default="")
+    start_year: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    end_year: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    profile: Mapped[Profile] = relationship(back_populates="education")
+
+
+class Score(Base):
+    __tablename__ = "scores"
+    __table_args__ = (
+        Index("uq_scores_profile_scorer", "profile_id", "scorer", unique=True),
+        Index("idx_scores_scorer_tier_score", "scorer", "tier", "score"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    profile_id: Mapped[int] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"))
+    run_id: Mapped[Optional[int]] = mapped_column(ForeignKey("runs.id"), nullable=True)
+    scorer: Mapped[str] = mapped_column(String(64))
+    score: Mapped[float] = mapped_column(Float, index=True)
+    tier: Mapped[str] = mapped_column(String(1), index=True)
+    # Hex bitset of fired rules / matched terms (score_explain.py)
+    explain_bits: Mapped[str] = mapped_column(String(128), default="")
+    scored_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    profile: Mapped[Profile] = relationship(back_populates="scores")
+
+
+class FetchState(Base):
+    __tablename__ = "fetch_state"
+
+    profile_id: Mapped[int] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"), primary_key=True)
+    last_fetched_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+    # Hash of headline + current roles; a new value means the profile changed
+    content_hash: Mapped[str] = mapped_column(String(32), default="")
+    last_changed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    fetch_count: Mapped[int] = mapped_column(Integer, default=0)
+    change_count: Mapped[int] = mapped_column(Integer, default=0)
+
+    profile: Mapped[Profile] = relationship(back_populates="fetch_state")
+
+
+# ---- engine / session ----------------------------------------------------
+
+_engines: Dict[str, Engine] = {}
+
+
+def get_engine(db_url: Optional[str] = None) -> Engine:
+    """Engine for `db_url` (cached per URL); creates tables on first use."""
+    url = db_url or DEFAULT_DATABASE_URL
+    if url not in _engines:
+        engine = create_engine(url, future=True)
+        Base.metadata.create_all(engine)
+        _add_missing_columns(engine)
+        _engines[url] = engine
+    return _engines[url]
+
+
+def _add_missing_columns(engine: Engine) -> None:
+    """create_all never alters existing tables: add columns introduced since a database was created."""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    ddl = column.type.compile(dialect=engine.dialect)
+                    default = " DEFAULT ''" if isinstance(column.type, String) else ""
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {ddl}{default}"))
+
+
+def _insert(engine: Engine):
+    """Dialect-specific INSERT supporting ON CONFLICT upserts."""
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def _chunks(items: List[Any], size: int = CHUNK_SIZE) -> Iterable[List[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# ---- normalization -------------------------------------------------------
+
+def normalize_city(value: str) -> str:
+    city = (value or "").split(",")[0].strip().lower()
+    for suffix in (" area", " metropolitan", " bay", " region"):
+        if city.endswith(suffix):
+            city = city[: -len(suffix)].strip()
+    if city.startswith("greater "):
+        city = city[len("greater "):]
+    return CITY_ALIASES.get(city, city)
+
+
+def _year(d: Any) -> Optional[int]:
+    if isinstance(d, dict) and isinstance(d.get("year"), int):
+        return d["year"]
+    return None
+
+
+def _public_id(p: Dict[str, Any]) -> str:
+    basic = p.get("basic_info") if isinstance(p.get("basic_info"), dict) else {}
+    pid = (basic.get("public_identifier") or p.get("public_identifier") or p.get("publicIdentifier")
+           or basic.get("profileUrl") or p.get("profileUrl") or p.get("linkedin_url") or p.get("url") or "")
+    pid = str(pid).strip()
+    if "linkedin.com/in/" in pid:
+        pid = pid.split("linkedin.com/in/")[-1].split("/")[0].split("?")[0]
+    return pid.lower()
+
+
+def profile_row(p: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten an apimaestro (basic_info/...) or flat profile dict into a profiles row."""
+    basic = p.get("basic_info") if isinstance(p.get("basic_info"), dict) else p
+    location = basic.get("location")
+    if isinstance(location, dict):
+        loc_full = location.get("full") or location.get("city") or location.get("country") or ""
+        city = location.get("city") or loc_full
+        country = location.get("country") or ""
+    else:
+        loc_full = str(location or "")
+        city = loc_full
+        country = ""
+    pid = _public_id(p)
+    return {
+        "public_identifier": pid,
+        "url": f"https://www.linkedin.com/in/{pid}" if pid else "",
+        "fullname": (basic.get("fullname") or basic.get("name") or "").strip(),
+        "headline": basic.get("headline") or "",
+        "about": basic.get("about") or "",
+        "location": loc_full,
+        "city": normalize_city(city),
+        "country": country,
+        "email": basic.get("email"),
+        "follower_count": basic.get("follower_count") or 0,
+        "updated_at": datetime.utcnow(),
+    }
+
+
+def _experience_rows(p: Dict[str, Any], profile_id: int) -> List[Dict[str, Any]]:
+    rows = []
+    for i, exp in enumerate(p.get("experience") or []):
+        if not isinstance(exp, dict):
+            continue
+        rows.append({
+            "profile_id": profile_id,
+            "position": i,
+            "title": exp.get("title") or "",
+            "company": exp.get("company") or "",
+            "start_year": _year(exp.get("start_date")),
+            "end_year": _year(exp.get("end_date")),
+            "is_current": bool(exp.get("is_current")),
+        })
+    return rows
+
+
+def _education_rows(p: Dict[str, Any], profile_id: int) -> List[Dict[str, Any]]:
+    rows = []
+    for i, ed in enumerate(p.get("education") or []):
+        if not isinstance(ed, dict):
+            continue
+        rows.append({
+            "profile_id": profile_id,
+            "position": i,
+            "school": ed.get("school") or "",
+            "degree": ed.get("degree_name") or ed.get("degree") or "",
+            "start_year": _year(ed.get("start_date")),
+            "end_year": _year(ed.get("end_date")),
+        })
+    return rows
+
+
+# ---- bulk writes ---------------------------------------------------------
+
+def upsert_profiles(session: Session, raw_profiles: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Bulk-upsert profiles and replace their experience/education rows.
+    Returns {public_identifier: profile_id}."""
+    engine = session.get_bind()
+    insert = _insert(engine)
+    by_pid: Dict[str, Any] = {}
+    for p in raw_profiles:
+        if isinstance(p, dict):
+            row = profile_row(p)
+            if row["public_identifier"]:
+                by_pid[row["public_identifier"]] = (row, p)
+
+    rows = [row for row, _ in by_pid.values()]
+    update_cols = [c for c in rows[0].keys() if c != "public_identifier"] if rows else []
+    for chunk in _chunks(rows):
+        stmt = insert(Profile).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Profile.public_identifier],
+            set_={c: getattr(stmt.excluded, c) for c in update_cols},
+        )
+        session.execute(stmt)
+
+    ids: Dict[str, int] = {}
+    for chunk in _chunks(list(by_pid.keys())):
+        for pid, profile_id in session.execute(
+            select(Profile.public_identifier, Profile.id).where(Profile.public_identifier.in_(chunk))
+        ):
+            ids[pid] = profile_id
+
+    id_list = list(ids.values())
+    for chunk in _chunks(id_list):
+        session.execute(delete(Experience).where(Experience.profile_id.in_(chunk)))
+        session.execute(delete(Education).where(Education.profile_id.in_(chunk)))
+    exp_rows: List[Dict[str, Any]] = []
+    edu_rows: List[Dict[str, Any]] = []
+    for pid, (_, p) in by_pid.items():
+        exp_rows.extend(_experience_rows(p, ids[pid]))
+        edu_rows.extend(_education_rows(p, ids[pid]))
+    if exp_rows:
+        session.execute(insert(Experience), exp_rows)
+    if edu_rows:
+        session.execute(insert(Education), edu_rows)
+    return ids
+
+
+def upsert_scores(session: Session, run_id: int, scorer: str, scores: List[Dict[str, Any]]) -> None:
+    """scores: [{"profile_id", "score", "tier", "explain_bits"}]; keeps only the latest per (profile, scorer)."""
+    insert = _insert(session.get_bind())
+    now = datetime.utcnow()
+    rows = [{**s, "run_id": run_id, "scorer": scorer, "scored_at": now} for s in scores]
+    for chunk in _chunks(rows):
+        stmt = insert(Score).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Score.profile_id, Score.scorer],
+            set_={c: getattr(stmt.excluded, c) for c in ("run_id", "score", "tier", "explain_bits", "scored_at")},
+        )
+        session.execute(stmt)
+
+
+def store_scored_run(
+    raw_profiles: Iterable[Dict[str, Any]],
+    scored_rows: List[Dict[str, Any]],
+    scorer: str,
+    source: str = "",
+    db_url: Optional[str] = None,
+) -> int:
+    """Upsert a scoring run: raw_profiles[i] was scored as scored_rows[i].
+
+    raw_profiles is consumed CHUNK_SIZE profiles at a time, so it can be a
+    generator that builds each dict on demand (CompactProfile.to_record).
+    Returns the run id."""
+    engine = get_engine(db_url)
+    with Session(engine) as session, session.begin():
+        run = Run(scorer=scorer, source=source, profile_count=len(scored_rows))
+        session.add(run)
+        session.flush()
+        pairs = zip(raw_profiles, scored_rows)
+        while chunk := list(islice(pairs, CHUNK_SIZE)):
+            ids = upsert_profiles(session, [p for p, _ in chunk])
+            scores = []
+            for p, r in chunk:
+                pid = _public_id(p) if isinstance(p, dict) else ""
+                if pid in ids:
+                    scores.append({"profile_id": ids[pid], "score": r.get("score", 0), "tier": r.get("tier", ""),
+                                   "explain_bits": r.get("explain_bits", "")})
+            upsert_scores(session, run.id, scorer, scores)
+        run.finished_at = datetime.utcnow()
+        return run.id
+
+
+# ---- queries -------------------------------------------------------------
+
+def query_profiles(
+    tier: Optional[str] = None,
+    city: Optional[str] = None,
+    scorer: str = "apimaestro",
+    min_score: Optional[float] = None,
+    limit: Optional[int] = None,
+    db_url: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Latest-scored profiles filtered on tier / city / score (all indexed)."""
+    engine = get_engine(db_url)
+    stmt = (
+        select(Profile.public_identifier, Profile.fullname, Profile.url, Profile.headline,
+               Profile.location, Score.score, Score.tier, Score.explain_bits)
+        .join(Score, Score.profile_id == Profile.id)
+        .where(Score.scorer == scorer)
+    )
+    if tier:
+        stmt = stmt.where(Score.tier == tier.upper())
+    if city:
+        stmt = stmt.where(Profile.city == normalize_city(city))
+    if min_score is not None:
+        stmt = stmt.where(Score.score >= min_score)
+    stmt = stmt.order_by(Score.score.desc())
+    if limit:
+        stmt = stmt.limit(limit)
+    with Session(engine) as session:
+        return [dict(r._mapping) for r in session.execute(stmt)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the profile store")
+    parser.add_argument("--tier", help="A, B or C")
+    parser.add_argument("--city", help="e.g. Bangalore")
+    parser.add_argument("--scorer", default="apimaestro", help="apimaestro or indian_founders")
+    parser.add_argument("--min-score", type=float)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--db", help="Database URL (default: DATABASE_URL)")
+    parser.add_argument("--explain", action="store_true", help="Print why each profile scored as it did")
+    args = parser.parse_args()
+
+    rows = query_profiles(args.tier, args.city, args.scorer, args.min_score, args.limit, args.db)
+    print(f"🔎 {len(rows)} profiles")
+    for r in rows:
+        print(f"{r['score']:>5} {r['tier']}  {r['fullname'] or r['public_identifier']} — {r['location']} — {r['url']}")
+        if args.explain and r["explain_bits"]:
+            from score_explain import explain
+            for line in explain(args.scorer, r["explain_bits"]):
+                print(f"        {line}")
+
+
+if __name__ == "__main__":
+    main()
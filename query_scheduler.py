@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Adaptive Search Query Scheduler
+===============================
+
+Spends the SerpAPI budget on the queries that keep producing *new* LinkedIn
+profiles instead of running every keyword x location combination in order.
+
+- Persistent per-query stats (SQLite table query_stats): credits spent,
+  URLs returned, new unique URLs, next page to fetch, last run time
+- Yield = new unique URLs per SerpAPI credit
+- UCB1 policy: smoothed yield + exploration bonus. Queries that have never
+  run borrow their template's average yield as a prior, so templates that
+  pay off get explored first
+- A productive query advances to its next results page and may be picked
+  again in the same run; a page with no new URLs sends it back to page 1
+- Queries that spent PRUNE_MIN_CREDITS without a single new URL are pruned
+
+Usage:
+    scheduler = QueryScheduler(plan, known_ids)
+    while (pick := scheduler.next_query()) and budget:
+        urls = search(pick.query, pick.page)
+        scheduler.record(pick, urls, credits=1)
+"""
+
+import os
+import math
+import time
+import sqlite3
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from url_frontier import canonicalize
+
+STATS_PATH = os.getenv("QUERY_STATS_PATH", "query_stats.sqlite")
+PRUNE_MIN_CREDITS = 3
+EXPLORATION = 1.0
+# Pseudo-credits of template prior blended into each query's observed yield
+PRIOR_WEIGHT = 2.0
+MAX_PAGE = 5
+
+
+@dataclass
+class QueryPick:
+    query: str
+    template: str
+    page: int
+
+
+class QueryScheduler:
+    """UCB1 scheduler over search queries, persisted in SQLite."""
+
+    def __init__(
+        self,
+        plan: Iterable[Tuple[str, str]],
+        known_ids: Optional[Set[str]] = None,
+        path: str = STATS_PATH,
+        is_new: Optional[Callable[[str], bool]] = None,
+        max_page: int = MAX_PAGE,
+    ):
+        """plan: (template, query) pairs. Novelty is checked with `is_new(url)`
+        when given (e.g. a UrlFrontier.seen check), else against `known_ids`
+        (canonical public identifiers). Queries are paged up to `max_page` pages."""
+        plan = list(plan)
+        self.max_page = max_page
+        self.known_ids: Set[str] = set(known_ids or ())
+        self.is_new = is_new
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS query_stats (
+                query TEXT PRIMARY KEY,
+                template TEXT NOT NULL,
+                runs INTEGER NOT NULL DEFAULT 0,
+                credits INTEGER NOT NULL DEFAULT 0,
+                urls INTEGER NOT NULL DEFAULT 0,
+                new_urls INTEGER NOT NULL DEFAULT 0,
+                next_page INTEGER NOT NULL DEFAULT 0,
+                last_run REAL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_query_stats_template ON query_stats (template)")
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO query_stats (query, template) VALUES (?, ?)",
+            [(q, t) for t, q in plan],
+        )
+        self.conn.commit()
+        self.queries = {q: t for t, q in plan}
+        self.used_this_run: Set[str] = set()
+
+    # ---- policy -----------------------------------------------------
+
+    def _rows(self) -> List[Tuple[str, str, int, int, int]]:
+        return self.conn.execute(
+            "SELECT query, template, credits, new_urls, next_page FROM query_stats"
+        ).fetchall()
+
+    def _template_priors(self, rows) -> Tuple[Dict[str, float], float]:
+        totals: Dict[str, List[int]] = {}
+        all_new = all_credits = 0
+        for _, template, credits, new_urls, _ in rows:
+            t = totals.setdefault(template, [0, 0])
+            t[0] += new_urls
+            t[1] += credits
+            all_new += new_urls
+            all_credits += credits
+        global_mean = (all_new + 1.0) / (all_credits + 1.0)
+        priors = {
+            t: (new + PRIOR_WEIGHT * global_mean) / (credits + PRIOR_WEIGHT)
+            for t, (new, credits) in totals.items()
+        }
+        return priors, global_mean
+
+    def ranked(self) -> List[Tuple[float, QueryPick]]:
+        """All live queries of the current plan, best first."""
+        rows = [r for r in self._rows() if r[0] in self.queries]
+        priors, global_mean = self._template_priors(rows)
+        total_credits = sum(r[2] for r in rows) + 1
+        out = []
+        for query, template, credits, new_urls, next_page in rows:
+            if query in self.used_this_run:
+                continue
+            if credits >= PRUNE_MIN_CREDITS and new_urls == 0:
+                continue  # pruned: dead query
+            prior = priors.get(template, global_mean)
+            mean = (new_urls + PRIOR_WEIGHT * prior) / (credits + PRIOR_WEIGHT)
+            bonus = EXPLORATION * math.sqrt(math.log(total_credits + 1) / (credits + 1))
+            out.append((mean + bonus, QueryPick(query, template, next_page)))
+        out.sort(key=lambda x: x[0], reverse=True)
+        return out
+
+    def next_query(self) -> Optional[QueryPick]:
+        ranked = self.ranked()
+        if not ranked:
+            return None
+        pick = ranked[0][1]
+        self.used_this_run.add(pick.query)
+        return pick
+
+    # ---- feedback ---------------------------------------------------
+
+    def _count_new(self, urls: Iterable[str]) -> int:
+        new = 0
+        for url in urls:
+            if self.is_new is not None:
+                new += 1 if self.is_new(url) else 0
+                continue
+            pid = canonicalize(url)
+            if pid and pid not in self.known_ids:
+                self.known_ids.add(pid)
+                new += 1
+        return new
+
+    def record(self, pick: QueryPick, urls: List[str], credits: int = 1, last_page: bool = False) -> int:
+        """Store the outcome of running `pick`; returns the number of new URLs.
+
+        last_page: the search returned a short page, so there is no next page to fetch."""
+        new = self._count_new(urls)
+        next_page = pick.page + 1 if new > 0 and not last_page and pick.page + 1 < self.max_page else 0
+        self.conn.execute(
+            """
+            UPDATE query_stats
+            SET runs = runs + 1, credits = credits + ?, urls = urls + ?, new_urls = new_urls + ?,
+                next_page = ?, last_run = ?
+            WHERE query = ?
+            """,
+            (credits, len(urls), new, next_page, time.time(), pick.query),
+        )
+        self.conn.commit()
+        if next_page:
+            # Still producing: allow its next page to compete again this run
+            self.used_this_run.discard(pick.query)
+        return new
+
+    # ---- reporting --------------------------------------------------
+
+    def template_report(self) -> List[Tuple[str, int, int, float]]:
+        """(template, credits, new_urls, yield per credit), best first."""
+        rows = self.conn.execute(
+            "SELECT template, SUM(credits), SUM(new_urls) FROM query_stats GROUP BY template"
+        ).fetchall()
+        report = [(t, c or 0, n or 0, (n or 0) / c if c else 0.0) for t, c, n in rows]
+        report.sort(key=lambda r: r[3], reverse=True)
+        return report
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Shared Rate Limiters
+====================
+
+Token-bucket limiters used by the API clients (OpenAI analysis pool,
+Firecrawl scraping). A bucket refills continuously at `rate_per_minute` and
+callers acquire `cost` tokens before each request, so the same bucket can
+meter requests (cost=1) or tokens (cost=estimated prompt + completion size).
+
+- AsyncTokenBucket: `await acquire(cost)`, shared between asyncio tasks
+- TokenBucket: blocking `acquire(cost)` for synchronous callers, shared
+  between threads
+
+Time spent waiting is added to founder_rate_limit_wait_seconds_total with the
+bucket's `name` as the limiter label.
+"""
+
+import asyncio
+import time
+import threading
+from typing import Optional
+
+from metrics import RATE_LIMIT_WAIT
+
+
+class _Bucket:
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None, name: str = "token_bucket"):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate_per_sec = rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self.name = name
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _take(self, cost: float) -> float:
+        """Consume `cost` tokens and return 0, or return the seconds until they are available."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_sec)
+        self._updated = now
+        if self._tokens >= cost:
+            self._tokens -= cost
+            return 0.0
+        return (cost - self._tokens) / self.rate_per_sec
+
+
+class AsyncTokenBucket(_Bucket):
+    """Continuous-refill token bucket safe to share between asyncio tasks."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None, name: str = "token_bucket"):
+        super().__init__(rate_per_minute, capacity, name)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, cost: float = 1.0) -> None:
+        """Wait until `cost` tokens are available, then consume them."""
+        # A single request larger than the bucket would otherwise wait forever
+        cost = min(float(cost), self.capacity)
+        async with self._lock:
+            while (wait := self._take(cost)) > 0:
+                RATE_LIMIT_WAIT.inc(wait, limiter=self.name)
+                await asyncio.sleep(wait)
+
+
+class TokenBucket(_Bucket):
+    """Blocking token bucket safe to share between threads."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None, name: str = "token_bucket"):
+        super().__init__(rate_per_minute, capacity, name)
+        self._lock = threading.Lock()
+
+    def acquire(self, cost: float = 1.0) -> None:
+        """Block until `cost` tokens are available, then consume them."""
+        cost = min(float(cost), self.capacity)
+        with self._lock:
+            while (wait := self._take(cost)) > 0:
+                RATE_LIMIT_WAIT.inc(wait, limiter=self.name)
+                time.sleep(wait)
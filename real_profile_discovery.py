@@ -10,11 +10,17 @@ and find similar real profiles that Antler can reach out to.
 import os
 import json
 import time
+import asyncio
 import requests
 from typing import List, Dict, Any
 import openai
 from dotenv import load_dotenv
 
+from analysis_cascade import keyword_score, merge_signals, should_escalate
+from firecrawl_client import FirecrawlClient
+from llm_analysis_pool import AnalysisJob, AnalysisPool, run_analyses
+from response_cache import ResponseCache, make_key
+
 # Load environment variables
 load_dotenv()
 
@@ -34,61 +40,31 @@ SAMPLE_PROFILES = [
     "https://www.linkedin.com/in/pskumar2018/"
 ]
 
+_firecrawl_client = None
+
+def get_firecrawl_client() -> FirecrawlClient:
+    """Shared Firecrawl client (pooled connections, rate limit, retry, URL cache)"""
+    global _firecrawl_client
+    if _firecrawl_client is None:
+        _firecrawl_client = FirecrawlClient(api_key=FIRECRAWL_API_KEY, cache=ResponseCache(namespace="firecrawl"))
+    return _firecrawl_client
+
 def scrape_linkedin_profile(profile_url: str) -> Dict[str, Any]:
     """
     Scrape a LinkedIn profile using Firecrawl API
     """
-    try:
-        url = "https://api.firecrawl.dev/scrape"
-        headers = {
-            "Authorization": f"Bearer {FIRECRAWL_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "url": profile_url,
-            "includeHtml": True,
-            "waitFor": 3000
-        }
-        
-        print(f"🔍 Scraping: {profile_url}")
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
-        
-        if response.status_code == 200:
-            data = response.json()
-            return {
-                "url": profile_url,
-                "success": True,
-                "data": data.get("data", {}),
-                "html": data.get("html", "")
-            }
-        else:
-            print(f"❌ Failed to scrape {profile_url}: {response.status_code}")
-            return {"url": profile_url, "success": False, "error": response.text}
-            
-    except Exception as e:
-        print(f"❌ Error scraping {profile_url}: {str(e)}")
-        return {"url": profile_url, "success": False, "error": str(e)}
+    print(f"🔍 Scraping: {profile_url}")
+    result = get_firecrawl_client().scrape_sync(profile_url)
+    if not result["success"]:
+        print(f"❌ Failed to scrape {profile_url}: {result.get('error', 'Unknown error')}")
+    return result
+
+ANALYSIS_SYSTEM_PROMPT = "You are a VC analyst helping Antler find early-stage founders. Extract key information from LinkedIn profiles."
+ANALYSIS_INSTRUCTIONS = """
+        Analyze this LinkedIn profile and extract key information for Antler VC.
 
-def analyze_profile_with_openai(profile_data: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Use OpenAI to analyze a profile and extract key information
-    """
-    try:
-        # Extract text content from profile
-        content = profile_data.get("data", {}).get("markdown", "")
-        if not content:
-            return {"success": False, "error": "No content to analyze"}
-        
-        # Create prompt for OpenAI
-        prompt = f"""
-        Analyze this LinkedIn profile and extract key information for Antler VC:
-        
-        Profile Content:
-        {content[:2000]}  # Limit content length
-        
         Please extract and return a JSON object with:
-        {{
+        {
             "name": "Full name",
             "headline": "Current headline/role",
             "location": "Location",
@@ -101,19 +77,52 @@ def analyze_profile_with_openai(profile_data: Dict[str, Any]) -> Dict[str, Any]:
             "investment_readiness": "High/Medium/Low",
             "conversation_potential": "High/Medium/Low",
             "key_insights": "Brief analysis for Antler"
-        }}
-        
+        }
+
         Focus on:
         - Early-stage indicators (recent graduates, stealth mode, building something)
         - AI/ML, fintech, healthtech backgrounds
         - Geographic fit for Antler locations
         - Conversation potential for Antler team
         """
+MAX_CONTENT_CHARS = 2000  # Limit content length
+ANALYSIS_MODEL = "gpt-3.5-turbo"
+# Bump whenever ANALYSIS_INSTRUCTIONS/ANALYSIS_SYSTEM_PROMPT change so cached analyses are not reused
+ANALYSIS_PROMPT_VERSION = "real-v1"
+
+_analysis_cache = None
+
+def get_analysis_cache() -> ResponseCache:
+    """Persistent LLM response cache (created on first use)"""
+    global _analysis_cache
+    if _analysis_cache is None:
+        _analysis_cache = ResponseCache(namespace="llm_analysis")
+    return _analysis_cache
+
+def analyze_profile_with_openai(profile_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Use OpenAI to analyze a profile and extract key information
+    """
+    try:
+        # Extract text content from profile
+        content = profile_data.get("data", {}).get("markdown", "")
+        if not content:
+            return {"success": False, "error": "No content to analyze"}
+        
+        content = content[:MAX_CONTENT_CHARS]
+        cache = get_analysis_cache()
+        cache_key = make_key(ANALYSIS_MODEL, ANALYSIS_PROMPT_VERSION, content)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Create prompt for OpenAI
+        prompt = f"{ANALYSIS_INSTRUCTIONS}\n\nProfile Content:\n{content}"
         
         response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
+            model=ANALYSIS_MODEL,
             messages=[
-                {"role": "system", "content": "You are a VC analyst helping Antler find early-stage founders. Extract key information from LinkedIn profiles."},
+                {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.3,
@@ -125,6 +134,7 @@ def analyze_profile_with_openai(profile_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
             analysis = json.loads(analysis_text)
             analysis["success"] = True
+            cache.set(cache_key, analysis)
             return analysis
         except json.JSONDecodeError:
             return {"success": False, "error": "Failed to parse OpenAI response"}
@@ -132,6 +142,68 @@ def analyze_profile_with_openai(profile_data: Dict[str, Any]) -> Dict[str, Any]:
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+def analysis_pool_options() -> Dict[str, Any]:
+    return {
+        "instructions": ANALYSIS_INSTRUCTIONS,
+        "system_prompt": ANALYSIS_SYSTEM_PROMPT,
+        "model": ANALYSIS_MODEL,
+        "cache": get_analysis_cache(),
+        "prompt_version": ANALYSIS_PROMPT_VERSION,
+    }
+
+def analyze_profiles_concurrently(scraped: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Analyze many scraped profiles through the async OpenAI pool
+    (bounded concurrency, TPM limiting, optional batching, validated JSON).
+    Returns one analysis dict per input, in order.
+    """
+    results: List[Dict[str, Any]] = [{"success": False, "error": "No content to analyze"} for _ in scraped]
+    jobs, slots = [], []
+    for i, profile_data in enumerate(scraped):
+        content = profile_data.get("data", {}).get("markdown", "")
+        if content:
+            jobs.append(AnalysisJob(key=profile_data["url"], content=content[:MAX_CONTENT_CHARS]))
+            slots.append(i)
+    if jobs:
+        analyses = run_analyses(jobs, **analysis_pool_options())
+        for i, analysis in zip(slots, analyses):
+            results[i] = analysis
+    return results
+
+async def scrape_and_analyze(profile_urls: List[str]):
+    """
+    Stream Firecrawl results straight into the keyword pre-filter and the
+    LLM pool: each profile is triaged (and, if escalated, analyzed) as soon
+    as its scrape lands instead of after the whole batch.
+    Returns (escalated, settled): escalated items are
+    (profile_data, keyword_result, analysis), settled are (profile_data, keyword_result).
+    """
+    pool = AnalysisPool(**analysis_pool_options())
+    pending = []
+    settled = []
+
+    async def analyze(profile_data: Dict[str, Any], keyword_result: Dict[str, Any]):
+        content = profile_data["data"]["markdown"][:MAX_CONTENT_CHARS]
+        analysis = await pool.analyze(AnalysisJob(key=profile_data["url"], content=content))
+        return profile_data, keyword_result, analysis
+
+    async for profile_data in get_firecrawl_client().stream(profile_urls):
+        if not profile_data["success"]:
+            print(f"   ❌ Scraping failed: {profile_data['url']}")
+            continue
+        if not (profile_data.get("data") or {}).get("markdown"):
+            print(f"   ❌ No content to analyze: {profile_data['url']}")
+            continue
+        keyword_result = keyword_score(profile_data)
+        print(f"   📥 {profile_data['url']} — keyword score {keyword_result['score']}")
+        if should_escalate(keyword_result):
+            pending.append(asyncio.ensure_future(analyze(profile_data, keyword_result)))
+        else:
+            settled.append((profile_data, keyword_result))
+
+    escalated = list(await asyncio.gather(*pending))
+    return escalated, settled
+
 def find_similar_profiles_with_openai(sample_profiles: List[Dict[str, Any]]) -> List[str]:
     """
     Use OpenAI to generate search queries to find similar profiles
@@ -247,30 +319,31 @@ def main():
     print("📊 Step 1: Analyzing sample profiles...")
     sample_analyses = []
     
+    sample_scraped = []
     for profile_url in SAMPLE_PROFILES:
         # Scrape profile
         profile_data = scrape_linkedin_profile(profile_url)
-        
         if profile_data["success"]:
-            # Analyze with OpenAI
-            analysis = analyze_profile_with_openai(profile_data)
-            sample_analyses.append({
-                "url": profile_url,
-                "data": profile_data,
-                "analysis": analysis
-            })
-            
-            if analysis.get("success"):
-                print(f"✅ {profile_url}")
-                print(f"   Name: {analysis.get('name', 'N/A')}")
-                print(f"   Headline: {analysis.get('headline', 'N/A')}")
-                print(f"   Antler Fit: {analysis.get('antler_fit_score', 'N/A')}/10")
-            else:
-                print(f"❌ Analysis failed: {analysis.get('error', 'Unknown error')}")
+            sample_scraped.append(profile_data)
         else:
             print(f"❌ Scraping failed: {profile_data.get('error', 'Unknown error')}")
+    
+    # Analyze with OpenAI (concurrently)
+    for profile_data, analysis in zip(sample_scraped, analyze_profiles_concurrently(sample_scraped)):
+        profile_url = profile_data["url"]
+        sample_analyses.append({
+            "url": profile_url,
+            "data": profile_data,
+            "analysis": analysis
+        })
         
-        time.sleep(1)  # Rate limiting
+        if analysis.get("success"):
+            print(f"✅ {profile_url}")
+            print(f"   Name: {analysis.get('name', 'N/A')}")
+            print(f"   Headline: {analysis.get('headline', 'N/A')}")
+            print(f"   Antler Fit: {analysis.get('antler_fit_score', 'N/A')}/10")
+        else:
+            print(f"❌ Analysis failed: {analysis.get('error', 'Unknown error')}")
     
     # Step 2: Generate search queries
     print("\n🔍 Step 2: Generating search queries...")
@@ -286,30 +359,34 @@ def main():
     print("\n📊 Step 4: Analyzing discovered profiles...")
     final_profiles = []
     
-    for i, profile_url in enumerate(discovered_profiles[:20]):  # Limit to first 20
-        print(f"Analyzing {i+1}/{min(20, len(discovered_profiles))}: {profile_url}")
-        
-        # Scrape profile
-        profile_data = scrape_linkedin_profile(profile_url)
-        
-        if profile_data["success"]:
-            # Analyze with OpenAI
-            analysis = analyze_profile_with_openai(profile_data)
-            
-            if analysis.get("success"):
-                final_profiles.append({
-                    "url": profile_url,
-                    "analysis": analysis
-                })
-                
-                print(f"   ✅ {analysis.get('name', 'N/A')} - {analysis.get('headline', 'N/A')}")
-                print(f"   Antler Fit: {analysis.get('antler_fit_score', 'N/A')}/10")
-            else:
-                print(f"   ❌ Analysis failed")
+    # Scrape concurrently; each page is pre-filtered and, if promising,
+    # analyzed while the remaining scrapes are still in flight
+    to_scrape = discovered_profiles[:20]  # Limit to first 20
+    print(f"Scraping + analyzing {len(to_scrape)} profiles...")
+    escalated, settled = asyncio.run(scrape_and_analyze(to_scrape))
+    print(f"🧮 Keyword pre-filter: {len(escalated)} escalated to LLM, {len(settled)} settled by keywords")
+    
+    for profile_data, keyword_result, analysis in escalated:
+        final_profiles.append({
+            "url": profile_data["url"],
+            "analysis": analysis,
+            **merge_signals(keyword_result, analysis)
+        })
+        if analysis.get("success"):
+            print(f"   ✅ {analysis.get('name', 'N/A')} - {analysis.get('headline', 'N/A')}")
+            print(f"   Antler Fit: {analysis.get('antler_fit_score', 'N/A')}/10 | Final: {final_profiles[-1]['final_score']} (Tier {final_profiles[-1]['tier']})")
         else:
-            print(f"   ❌ Scraping failed")
-        
-        time.sleep(1)  # Rate limiting
+            print(f"   ❌ Analysis failed, keeping keyword tier {final_profiles[-1]['tier']}: {profile_data['url']}")
+    
+    # Profiles the keyword tier settled keep its score and tier
+    for profile_data, keyword_result in settled:
+        final_profiles.append({
+            "url": profile_data["url"],
+            "name": keyword_result.get("name", ""),
+            "headline": keyword_result.get("headline", ""),
+            "analysis": {},
+            **merge_signals(keyword_result, {})
+        })
     
     # Step 5: Save results
     print("\n💾 Step 5: Saving results...")
@@ -326,14 +403,18 @@ def main():
     with open("sample_profile_analyses.json", "w") as f:
         json.dump(sample_analyses, f, indent=2)
     
-    # Generate summary
+    # Generate summary (fit buckets only over LLM-analyzed profiles)
+    llm_scored = [p for p in final_profiles if p["score_source"] == "keyword+llm"]
     summary = {
         "total_discovered": len(discovered_profiles),
         "total_analyzed": len(final_profiles),
-        "high_fit_profiles": len([p for p in final_profiles if p["analysis"].get("antler_fit_score", 0) >= 7]),
-        "medium_fit_profiles": len([p for p in final_profiles if 4 <= p["analysis"].get("antler_fit_score", 0) < 7]),
-        "low_fit_profiles": len([p for p in final_profiles if p["analysis"].get("antler_fit_score", 0) < 4]),
-        "top_profiles": sorted(final_profiles, key=lambda x: x["analysis"].get("antler_fit_score", 0), reverse=True)[:10]
+        "high_fit_profiles": len([p for p in llm_scored if p["analysis"].get("antler_fit_score", 0) >= 7]),
+        "medium_fit_profiles": len([p for p in llm_scored if 4 <= p["analysis"].get("antler_fit_score", 0) < 7]),
+        "low_fit_profiles": len([p for p in llm_scored if p["analysis"].get("antler_fit_score", 0) < 4]),
+        "llm_escalated": len(escalated),
+        "keyword_settled": len(settled),
+        "tier_distribution": {t: len([p for p in final_profiles if p.get("tier") == t]) for t in ("A", "B", "C")},
+        "top_profiles": sorted(final_profiles, key=lambda x: x.get("final_score", 0), reverse=True)[:10]
     }
     
     with open("discovery_summary.json", "w") as f:
@@ -345,12 +426,14 @@ def main():
     print(f"🎯 High fit profiles (7+): {summary['high_fit_profiles']}")
     print(f"📈 Medium fit profiles (4-6): {summary['medium_fit_profiles']}")
     print(f"📉 Low fit profiles (<4): {summary['low_fit_profiles']}")
+    print(get_analysis_cache().report())
+    print(get_firecrawl_client().cache.report())
     
     print(f"\n🏆 Top 5 Profiles for Antler:")
     for i, profile in enumerate(summary["top_profiles"][:5]):
         analysis = profile["analysis"]
-        print(f"{i+1}. {analysis.get('name', 'N/A')}")
-        print(f"   {analysis.get('headline', 'N/A')}")
+        print(f"{i+1}. {analysis.get('name') or profile.get('name') or 'N/A'} (Tier {profile['tier']}, {profile['score_source']})")
+        print(f"   {analysis.get('headline') or profile.get('headline') or 'N/A'}")
         print(f"   Antler Fit: {analysis.get('antler_fit_score', 'N/A')}/10")
         print(f"   {analysis.get('key_insights', 'N/A')}")
         print()
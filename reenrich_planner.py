@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Change-Driven Re-Enrichment Planner
+===================================
+
+Founders flip from a big-company job to "stealth" long after we first
+scraped them. Instead of re-scraping everyone, this spends a fixed daily
+Apify budget on the profiles most likely to have changed, and only the
+ones that did change are re-scored.
+
+Per profile the store keeps a fetch_state row (profile_store.FetchState):
+last fetch time and a hash of the headline + current roles (title,
+company, start year of every role without an end date).
+
+Priority of a stored profile (higher is re-fetched first):
+- staleness: days since the last fetch / REENRICH_STALE_DAYS
+- +1 if a role ended last year or this year (mid-transition people are
+  the ones who go stealth)
+- tier B near the A threshold: up to +1, scaled by (score - 60) / 15
+- +0.5 per change seen on earlier re-fetches (max +1)
+Profiles fetched within REENRICH_MIN_AGE_DAYS are never picked.
+
+The budget counts profiles Apify answered for per UTC day (a failed
+batch costs nothing and its profiles stay planned); every run records its
+spend as a runs row (scorer "reenrich"), so several runs a day share one
+budget.
+
+Usage:
+    python reenrich_planner.py --dry-run          # show today's plan
+    python reenrich_planner.py [--budget 200] [--db URL]
+
+Env overrides: REENRICH_DAILY_BUDGET, REENRICH_MIN_AGE_DAYS, REENRICH_STALE_DAYS
+"""
+
+import os
+import re
+import heapq
+import hashlib
+import argparse
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from profile_merge import is_failed, normalize_profile, profile_id
+from profile_store import (
+    Experience, FetchState, Profile, Run, Score, get_engine, store_scored_run,
+)
+from url_frontier import canonical_url
+
+DAILY_BUDGET = int(os.getenv("REENRICH_DAILY_BUDGET", "200"))
+MIN_AGE_DAYS = float(os.getenv("REENRICH_MIN_AGE_DAYS", "7"))
+STALE_DAYS = float(os.getenv("REENRICH_STALE_DAYS", "30"))
+SOURCE = "reenrich"
+SCORER = "apimaestro"
+TIER_B_MIN, TIER_A_MIN = 60, 75
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+Role = Tuple[str, str, Optional[int]]
+
+
+def _norm(text: Any) -> str:
+    return WHITESPACE_RE.sub(" ", str(text or "")).strip().lower()
+
+
+def content_hash(headline: str, current_roles: Iterable[Role]) -> str:
+    """Hash of the headline + (title, company, start year) of the current roles, order-insensitive."""
+    roles = sorted({(_norm(t), _norm(c), y or 0) for t, c, y in current_roles})
+    payload = _norm(headline) + "\n" + "\n".join(f"{t}|{c}|{y}" for t, c, y in roles)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def record_hash(record: Dict[str, Any]) -> str:
+    """content_hash of a canonical record (profile_merge.normalize_profile)."""
+    roles = [(e.get("title"), e.get("company"), (e.get("start_date") or {}).get("year"))
+             for e in record.get("experience") or []
+             if e.get("is_current") or not (e.get("end_date") or {}).get("year")]
+    return content_hash(record["basic_info"].get("headline") or "", roles)
+
+
+def _stored_hashes(session: Session, profile_ids: List[int]) -> Dict[int, str]:
+    """content_hash of what the store holds now, for profiles without a fetch_state row yet."""
+    headlines = dict(session.execute(select(Profile.id, Profile.headline).where(Profile.id.in_(profile_ids))).all())
+    roles: Dict[int, List[Role]] = {pid: [] for pid in headlines}
+    for row in session.execute(
+        select(Experience.profile_id, Experience.title, Experience.company, Experience.start_year)
+        .where(Experience.profile_id.in_(profile_ids))
+        .where(Experience.is_current.is_(True) | Experience.end_year.is_(None))
+    ):
+        roles[row.profile_id].append((row.title, row.company, row.start_year))
+    return {pid: content_hash(headlines[pid], roles[pid]) for pid in headlines}
+
+
+def record_fetches(session: Session, records: List[Dict[str, Any]], answered: Iterable[str] = (),
+                   fetched_at: Optional[datetime] = None) -> List[str]:
+    """Update fetch_state for freshly fetched canonical records; returns identifiers whose content changed.
+
+    `answered` are identifiers Apify answered for without profile data: only
+    their fetch time moves, so they are not picked again tomorrow. Profiles
+    not in the store yet are ignored (store them first)."""
+    fetched_at = fetched_at or datetime.utcnow()
+    hashes = {profile_id(r): record_hash(r) for r in records}
+    pids = set(hashes) | set(answered)
+    if not pids:
+        return []
+    ids = dict(session.execute(
+        select(Profile.public_identifier, Profile.id).where(Profile.public_identifier.in_(pids))).all())
+    states = {s.profile_id: s for s in session.scalars(select(FetchState).where(FetchState.profile_id.in_(ids.values())))}
+    baseline = _stored_hashes(session, [i for i in ids.values() if i not in states])
+
+    changed = []
+    for pid, pk in ids.items():
+        state = states.get(pk)
+        if state is None:
+            state = FetchState(profile_id=pk, content_hash=baseline.get(pk, ""), fetch_count=0, change_count=0)
+            session.add(state)
+        state.last_fetched_at = fetched_at
+        state.fetch_count += 1
+        new_hash = hashes.get(pid)
+        if new_hash is None:
+            continue
+        if new_hash != state.content_hash:
+            # A first fetch with no stored baseline just sets the hash
+            if state.content_hash:
+                changed.append(pid)
+                state.change_count += 1
+                state.last_changed_at = fetched_at
+            state.content_hash = new_hash
+    return changed
+
+
+def priority(age_days: float, tier: Optional[str], score: Optional[float], last_end_year: Optional[int],
+             change_count: int, year: int) -> float:
+    p = age_days / STALE_DAYS
+    if last_end_year and last_end_year >= year - 1:
+        p += 1.0
+    if tier == "B" and score is not None:
+        p += max(0.0, min(1.0, (score - TIER_B_MIN) / (TIER_A_MIN - TIER_B_MIN)))
+    return p + 0.5 * min(change_count or 0, 2)
+
+
+def spent_today(session: Session, now: Optional[datetime] = None) -> int:
+    """Profiles Apify answered for in re-enrichment runs since UTC midnight."""
+    now = now or datetime.utcnow()
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return session.scalar(
+        select(func.coalesce(func.sum(Run.profile_count), 0))
+        .where(Run.scorer == SOURCE).where(Run.started_at >= midnight)) or 0
+
+
+def plan_refetch(session: Session, budget: int, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Top-`budget` stored profiles by priority, skipping ones fetched within MIN_AGE_DAYS."""
+    now = now or datetime.utcnow()
+    end_years = (
+        select(Experience.profile_id, func.max(Experience.end_year).label("last_end_year"))
+        .group_by(Experience.profile_id).subquery()
+    )
+    stmt = (
+        select(Profile.public_identifier, Profile.updated_at, FetchState.last_fetched_at,
+               FetchState.change_count, Score.tier, Score.score, end_years.c.last_end_year)
+        .outerjoin(FetchState, FetchState.profile_id == Profile.id)
+        .outerjoin(Score, (Score.profile_id == Profile.id) & (Score.scorer == SCORER))
+        .outerjoin(end_years, end_years.c.profile_id == Profile.id)
+    )
+    min_age = timedelta(days=MIN_AGE_DAYS)
+    candidates = []
+    for row in session.execute(stmt):
+        # Profiles stored before fetch tracking count from their last upsert
+        last = row.last_fetched_at or row.updated_at
+        if last and now - last < min_age:
+            continue
+        age_days = (now - last).total_seconds() / 86400 if last else STALE_DAYS * 12
+        candidates.append({
+            "public_identifier": row.public_identifier,
+            "age_days": round(age_days, 1),
+            "tier": row.tier,
+            "score": row.score,
+            "priority": priority(age_days, row.tier, row.score, row.last_end_year, row.change_count, now.year),
+        })
+    return heapq.nlargest(budget, candidates, key=lambda c: c["priority"])
+
+
+def run(budget: int = DAILY_BUDGET, db_url: Optional[str] = None, dry_run: bool = False) -> Dict[str, int]:
+    """Plan within today's remaining budget, re-fetch, and re-score only changed profiles."""
+    from discovery_daemon import enrich
+
+    engine = get_engine(db_url)
+    with Session(engine) as session:
+        remaining = max(0, budget - spent_today(session))
+        plan = plan_refetch(session, remaining) if remaining else []
+    print(f"📅 Re-enrichment budget: {remaining}/{budget} left today, {len(plan)} profiles planned")
+    for c in plan[:20]:
+        print(f"   {c['priority']:5.2f}  {c['age_days']:>6}d  {c['tier'] or '-'} {c['score'] if c['score'] is not None else ''}"
+              f"  {c['public_identifier']}")
+    if dry_run or not plan:
+        return {"planned": len(plan), "fetched": 0, "changed": 0}
+
+    urls = [canonical_url(c["public_identifier"]) for c in plan]
+    items = [it for it in enrich(urls) if isinstance(it, dict)]
+    records = [normalize_profile(it, SOURCE) for it in items if not is_failed(it)]
+    fetched_ids = {profile_id(r) for r in records}
+    answered = [pid for pid in (profile_id(it) for it in items) if pid and pid not in fetched_ids]
+
+    with Session(engine) as session, session.begin():
+        session.add(Run(scorer=SOURCE, source=SOURCE, profile_count=len(items), finished_at=datetime.utcnow()))
+        changed = set(record_fetches(session, records, answered))
+        previous = dict(session.execute(
+            select(Profile.public_identifier, Score.tier).join(Score, Score.profile_id == Profile.id)
+            .where(Score.scorer == SCORER).where(Profile.public_identifier.in_(changed))).all()) if changed else {}
+
+    changed_records = [r for r in records if profile_id(r) in changed]
+    if changed_records:
+        from score_apimaestro import score_profile
+        scored = [score_profile(r) for r in changed_records]
+        run_id = store_scored_run(changed_records, scored, scorer=SCORER, source=SOURCE, db_url=db_url)
+        from lookalike_index import update_index
+        update_index(changed_records)
+        moves = Counter(f"{previous.get(profile_id(r), '-')}→{s['tier']}"
+                        for r, s in zip(changed_records, scored))
+        print(f"🔁 Re-scored {len(scored)} changed profiles (run {run_id}): "
+              + ", ".join(f"{k} {v}" for k, v in sorted(moves.items())))
+    print(f"✅ Fetched {len(records)}/{len(urls)}, {len(changed_records)} changed, "
+          f"{len(records) - len(changed_records)} unchanged (not re-scored)")
+    return {"planned": len(plan), "fetched": len(records), "changed": len(changed_records)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-enrich the profiles most likely to have changed")
+    parser.add_argument("--budget", type=int, default=DAILY_BUDGET, help="Profiles per UTC day")
+    parser.add_argument("--db", help="Database URL (default: DATABASE_URL)")
+    parser.add_argument("--dry-run", action="store_true", help="Print the plan without fetching")
+    args = parser.parse_args()
+    run(args.budget, args.db, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
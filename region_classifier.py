@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Region / Vertical Classifier
+============================
+
+Precompiled replacement for the per-profile keyword loops in the Indian
+founder filters (which rebuilt and lowercased every keyword list for each
+profile, then ran one substring search per keyword per field).
+
+- All keyword tables are compiled once into an Aho-Corasick automaton
+  (pyahocorasick), so each field is scanned once in C and reports every
+  overlapping term. Without pyahocorasick the fallback is a single regex
+  built as a prefix trie; after a hit the search resumes one character
+  later, so every start position reports its longest term
+- Each term carries the categories of all terms that are prefixes of it,
+  which keeps the result identical to the old `keyword in text` checks
+  (overlapping and nested terms included)
+- Per category, only the configured fields count (e.g. Indian-ness comes
+  from location + about, verticals from headline + about); each field gets
+  its own compiled trie holding just the terms it can contribute
+
+Usage:
+    classifier = build_indian_founder_classifier(HEALTH_KEYWORDS, CONSUMER_TECH_KEYWORDS, AI_KEYWORDS)
+    flags = classifier.classify(profile)   # {"is_indian": ..., "has_health": ..., ...}
+    all_flags = classifier.classify_many(profiles)
+
+Benchmark against the old loop:
+    python region_classifier.py [apimaestro_batch_raw.json]
+"""
+
+import re
+import sys
+import json
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+try:
+    import ahocorasick  # pyahocorasick: C automaton, used instead of the regex scan when installed
+except ImportError:
+    ahocorasick = None
+
+INDIAN_INDICATORS = [
+    "india", "indian", "bangalore", "mumbai", "delhi", "hyderabad",
+    "chennai", "pune", "gurgaon", "noida", "ahmedabad", "kolkata",
+    "iit", "iim", "bits", "nit", "indian institute"
+]
+
+FOUNDER_INDICATORS = [
+    "founder", "co-founder", "cofounder", "ceo", "startup", "building",
+    "stealth", "working on", "exploring", "launching"
+]
+
+EMPTY: FrozenSet[str] = frozenset()
+
+# Flag name -> profile fields whose text counts for it
+INDIAN_FOUNDER_FIELDS = {
+    "is_indian": ("location", "about"),
+    "has_health": ("headline", "about"),
+    "has_consumer": ("headline", "about"),
+    "has_ai": ("headline", "about"),
+    "is_founder": ("headline", "about"),
+}
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Regex alternation factored as a prefix trie; greedy, so the longest term wins."""
+    trie: Dict[str, Any] = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        ends = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if ends else body
+
+    return build(trie)
+
+
+class _TermScanner:
+    """Compiled trie regex over a set of terms, reporting the flags they carry."""
+
+    def __init__(self, term_flags: Dict[str, set]):
+        # A match of `term` at a position implies a match of each of its prefixes there
+        self.term_flags: Dict[str, FrozenSet[str]] = {}
+        for term in term_flags:
+            flags = set()
+            for other, other_flags in term_flags.items():
+                if term.startswith(other):
+                    flags |= other_flags
+            self.term_flags[term] = frozenset(flags)
+        self.num_flags = len({flag for flags in term_flags.values() for flag in flags})
+        self.regex = None
+        self.automaton = None
+        if not term_flags:
+            return
+        if ahocorasick is not None:
+            self.automaton = ahocorasick.Automaton()
+            for term, flags in self.term_flags.items():
+                self.automaton.add_word(term, flags)
+            self.automaton.make_automaton()
+        else:
+            self.regex = re.compile(_trie_pattern(term_flags))
+
+    def scan(self, text: str) -> FrozenSet[str]:
+        if not text:
+            return EMPTY
+        found: set = set()
+        if self.automaton is not None:
+            for _, flags in self.automaton.iter(text):
+                found |= flags
+                if len(found) == self.num_flags:
+                    break
+            return frozenset(found)
+        if self.regex is None:
+            return EMPTY
+        term_flags = self.term_flags
+        search = self.regex.search
+        m = search(text)
+        while m is not None:
+            found |= term_flags[m.group()]
+            if len(found) == self.num_flags:
+                break
+            # Restart just after the match start so overlapping terms are seen too
+            m = search(text, m.start() + 1)
+        return frozenset(found)
+
+
+class RegionVerticalClassifier:
+    """Flags profiles by keyword category with one regex scan per text field."""
+
+    def __init__(self, categories: Dict[str, Iterable[str]], fields: Dict[str, Tuple[str, ...]]):
+        """categories: flag -> keywords (case-insensitive substrings);
+        fields: flag -> profile fields searched for that flag."""
+        term_flags: Dict[str, set] = {}
+        for flag, keywords in categories.items():
+            for kw in keywords:
+                term_flags.setdefault(kw.lower(), set()).add(flag)
+        self.flags = list(categories)
+        self.fields = fields
+        self.flag_fields = [(flag, tuple(fields.get(flag, ()))) for flag in self.flags]
+        # Each field only searches for the terms of the flags it feeds
+        self.field_scanners: Dict[str, _TermScanner] = {}
+        for field in sorted({f for fs in fields.values() for f in fs}):
+            wanted = {flag for flag, fs in fields.items() if field in fs}
+            subset = {t: flags & wanted for t, flags in term_flags.items() if flags & wanted}
+            self.field_scanners[field] = _TermScanner(subset)
+
+    def classify(self, profile: Optional[Dict[str, Any]]) -> Dict[str, bool]:
+        if not profile:
+            return {flag: False for flag in self.flags}
+        hits = {}
+        for field, scanner in self.field_scanners.items():
+            text = profile.get(field)
+            hits[field] = scanner.scan(text.lower()) if text else EMPTY
+        return {
+            flag: any(flag in hits[field] for field in fields)
+            for flag, fields in self.flag_fields
+        }
+
+    def classify_many(self, profiles: Iterable[Optional[Dict[str, Any]]]) -> List[Dict[str, bool]]:
+        return [self.classify(p) for p in profiles]
+
+
+def build_indian_founder_classifier(health_keywords: Iterable[str], consumer_keywords: Iterable[str],
+                                    ai_keywords: Iterable[str]) -> RegionVerticalClassifier:
+    return RegionVerticalClassifier(
+        {
+            "is_indian": INDIAN_INDICATORS,
+            "has_health": health_keywords,
+            "has_consumer": consumer_keywords,
+            "has_ai": ai_keywords,
+            "is_founder": FOUNDER_INDICATORS,
+        },
+        INDIAN_FOUNDER_FIELDS,
+    )
+
+
+# ---- benchmark ------------------------------------------------------
+
+def _legacy_flags(profile: Dict[str, Any], health_keywords: List[str], consumer_keywords: List[str],
+                  ai_keywords: List[str]) -> Dict[str, bool]:
+    """The original per-profile loop body, kept verbatim for comparison."""
+    headline = profile.get("headline", "").lower()
+    about = profile.get("about", "").lower()
+    location = profile.get("location", "").lower()
+
+    indian_indicators = [
+        "india", "indian", "bangalore", "mumbai", "delhi", "hyderabad",
+        "chennai", "pune", "gurgaon", "noida", "ahmedabad", "kolkata",
+        "iit", "iim", "bits", "nit", "indian institute"
+    ]
+    is_indian = any(indicator in location or indicator in about for indicator in indian_indicators)
+
+    health_indicators = [kw.lower() for kw in health_keywords]
+    consumer_indicators = [kw.lower() for kw in consumer_keywords]
+    ai_indicators = [kw.lower() for kw in ai_keywords]
+
+    has_health = any(indicator in headline or indicator in about for indicator in health_indicators)
+    has_consumer = any(indicator in headline or indicator in about for indicator in consumer_indicators)
+    has_ai = any(indicator in headline or indicator in about for indicator in ai_indicators)
+
+    founder_indicators = [
+        "founder", "co-founder", "cofounder", "ceo", "startup", "building",
+        "stealth", "working on", "exploring", "launching"
+    ]
+    is_founder = any(indicator in headline or indicator in about for indicator in founder_indicators)
+    return {"is_indian": is_indian, "has_health": has_health, "has_consumer": has_consumer,
+            "has_ai": has_ai, "is_founder": is_founder}
+
+
+def _flatten(item: Dict[str, Any]) -> Dict[str, Any]:
+    """apimaestro item -> the flat headline/about/location shape the filters read."""
+    basic = item.get("basic_info") or {}
+    loc = basic.get("location") or {}
+    return {
+        "headline": basic.get("headline") or "",
+        "about": basic.get("about") or "",
+        "location": (loc.get("full") if isinstance(loc, dict) else loc) or "",
+    }
+
+
+def main():
+    from indian_founders_discovery import HEALTH_KEYWORDS, CONSUMER_TECH_KEYWORDS, AI_KEYWORDS
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "apimaestro_batch_raw.json"
+    with open(path, "r") as f:
+        raw = json.load(f)
+    # The filters read flat fields; flatten so both sides see real text
+    profiles = [_flatten(p) for p in raw if p]
+    repeats = max(1, 10000 // max(1, len(profiles)))
+
+    print(f"⏱️ Benchmarking on {len(profiles)} profiles x {repeats} passes ({path})")
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        legacy = [_legacy_flags(p, HEALTH_KEYWORDS, CONSUMER_TECH_KEYWORDS, AI_KEYWORDS) for p in profiles]
+    legacy_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    classifier = build_indian_founder_classifier(HEALTH_KEYWORDS, CONSUMER_TECH_KEYWORDS, AI_KEYWORDS)
+    build_sec = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fast = classifier.classify_many(profiles)
+    fast_sec = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(legacy, fast) if a != b)
+    n = len(profiles) * repeats
+    print(f"- legacy loop:  {legacy_sec:.3f}s ({n / legacy_sec:,.0f} profiles/s)")
+    print(f"- classifier:   {fast_sec:.3f}s ({n / fast_sec:,.0f} profiles/s), built once in {build_sec * 1000:.1f}ms")
+    print(f"- speedup:      {legacy_sec / fast_sec:.2f}x ({'aho-corasick' if ahocorasick else 'regex trie'} scan)")
+    print(f"- mismatches:   {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Persistent Response Cache (SQLite)
+==================================
+
+Small key/value cache for expensive API responses (LLM analyses, scrapes).
+
+- Keys are SHA-256 hashes of the request parts (see make_key), so the same
+  model + prompt version + content always maps to the same row
+- Values are stored as JSON; lookups are a single primary-key read
+- Size-bounded: once `max_entries` is exceeded the least recently used rows
+  are evicted
+- Hit/miss counters are kept per process and reported via stats()
+
+Several namespaces (e.g. "llm", "firecrawl") can share one database file.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+from metrics import CACHE_LOOKUPS
+
+DEFAULT_PATH = os.getenv("RESPONSE_CACHE_PATH", "response_cache.sqlite")
+DEFAULT_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "50000"))
+
+# Evict in chunks so inserts don't pay a DELETE every time
+EVICT_SLACK = 0.05
+# LRU timestamps of hits are buffered and written in bulk, keeping hits read-only
+TOUCH_FLUSH_EVERY = 256
+
+
+def make_key(*parts: Any) -> str:
+    """Stable hash of the request parts (None/str/numbers)."""
+    h = hashlib.sha256()
+    for p in parts:
+        h.update(str("" if p is None else p).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed LRU cache of JSON values, safe to share between threads."""
+
+    def __init__(self, path: str = DEFAULT_PATH, namespace: str = "default", max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_lru ON responses (namespace, last_access)")
+        self._conn.commit()
+        self._count = self._conn.execute(
+            "SELECT COUNT(*) FROM responses WHERE namespace = ?", (namespace,)
+        ).fetchone()[0]
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE namespace = ? AND key = ?", (self.namespace, key)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                CACHE_LOOKUPS.inc(namespace=self.namespace, result="miss")
+                return None
+            self.hits += 1
+            CACHE_LOOKUPS.inc(namespace=self.namespace, result="hit")
+            self._touched[key] = time.time()
+            if len(self._touched) >= TOUCH_FLUSH_EVERY:
+                self._flush_touched()
+                self._conn.commit()
+        return json.loads(row[0])
+
+    def _flush_touched(self) -> None:
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE responses SET last_access = ? WHERE namespace = ? AND key = ?",
+                [(ts, self.namespace, k) for k, ts in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM responses WHERE namespace = ? AND key = ?", (self.namespace, key)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (namespace, key, value, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), now, now),
+            )
+            if not exists:
+                self._count += 1
+            if self._count > self.max_entries * (1 + EVICT_SLACK):
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        self._flush_touched()
+        self._conn.execute(
+            """
+            DELETE FROM responses WHERE namespace = ? AND key IN (
+                SELECT key FROM responses WHERE namespace = ? ORDER BY last_access ASC LIMIT ?
+            )
+            """,
+            (self.namespace, self.namespace, max(0, self._count - self.max_entries)),
+        )
+        self._count = self._conn.execute(
+            "SELECT COUNT(*) FROM responses WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": self._count,
+        }
+
+    def report(self) -> str:
+        s = self.stats()
+        return f"🗄️ Cache [{s['namespace']}]: {s['hits']} hits / {s['misses']} misses ({s['hit_rate']:.0%} hit rate), {s['entries']} entries"
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_touched()
+            self._conn.commit()
+            self._conn.close()
@@ -3,9 +3,17 @@
 Score and Tier LinkedIn Profiles
 ================================
 
-Reads enriched items from Apify (apimaestro_full_sections_raw.json preferred,
-else serpapi_apify_linkedin_raw.json), computes a stealth-fit score using
-weights aligned with our stealth scoring system, and assigns Tier A/B/C.
+Reads enriched items from Apify (apimaestro_full_sections_raw.json and
+serpapi_apify_linkedin_raw.json, merged into one canonical record per person
+by profile_merge.py: per field the newest fetch wins -- the item's scrape
+timestamp, else the file's mtime, with the former file preferred unless the
+latter is clearly newer), computes a stealth-fit score using weights aligned
+with our stealth scoring system, and assigns Tier A/B/C.
+
+Every matched term is a bit in the row's explain_bits (score_explain.py,
+scorer "score_and_tier"), and the per-component breakdown is rebuilt from
+those bits, so `python score_explain.py scored_profiles.json --scorer
+score_and_tier` explains any score.
 
 Outputs:
 - scored_profiles.json
@@ -18,6 +26,10 @@ import json
 import csv
 from typing import Any, Dict, List
 
+from profile_merge import ProfileMerger, file_fetch_times, normalize_profile
+from score_explain import ExplainRegistry, to_hex
+from timeline_features import recent_year_terms
+
 PREFERRED_INPUT = "apimaestro_full_sections_raw.json"
 FALLBACK_INPUT = "serpapi_apify_linkedin_raw.json"
 OUT_JSON = "scored_profiles.json"
@@ -25,7 +37,8 @@ OUT_CSV = "scored_profiles.csv"
 OUT_SUMMARY = "scored_summary.json"
 
 STEALTH_TERMS = ["stealth", "building", "working on", "exploring", "incubating", "pre-seed", "early stage"]
-RECENT_TERMS = ["2024", "2023", "recent", "new"]
+# Plus the as-of year and the one before (timeline_features.recent_year_terms)
+RECENT_TERMS = ["recent", "new"]
 TOP_BG_TERMS = [
     "stanford", "harvard", "mit", "berkeley", "oxford", "cambridge",
     "google", "meta", "facebook", "amazon", "microsoft", "apple", "stripe", "airbnb", "tesla"
@@ -38,6 +51,33 @@ GEO_TERMS = [
 ]
 NETWORK_TERMS = ["yc", "y combinator", "techstars", "500 startups", "antler", "accelerator", "alumni"]
 CONV_TERMS = ["building", "exploring", "looking for", "hiring", "open to", "seeking"]
+# Stable term keys for recent_year_terms(), which change with the as-of year
+RECENT_YEAR_KEYS = ["as-of year", "year before"]
+
+BREAKDOWN_COMPONENTS = ["stealth", "recency", "background", "industry", "geography", "network", "conversation"]
+
+# Scoring rules and matched terms as stable explanation bits (score_explain.py);
+# append only. Per-term weights are one step rule per matched term
+# (e.g. 0.25 per stealth term), industries one rule per sector.
+EXPLAIN = ExplainRegistry("score_and_tier", BREAKDOWN_COMPONENTS)
+_STEP_RULES = (
+    ("stealth", "stealth", 0.25, "stealth/early-stage language", STEALTH_TERMS),
+    ("recent", "recency", 0.20, "recent-year/recency language", RECENT_YEAR_KEYS + RECENT_TERMS),
+    ("background", "background", 0.15, "top school or company", TOP_BG_TERMS),
+    ("geo", "geography", 0.10, "startup hub", GEO_TERMS),
+    ("network", "network", 0.10, "accelerator/network mention", NETWORK_TERMS),
+    ("conv", "conversation", 0.05, "conversation opener", CONV_TERMS),
+)
+for _group, _component, _points, _label, _terms in _STEP_RULES:
+    for _n in range(1, len(_terms) + 1):
+        EXPLAIN.rule(f"{_group}_{_n}", _component, _points, _label, terms=_group)
+EXPLAIN.rule("industry_ai", "industry", 0.30, "AI/ML", terms="ai")
+EXPLAIN.rule("industry_fin", "industry", 0.30, "fintech", terms="fin")
+EXPLAIN.rule("industry_health", "industry", 0.30, "health", terms="health")
+for _group, _, _, _, _terms in _STEP_RULES:
+    EXPLAIN.terms(_group, _terms)
+for _group, _terms in (("ai", AI_TERMS), ("fin", FIN_TERMS), ("health", HEALTH_TERMS)):
+    EXPLAIN.terms(_group, _terms)
 
 
 def normalize_text(*parts: Any) -> str:
@@ -45,54 +85,40 @@ def normalize_text(*parts: Any) -> str:
 
 
 def score_item(item: Dict[str, Any]) -> Dict[str, Any]:
-    url = item.get("profileUrl") or item.get("url") or item.get("publicIdentifier") or ""
-    headline = item.get("headline") or item.get("title") or ""
-    about = item.get("about") or item.get("summary") or ""
-    experiences = item.get("positions") or item.get("experiences") or []
+    """Score a raw item of either Apify schema (or an already-merged canonical record)."""
+    rec = item if "sources" in item else normalize_profile(item)
+    basic = rec["basic_info"]
+    url = rec["profileUrl"] or basic["public_identifier"]
+    headline = basic["headline"]
+    about = basic["about"]
     experience_blob = " ".join(
-        [
-            " ".join(
-                str(v) for v in (
-                    (exp.get("title") if isinstance(exp, dict) else None),
-                    (exp.get("companyName") if isinstance(exp, dict) else None),
-                    (exp.get("description") if isinstance(exp, dict) else None),
-                )
-            )
-            for exp in experiences if isinstance(exp, dict)
-        ]
+        " ".join(str(v) for v in (exp["title"], exp["company"], exp["description"]))
+        for exp in rec["experience"]
     )
     text = normalize_text(url, headline, about, experience_blob)
 
-    # Subscores
-    stealth_score = sum(1 for t in STEALTH_TERMS if t in text)  # 0..N
-    recent_score = sum(1 for t in RECENT_TERMS if t in text)
-    background_score = sum(1 for t in TOP_BG_TERMS if t in text)
-
-    industry_score = 0
-    if any(t in text for t in AI_TERMS):
-        industry_score += 2
-    if any(t in text for t in FIN_TERMS):
-        industry_score += 2
-    if any(t in text for t in HEALTH_TERMS):
-        industry_score += 2
-
-    geo_score = sum(1 for t in GEO_TERMS if t in text)
-    network_score = sum(1 for t in NETWORK_TERMS if t in text)
-    conv_score = sum(1 for t in CONV_TERMS if t in text)
-
-    # Weighted total (align with earlier weighting)
-    total = (
-        stealth_score * 0.25 +
-        recent_score * 0.20 +
-        background_score * 0.15 +
-        industry_score * 0.15 +
-        geo_score * 0.10 +
-        network_score * 0.10 +
-        conv_score * 0.05
-    )
+    # Matched terms, one step rule per match (weights: see EXPLAIN)
+    hits: List[str] = []
+    recent_keys = dict(zip(recent_year_terms(), RECENT_YEAR_KEYS))
+    for group, _, _, _, terms in _STEP_RULES:
+        if group == "recent":
+            matched = [recent_keys[t] for t in recent_keys if t in text] + [t for t in RECENT_TERMS if t in text]
+        else:
+            matched = [t for t in terms if t in text]
+        hits += [f"{group}:{t}" for t in matched]
+        hits += [f"{group}_{n}" for n in range(1, len(matched) + 1)]
+
+    for group, terms in (("ai", AI_TERMS), ("fin", FIN_TERMS), ("health", HEALTH_TERMS)):
+        matched = [t for t in terms if t in text]
+        if matched:
+            hits.append(f"industry_{group}")
+            hits += [f"{group}:{t}" for t in matched]
+
+    explain_bits = EXPLAIN.encode(hits)
+    breakdown = {k: round(v, 2) for k, v in EXPLAIN.breakdown(explain_bits).items()}
 
     # Normalize to 0-10 range with cap
-    total = min(10.0, round(total, 2))
+    total = min(10.0, round(sum(breakdown.values()), 2))
 
     if total >= 7.5:
         tier = "A"
@@ -107,27 +133,37 @@ def score_item(item: Dict[str, Any]) -> Dict[str, Any]:
         "about": about,
         "score": total,
         "tier": tier,
+        "breakdown": breakdown,
+        "explain_bits": to_hex(explain_bits),
     }
 
 
 def read_input_items() -> List[Dict[str, Any]]:
-    path = PREFERRED_INPUT if os.path.exists(PREFERRED_INPUT) else FALLBACK_INPUT
-    if not os.path.exists(path):
+    """Canonical records merged from every input present (newest fetch wins each field)."""
+    merger = ProfileMerger()
+    found = False
+    paths = [PREFERRED_INPUT, FALLBACK_INPUT]
+    for path, fetched_at in zip(paths, file_fetch_times(paths)):
+        if not os.path.exists(path):
+            continue
+        found = True
+        with open(path, "r") as f:
+            try:
+                data = json.load(f)
+            except Exception:
+                continue
+        if isinstance(data, list):
+            merger.add_many(data, source=path, fetched_at=fetched_at)
+    if not found:
         print(f"❌ No input file found. Expected {PREFERRED_INPUT} or {FALLBACK_INPUT}.")
         return []
-    with open(path, "r") as f:
-        try:
-            data = json.load(f)
-            if isinstance(data, list):
-                return data
-        except Exception:
-            return []
-    return []
+    print(merger.report())
+    return merger.records()
 
 
 def main():
     items = read_input_items()
-    print(f"📥 Loaded {len(items)} enriched items")
+    print(f"📥 Loaded {len(items)} unique profiles")
     if not items:
         return
 
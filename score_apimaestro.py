@@ -7,7 +7,12 @@ Combines inputs:
 - apimaestro_full_sections_stealth.json (if present)
 - apimaestro_batch_raw.json (fallback/union)
 
-De-duplicates by URL/public_identifier and scores all profiles.
+Merges both inputs into one canonical record per person (profile_merge.py;
+keyed on the canonical public identifier; per field the newest fetch wins)
+and scores each person once; the same person under different identifiers
+is folded too (near_duplicates.py). Inputs are streamed into compact
+slotted records (compact_profile.py), so the raw JSON is never held in
+memory.
 
 Outputs:
 - apimaestro_scored.json
@@ -15,13 +20,40 @@ Outputs:
 - apimaestro_scored_summary.json
 - apimaestro_scored_tierA.csv (A only)
 - apimaestro_scored_tierB.csv (B only)
+
+Optional: --format parquet|arrow writes the full scored dump as typed columns
+(apimaestro_scored.parquet / .arrow, one breakdown_* column per score
+component) instead of apimaestro_scored.json.
+
+Recency (current role started / a role ended in the last
+TIMELINE_RECENT_MONTHS months) is judged against an as-of month: --as-of
+YYYY-MM, else TIMELINE_AS_OF, else today (timeline_features.py).
+
+Optional: --db [URL] also bulk-upserts profiles + scores into the profile
+store (profile_store.py; default DATABASE_URL / sqlite:///founder_sourcing.db).
+
+Stages (parse+merge, near-duplicates, scoring, writes, store) are timed with
+pipeline_timing.py and reported at the end; PIPELINE_PROFILE=cprofile|sample
+adds a profile dump.
 """
 
 import os
 import json
 import csv
 import re
-from typing import Any, Dict, List, Tuple
+import argparse
+from typing import Any, Dict, List
+
+import pipeline_timing
+from columnar_export import FORMATS, output_path, write_scored
+from compact_profile import CompactProfile, iter_json_array
+from metrics import SCORE_SECONDS
+from near_duplicates import collapse_records
+from pipeline_timing import count, span
+from profile_merge import ProfileMerger, file_fetch_times
+from score_explain import ExplainRegistry, to_hex
+from summary_stats import SummaryAccumulator
+from timeline_features import RECENT_MONTHS, set_as_of, timeline
 
 INPUT_PREF = "apimaestro_full_sections_stealth.json"
 INPUT_FALLBACK = "apimaestro_batch_raw.json"
@@ -33,7 +65,6 @@ OUT_B = "apimaestro_scored_tierB.csv"
 
 # Terms (lowercased matching)
 STEALTH_TERMS = ["stealth", "building", "working on", "exploring", "incubating", "in stealth"]
-RECENT_YEARS = {2024, 2023}
 FOUNDER_VARIANTS = ["founder", "co-founder", "cofounder", "co founder", "entrepreneur"]
 TOP_SCHOOL_ALIASES = [
     "stanford", "harvard", "mit", "massachusetts institute of technology", "berkeley", "u.c. berkeley",
@@ -50,11 +81,58 @@ GEO_TERMS = ["san francisco", "bay area", "new york", "london", "singapore", "ba
 ACCEL_TERMS = ["yc", "y combinator", "techstars", "500 startups", "antler", "accelerator", "cohort", "batch"]
 OUTREACH_TERMS = ["hiring", "open to", "seeking", "building", "looking for"]
 
+BREAKDOWN_COMPONENTS = [
+    "stealth", "founder", "recency", "top_company", "top_school", "industry",
+    "geography", "accelerator", "outreach", "penalties",
+]
+
 EXEC_BIGCO_TERMS = ["ceo", "chief executive officer", "cfo", "coo", "cto", "vp ", "vice president", "director", "head of"]
 
+# Scoring rules and matched terms as stable explanation bits (score_explain.py);
+# append only, never reorder
+EXPLAIN = ExplainRegistry("apimaestro", BREAKDOWN_COMPONENTS, caps={"industry": 15})
+EXPLAIN.rule("stealth_terms", "stealth", 20, "stealth/building language in name, headline, about or location", terms="stealth")
+EXPLAIN.rule("founder_title", "founder", 10, "founder title in experience", terms="founder")
+EXPLAIN.rule("current_recent", "recency", 12, f"current role started in the last {RECENT_MONTHS} months")
+EXPLAIN.rule("building_no_recent_role", "recency", 6, "building/stealth language without a recent current role")
+EXPLAIN.rule("ended_recent", "recency", 8, f"role ended in the last {RECENT_MONTHS} months")
+EXPLAIN.rule("top_company", "top_company", 9, "top company in experience", terms="company")
+EXPLAIN.rule("top_school", "top_school", 6, "top school in education", terms="school")
+EXPLAIN.rule("industry_ai", "industry", 7, "AI/ML experience", terms="ai")
+EXPLAIN.rule("industry_fin", "industry", 5, "fintech experience", terms="fin")
+EXPLAIN.rule("industry_health", "industry", 3, "health experience", terms="health")
+EXPLAIN.rule("geography", "geography", 10, "startup hub location", terms="geo")
+EXPLAIN.rule("accelerator", "accelerator", 10, "accelerator/cohort mention", terms="accel")
+EXPLAIN.rule("email", "outreach", 6, "email available")
+EXPLAIN.rule("outreach_terms", "outreach", 4, "open to outreach", terms="outreach")
+EXPLAIN.rule("bigco_exec", "penalties", -10, "executive at a big company, no stealth signal", terms="exec")
+EXPLAIN.rule("large_audience", "penalties", -5, "over 50k followers, no stealth signal")
+EXPLAIN.rule("no_founder_signal", "penalties", -5, "no founder title, recent role or stealth signal")
+_TERM_GROUPS = {
+    "stealth": STEALTH_TERMS, "founder": FOUNDER_VARIANTS, "company": TOP_COMPANY_ALIASES,
+    "school": TOP_SCHOOL_ALIASES, "ai": AI_TERMS, "fin": FIN_TERMS, "health": HEALTH_TERMS,
+    "geo": GEO_TERMS, "accel": ACCEL_TERMS, "outreach": OUTREACH_TERMS, "exec": EXEC_BIGCO_TERMS,
+}
+for _group, _terms in _TERM_GROUPS.items():
+    EXPLAIN.terms(_group, _terms)
+# (term, bit) pairs per group and one bit per rule, for scoring straight into the bitset
+TERM_MASKS = {group: EXPLAIN.term_masks(group, terms) for group, terms in _TERM_GROUPS.items()}
+RULE = {key: EXPLAIN.mask(key) for key in EXPLAIN.rules}
+
+
+def match_terms(group: str, text: str) -> int:
+    """Bits of the `group` terms found in `text` (0 if none)."""
+    bits = 0
+    for term, mask in TERM_MASKS[group]:
+        if term in text:
+            bits |= mask
+    return bits
+
+WHITESPACE_RE = re.compile(r"[\s\t\n]+")
+
 def to_text(*parts: Any) -> str:
     text = " ".join([str(p) for p in parts if p])
-    text = re.sub(r"[\s\t\n]+", " ", text)
+    text = WHITESPACE_RE.sub(" ", text)
     return f" {text.strip().lower()} "
 
 def mk_url(public_id: str) -> str:
@@ -62,25 +140,7 @@ def mk_url(public_id: str) -> str:
         return ""
     return public_id if public_id.startswith("http") else f"https://www.linkedin.com/in/{public_id}"
 
-def dedupe_profiles(list_a: List[Dict[str, Any]], list_b: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    def key_of(p: Dict[str, Any]) -> Tuple[str]:
-        basic = p.get("basic_info", {}) if isinstance(p, dict) else {}
-        pid = (basic.get("public_identifier") or basic.get("profileUrl") or "").strip().lower()
-        return (pid,)
-    seen = set()
-    out: List[Dict[str, Any]] = []
-    for lst in (list_a, list_b):
-        for p in lst or []:
-            k = key_of(p)
-            if not k[0]:
-                # try to infer from nested
-                pass
-            if k in seen:
-                continue
-            seen.add(k)
-            out.append(p)
-    return out
-
+@SCORE_SECONDS.timed(scorer="apimaestro")
 def score_profile(p: Dict[str, Any]) -> Dict[str, Any]:
     basic = p.get("basic_info", {}) if isinstance(p, dict) else {}
     fullname = basic.get("fullname") or ""
@@ -98,102 +158,81 @@ def score_profile(p: Dict[str, Any]) -> Dict[str, Any]:
     blob_head = to_text(fullname, headline, about, loc_text)
     blob_exp_parts: List[str] = []
 
-    current_recent = 0
-    ended_recent = 0
+    # Bits of the rules that fired and of every matched term (see EXPLAIN)
+    bits = 0
+
+    # Recency from the parsed timeline, relative to the as-of month (timeline_features.py)
+    tl = timeline(p)
+    current_recent = tl.started_current_within(RECENT_MONTHS)
+    ended_recent = tl.ended_within(RECENT_MONTHS)
     founder_hits = 0
-    industry_ai = False
-    industry_fin = False
-    industry_health = False
-    bg_company = False
-    bg_school = False
-    bigco_exec_flag = False
 
     for exp in experiences:
         title = to_text(exp.get("title"))
         company = to_text(exp.get("company"))
         blob_exp_parts.extend([title, company])
+        # \0 never occurs in a term, so no match spans the two fields
+        title_company = title + "\0" + company
 
-        if exp.get("is_current"):
-            sy = exp.get("start_date", {}).get("year")
-            if sy in RECENT_YEARS:
-                current_recent += 1
-        ey = exp.get("end_date", {}).get("year")
-        if ey in RECENT_YEARS:
-            ended_recent += 1
-
-        if any(t in title for t in FOUNDER_VARIANTS):
+        found = match_terms("founder", title)
+        if found:
             founder_hits += 1
+            bits |= found
 
-        if any(t in title or t in company for t in AI_TERMS):
-            industry_ai = True
-        if any(t in title or t in company for t in FIN_TERMS):
-            industry_fin = True
-        if any(t in title or t in company for t in HEALTH_TERMS):
-            industry_health = True
+        for group, rule in (("ai", "industry_ai"), ("fin", "industry_fin"), ("health", "industry_health")):
+            found = match_terms(group, title_company)
+            if found:
+                bits |= found | RULE[rule]
 
-        if any(c in company for c in TOP_COMPANY_ALIASES):
-            bg_company = True
-
-        if any(k in title for k in EXEC_BIGCO_TERMS) and any(c in company for c in TOP_COMPANY_ALIASES):
-            bigco_exec_flag = True
+        found = match_terms("company", company)
+        if found:
+            bits |= found | RULE["top_company"]
+            found = match_terms("exec", title)
+            if found:
+                bits |= found | RULE["bigco_exec"]
 
     education = p.get("education", []) if isinstance(p.get("education"), list) else []
     for ed in education:
         school = to_text(ed.get("school"))
-        if any(s in school for s in TOP_SCHOOL_ALIASES):
-            bg_school = True
+        found = match_terms("school", school)
+        if found:
+            bits |= found | RULE["top_school"]
 
     blob_exp = to_text(" ".join(blob_exp_parts))
     full_blob = to_text(blob_head, blob_exp)
 
-    score = 0
-
-    if any(t in blob_head for t in STEALTH_TERMS):
-        score += 20
+    found = match_terms("stealth", blob_head)
+    stealth = bool(found)
+    if stealth:
+        bits |= found | RULE["stealth_terms"]
     if founder_hits > 0:
-        score += 10
-
-    if current_recent > 0:
-        score += 12
-    if current_recent == 0 and any(t in blob_head for t in ["building", "stealth"]):
-        score += 6
-    if ended_recent > 0:
-        score += 8
-
-    if bg_company:
-        score += 9
-    if bg_school:
-        score += 6
-
-    ind = 0
-    if industry_ai:
-        ind += 7
-    if industry_fin:
-        ind += 5
-    if industry_health:
-        ind += 3
-    score += min(15, ind)
-
-    if any(g in full_blob for g in GEO_TERMS):
-        score += 10
-
-    if any(a in full_blob for a in ACCEL_TERMS):
-        score += 10
-
+        bits |= RULE["founder_title"]
+
+    if current_recent:
+        bits |= RULE["current_recent"]
+    if not current_recent and any(t in blob_head for t in ["building", "stealth"]):
+        bits |= RULE["building_no_recent_role"]
+    if ended_recent:
+        bits |= RULE["ended_recent"]
+
+    for group, rule, text in (("geo", "geography", full_blob), ("accel", "accelerator", full_blob),
+                              ("outreach", "outreach_terms", blob_head)):
+        found = match_terms(group, text)
+        if found:
+            bits |= found | RULE[rule]
     if email:
-        score += 6
-    if any(t in blob_head for t in OUTREACH_TERMS):
-        score += 4
+        bits |= RULE["email"]
 
-    penalties = 0
-    if bigco_exec_flag and not any(t in blob_head for t in STEALTH_TERMS):
-        penalties += 10
-    if (follower_count or 0) > 50000 and not any(t in blob_head for t in STEALTH_TERMS):
-        penalties += 5
-    if founder_hits == 0 and current_recent == 0 and not any(t in blob_head for t in STEALTH_TERMS):
-        penalties += 5
+    if stealth:
+        bits &= ~RULE["bigco_exec"]
+    if (follower_count or 0) > 50000 and not stealth:
+        bits |= RULE["large_audience"]
+    if founder_hits == 0 and not current_recent and not stealth:
+        bits |= RULE["no_founder_signal"]
 
-    score = max(0, min(100, score - penalties))
+    # Points per component (see BREAKDOWN_COMPONENTS) follow from the fired rules
+    breakdown = EXPLAIN.breakdown(bits)
+    score = max(0, min(100, sum(breakdown.values())))
 
     if score >= 75:
         tier = "A"
@@ -210,61 +249,102 @@ def score_profile(p: Dict[str, Any]) -> Dict[str, Any]:
         "score": score,
         "tier": tier,
         "email": email,
+        "breakdown": breakdown,
+        "explain_bits": to_hex(bits),
     }
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Score and tier apimaestro profiles")
+    parser.add_argument("--db", nargs="?", const="", default=None, metavar="URL",
+                        help="Also upsert into the profile store (default URL: DATABASE_URL)")
+    parser.add_argument("--format", choices=FORMATS, default="json",
+                        help="Format of the full scored dump (parquet/arrow need pyarrow)")
+    parser.add_argument("--as-of", metavar="YYYY-MM",
+                        help="Judge recency as of this month (default: TIMELINE_AS_OF or today)")
+    return parser.parse_args()
+
+
 def main():
-    data_a = []
-    data_b = []
-    if os.path.exists(INPUT_PREF):
-        with open(INPUT_PREF, "r") as f:
-            try:
-                data_a = json.load(f)
-            except Exception:
-                data_a = []
-    if os.path.exists(INPUT_FALLBACK):
-        with open(INPUT_FALLBACK, "r") as f:
-            try:
-                data_b = json.load(f)
-            except Exception:
-                data_b = []
-
-    if not data_a and not data_b:
+    args = parse_args()
+    if args.as_of:
+        set_as_of(args.as_of)
+    if not os.path.exists(INPUT_PREF) and not os.path.exists(INPUT_FALLBACK):
         print(f"❌ Missing inputs. Expected at least one of {INPUT_PREF} or {INPUT_FALLBACK}.")
         return
 
-    combined = dedupe_profiles(data_a if isinstance(data_a, list) else [], data_b if isinstance(data_b, list) else [])
+    # Stream both files into compact records (compact_profile.py) instead of
+    # holding the parsed raw lists; per field the newest fetch wins (the item's
+    # scrape timestamp, else its file's mtime; the preferred file unless the
+    # other one is clearly newer)
+    merger = ProfileMerger(factory=CompactProfile.from_record)
+    paths = [INPUT_PREF, INPUT_FALLBACK]
+    for path, fetched_at in zip(paths, file_fetch_times(paths)):
+        try:
+            with span("parse_merge"):
+                merger.add_many(iter_json_array(path), source=path, fetched_at=fetched_at)
+        except json.JSONDecodeError as e:
+            print(f"⚠️ Stopped reading {path} at malformed JSON: {e}")
+    print(merger.report())
+    with span("near_duplicates"):
+        combined, near_dups = collapse_records(merger.records())
+    if near_dups:
+        print(f"🧬 Folded {sum(len(c) - 1 for c in near_dups)} near-duplicate profiles "
+              f"(same person, different identifiers)")
     print(f"📥 Loaded {len(combined)} unique profiles (combined)")
 
-    scored = [score_profile(p) for p in combined]
-
-    with open(OUT_JSON, "w") as f:
-        json.dump(scored, f, indent=2)
-
-    def write_csv(filepath: str, rows: List[Dict[str, Any]]):
-        with open(filepath, "w", newline="") as f:
-            w = csv.writer(f)
-            w.writerow(["name", "url", "headline", "location", "score", "tier", "email"])
-            for r in rows:
-                w.writerow([r.get("name", ""), r.get("url", ""), r.get("headline", ""), r.get("location", ""), r.get("score", 0), r.get("tier", ""), r.get("email") or ""])
-
-    write_csv(OUT_CSV, scored)
+    with span("score"):
+        scored = [score_profile(p.to_record()) for p in combined]
+    count("profiles.scored", len(scored))
+
+    with span(f"write_{args.format}"):
+        if args.format == "json":
+            out_scored = OUT_JSON
+            with open(OUT_JSON, "w") as f:
+                json.dump(scored, f, indent=2)
+        else:
+            out_scored = write_scored(scored, output_path(OUT_JSON, args.format), args.format)
+
+    # All / tier A / tier B CSVs and the summary counters in a single pass
+    header = ["name", "url", "headline", "location", "score", "tier", "email"]
+    acc = SummaryAccumulator()
+    with span("write_csv"), open(OUT_CSV, "w", newline="") as f_all, open(OUT_A, "w", newline="") as f_a, open(OUT_B, "w", newline="") as f_b:
+        w_all = csv.writer(f_all)
+        tier_writers = {"A": csv.writer(f_a), "B": csv.writer(f_b)}
+        for w in (w_all, *tier_writers.values()):
+            w.writerow(header)
+        for r in scored:
+            row = [r.get("name", ""), r.get("url", ""), r.get("headline", ""), r.get("location", ""), r.get("score", 0), r.get("tier", ""), r.get("email") or ""]
+            w_all.writerow(row)
+            t = r.get("tier")
+            if t in tier_writers:
+                tier_writers[t].writerow(row)
+            acc.count("tier", t)
+            acc.observe("score", r.get("score", 0))
+            acc.heavy("location", r.get("location"))
 
     summary = {"A": 0, "B": 0, "C": 0}
-    for r in scored:
-        t = r.get("tier")
+    for t, n in acc.counter("tier").items():
         if t in summary:
-            summary[t] += 1
+            summary[t] = n
     with open(OUT_SUMMARY, "w") as f:
         json.dump(summary, f, indent=2)
 
-    write_csv(OUT_A, [r for r in scored if r.get("tier") == "A"])
-    write_csv(OUT_B, [r for r in scored if r.get("tier") == "B"])
-
     print(f"✅ Scored {len(scored)} profiles")
     print(f"🏷️ Tiers: A={summary['A']} | B={summary['B']} | C={summary['C']}")
-    print(f"📄 Outputs: {OUT_JSON}, {OUT_CSV}, {OUT_SUMMARY}, {OUT_A}, {OUT_B}")
+    print(f"📈 Average score: {acc.mean('score'):.1f}")
+    print(f"📍 Top locations: {acc.top('location', 5)}")
+    print(f"📄 Outputs: {out_scored}, {OUT_CSV}, {OUT_SUMMARY}, {OUT_A}, {OUT_B}")
+
+    if args.db is not None:
+        from profile_store import store_scored_run
+        with span("db.store"):
+            # Dicts are rebuilt one store chunk at a time, never for the whole corpus at once
+            run_id = store_scored_run((p.to_record() for p in combined), scored, scorer="apimaestro",
+                                      source=f"{INPUT_PREF}+{INPUT_FALLBACK}", db_url=args.db or None)
+        print(f"🗃️ Upserted {len(scored)} profiles into profile store (run {run_id})")
 
 
 if __name__ == "__main__":
-    main()
+    with pipeline_timing.run("score_apimaestro"):
+        main()
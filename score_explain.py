@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Score Explanations from Bitsets
+===============================
+
+Every scorer registers its rules (component, points, label) and the term
+lists it matches against in an ExplainRegistry. Scoring a profile then
+yields one integer with a bit set for every rule that fired and every term
+that matched; it is stored next to the score as a hex string
+("explain_bits" in the scored JSON and the profile store).
+
+explain(scorer, bits) rebuilds the per-component breakdown and a readable
+explanation from the bits alone (no text is re-scanned), and is cached per
+distinct bitset, so explaining thousands of review rows costs a few dict
+lookups.
+
+Bit positions are assigned in registration order: only ever append rules
+and terms to a registry, or bits stored by earlier runs will decode wrong.
+
+Usage:
+    explain("apimaestro", row["explain_bits"])
+    python score_explain.py apimaestro_scored.json [--scorer apimaestro] [--limit 20]
+"""
+
+import json
+import argparse
+import importlib
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# Scorer name -> module defining its ExplainRegistry as EXPLAIN
+SCORER_MODULES = {
+    "apimaestro": "score_apimaestro",
+    "indian_founders": "score_indian_founders",
+    "score_and_tier": "score_and_tier",
+}
+
+_REGISTRIES: Dict[str, "ExplainRegistry"] = {}
+
+Bits = Union[int, str]
+
+
+def to_hex(bits: int) -> str:
+    return format(bits, "x")
+
+
+def from_hex(bits: Bits) -> int:
+    if isinstance(bits, int):
+        return bits
+    return int(bits, 16) if bits else 0
+
+
+class ExplainRegistry:
+    """Stable bit positions for one scorer's rules and matched terms."""
+
+    def __init__(self, scorer: str, components: Iterable[str], caps: Optional[Dict[str, int]] = None):
+        self.scorer = scorer
+        self.components = list(components)
+        self.caps = caps or {}
+        self.keys: List[str] = []
+        self.bit: Dict[str, int] = {}
+        # rule key -> (component, points, label, term group)
+        self.rules: Dict[str, Tuple[str, float, str, str]] = {}
+
+    def _register(self, key: str) -> int:
+        if key not in self.bit:
+            self.bit[key] = len(self.keys)
+            self.keys.append(key)
+        return self.bit[key]
+
+    def rule(self, key: str, component: str, points: float, label: str, terms: str = "") -> str:
+        """A scoring rule worth `points` to `component`; `terms` names the term group it matches."""
+        self._register(key)
+        self.rules[key] = (component, points, label, terms)
+        return key
+
+    def terms(self, group: str, terms: Iterable[str]) -> None:
+        """Register one bit per term, keyed "<group>:<term>"."""
+        for term in terms:
+            self._register(f"{group}:{term}")
+
+    def mask(self, key: str) -> int:
+        """Single-bit mask of a registered rule or "<group>:<term>" key."""
+        return 1 << self.bit[key]
+
+    def term_masks(self, group: str, terms: Iterable[str]) -> List[Tuple[str, int]]:
+        """(term, mask) pairs for scanning text and OR-ing hits straight into a bitset."""
+        return [(term, self.mask(f"{group}:{term}")) for term in terms]
+
+    def encode(self, keys: Iterable[str]) -> int:
+        bits = 0
+        for key in keys:
+            bits |= 1 << self.bit[key]
+        return bits
+
+    def decode(self, bits: Bits) -> List[str]:
+        bits = from_hex(bits)
+        keys = []
+        i = 0
+        while bits:
+            if bits & 1:
+                keys.append(self.keys[i] if i < len(self.keys) else f"unknown:{i}")
+            bits >>= 1
+            i += 1
+        return keys
+
+    def breakdown(self, bits: Bits) -> Dict[str, float]:
+        """Points per component for the rules set in `bits` (component caps applied)."""
+        bits = from_hex(bits)
+        out = dict.fromkeys(self.components, 0)
+        for key, (component, points, _, _) in self.rules.items():
+            if bits >> self.bit[key] & 1:
+                out[component] = out.get(component, 0) + points
+        for component, cap in self.caps.items():
+            if out.get(component, 0) > cap:
+                out[component] = cap
+        return out
+
+    def explain(self, bits: Bits) -> List[str]:
+        """One line per fired rule: points, component, label and the terms that matched."""
+        keys = self.decode(bits)
+        matched: Dict[str, List[str]] = {}
+        for key in keys:
+            if key not in self.rules and ":" in key:
+                group, term = key.split(":", 1)
+                matched.setdefault(group, []).append(term.strip())
+        # Step rules sharing a component and label (e.g. 2 points per top company) fold into one line
+        fired: Dict[Tuple[str, str], List] = {}
+        for key in keys:
+            if key not in self.rules:
+                continue
+            component, points, label, group = self.rules[key]
+            entry = fired.setdefault((component, label), [0, 0, ""])
+            entry[0] += points
+            entry[1] += 1
+            entry[2] = entry[2] or group
+        lines = []
+        for (component, label), (points, count, group) in fired.items():
+            line = f"{points:+g} {component}: {label}"
+            if count > 1:
+                line += f" x{count}"
+            if matched.get(group):
+                line += " (" + ", ".join(f'"{t}"' for t in matched[group]) + ")"
+            lines.append(line)
+        for component, cap in self.caps.items():
+            total = sum(p for c, p, _, _ in (self.rules[k] for k in keys if k in self.rules) if c == component)
+            if total > cap:
+                lines.append(f"{cap - total:+g} {component}: capped at {cap}")
+        return lines
+
+
+def get_registry(scorer: str) -> ExplainRegistry:
+    """The EXPLAIN registry of a scorer module (imported on first use)."""
+    if scorer not in _REGISTRIES:
+        if scorer not in SCORER_MODULES:
+            raise KeyError(f"No explanation registry for scorer {scorer!r}")
+        _REGISTRIES[scorer] = importlib.import_module(SCORER_MODULES[scorer]).EXPLAIN
+    return _REGISTRIES[scorer]
+
+
+@lru_cache(maxsize=65536)
+def _explain_cached(scorer: str, bits: int) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, float], ...]]:
+    registry = get_registry(scorer)
+    return tuple(registry.explain(bits)), tuple(registry.breakdown(bits).items())
+
+
+def explain(scorer: str, bits: Bits) -> List[str]:
+    """Readable explanation lines for a stored bitset (int or hex string)."""
+    return list(_explain_cached(scorer, from_hex(bits))[0])
+
+
+def explain_breakdown(scorer: str, bits: Bits) -> Dict[str, float]:
+    """Per-component points for a stored bitset."""
+    return dict(_explain_cached(scorer, from_hex(bits))[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Explain stored scores from their explain_bits")
+    parser.add_argument("scored_json", help="Scored JSON (e.g. apimaestro_scored.json)")
+    parser.add_argument("--scorer", default="apimaestro", choices=sorted(SCORER_MODULES))
+    parser.add_argument("--tier", help="Only rows in this tier")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(args.scored_json, "r") as f:
+        rows = json.load(f)
+    shown = 0
+    for row in rows:
+        if args.tier and row.get("tier") != args.tier.upper():
+            continue
+        if "explain_bits" not in row:
+            continue
+        print(f"{row.get('score', 0):>5} {row.get('tier', '')}  {row.get('name') or row.get('url', '')}")
+        for line in explain(args.scorer, row["explain_bits"]):
+            print(f"        {line}")
+        shown += 1
+        if shown >= args.limit:
+            break
+    if not shown:
+        print("❌ No rows with explain_bits (re-run the scorer to add them)")
+
+
+if __name__ == "__main__":
+    main()
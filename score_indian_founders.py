@@ -6,8 +6,66 @@ Custom scoring system optimized for Indian founders in specific verticals
 
 import json
 import re
-from typing import Dict, Any, List
-from datetime import datetime
+import argparse
+from typing import Dict, Any, List, Optional
+
+from columnar_export import FORMATS, output_path, write_scored
+from metrics import SCORE_SECONDS
+from score_explain import ExplainRegistry, to_hex
+from summary_stats import SummaryAccumulator
+from timeline_features import recent_year_terms
+
+# Columns kept in the Parquet/Arrow dump (plus one breakdown_* column per score component)
+COLUMNAR_COLUMNS = [
+    "name", "linkedin_url", "headline", "location", "categories", "score", "tier",
+    "has_ai", "has_health", "has_consumer", "conversation_starter", "explain_bits"
+]
+
+INDIAN_CITIES = [
+    "bangalore", "mumbai", "delhi", "hyderabad", "chennai", "pune", 
+    "gurgaon", "noida", "ahmedabad", "kolkata", "jaipur", "indore"
+]
+MAJOR_CITIES = ["Bangalore", "Mumbai", "Delhi", "Hyderabad"]
+
+NETWORK_KEYWORDS = [
+    "yc", "y combinator", "techstars", "500 startups", "antler", "cohort", "batch",
+    "startup india", "nasscom", "tiie", "iit incubator", "iim incubator"
+]
+
+PENALTY_INDICATORS = [
+    "established", "senior", "veteran", "20+ years", "15+ years", "10+ years",
+    "executive", "director", "vp", "head of", "chief", "president",
+    "massive audience", "influencer", "thought leader", "speaker"
+]
+
+BREAKDOWN_COMPONENTS = [
+    "stealth_founder", "recency", "indian_background", "health_consumer_focus", "top_companies",
+    "top_schools", "geography", "network", "outreach_ready", "penalties"
+]
+
+# Scoring rules as stable explanation bits (score_explain.py); append only.
+# Count-based components get one rule per step (e.g. 2 points per top company, max 10)
+EXPLAIN = ExplainRegistry("indian_founders", BREAKDOWN_COMPONENTS, caps={"health_consumer_focus": 15})
+EXPLAIN.rule("stealth_founder", "stealth_founder", 30, "stealth + founder language in headline/about")
+EXPLAIN.rule("recency", "recency", 20, "recent activity language in headline/about")
+EXPLAIN.rule("indian_background", "indian_background", 15, "Indian location or background")
+EXPLAIN.rule("health_focus", "health_consumer_focus", 8, "health focus")
+EXPLAIN.rule("consumer_focus", "health_consumer_focus", 8, "consumer tech focus")
+EXPLAIN.rule("ai_focus", "health_consumer_focus", 4, "AI focus")
+for _n in range(1, 6):
+    EXPLAIN.rule(f"top_companies_{_n}", "top_companies", 2, "top-company role")
+for _n, _points in ((1, 2), (2, 2), (3, 1)):
+    EXPLAIN.rule(f"top_schools_{_n}", "top_schools", _points, "top-school degree")
+EXPLAIN.rule("geography_major", "geography", 5, "major Indian startup city", terms="city")
+EXPLAIN.rule("geography_other", "geography", 3, "other Indian city", terms="city")
+for _n, _points in ((1, 2), (2, 2), (3, 1)):
+    EXPLAIN.rule(f"network_{_n}", "network", _points, "accelerator/network mention", terms="network")
+EXPLAIN.rule("outreach_ready", "outreach_ready", 5, "open to outreach")
+for _n in range(1, 5):
+    EXPLAIN.rule(f"penalties_{_n}", "penalties", -5, "seniority/audience signal", terms="penalty")
+EXPLAIN.terms("city", INDIAN_CITIES)
+EXPLAIN.terms("network", NETWORK_KEYWORDS)
+EXPLAIN.terms("penalty", PENALTY_INDICATORS)
 
 def extract_signals(profile_data: Dict[str, Any]) -> Dict[str, Any]:
     """Extract relevant signals from profile data"""
@@ -42,10 +100,8 @@ def extract_signals(profile_data: Dict[str, Any]) -> Dict[str, Any]:
         any(keyword in headline or keyword in about for keyword in founder_keywords)
     )
     
-    # Recency signals (2023/24 activity)
-    current_year = datetime.now().year
-    recency_indicators = [
-        str(current_year), str(current_year - 1),
+    # Recency signals (activity in the as-of year or the one before)
+    recency_indicators = recent_year_terms() + [
         "recent", "new", "just", "recently", "latest"
     ]
     signals["recency"] = any(indicator in headline or indicator in about for indicator in recency_indicators)
@@ -111,23 +167,13 @@ def extract_signals(profile_data: Dict[str, Any]) -> Dict[str, Any]:
             signals["top_schools"].append(edu.get("school", ""))
     
     # Geography
-    indian_cities = [
-        "bangalore", "mumbai", "delhi", "hyderabad", "chennai", "pune", 
-        "gurgaon", "noida", "ahmedabad", "kolkata", "jaipur", "indore"
-    ]
-    
-    for city in indian_cities:
+    for city in INDIAN_CITIES:
         if city in location:
             signals["geography"] = city.title()
             break
     
     # Network/Accelerator signals
-    network_keywords = [
-        "yc", "y combinator", "techstars", "500 startups", "antler", "cohort", "batch",
-        "startup india", "nasscom", "tiie", "iit incubator", "iim incubator"
-    ]
-    
-    for keyword in network_keywords:
+    for keyword in NETWORK_KEYWORDS:
         if keyword in headline or keyword in about:
             signals["network"].append(keyword)
     
@@ -139,95 +185,45 @@ def extract_signals(profile_data: Dict[str, Any]) -> Dict[str, Any]:
     signals["outreach_ready"] = any(indicator in headline or indicator in about for indicator in outreach_indicators)
     
     # Penalties
-    penalty_indicators = [
-        "established", "senior", "veteran", "20+ years", "15+ years", "10+ years",
-        "executive", "director", "vp", "head of", "chief", "president",
-        "massive audience", "influencer", "thought leader", "speaker"
-    ]
-    
-    for indicator in penalty_indicators:
+    for indicator in PENALTY_INDICATORS:
         if indicator in headline or indicator in about:
             signals["penalties"].append(indicator)
     
     return signals
 
+@SCORE_SECONDS.timed(scorer="indian_founders")
 def calculate_score(signals: Dict[str, Any], profile_data: Dict[str, Any]) -> Dict[str, Any]:
     """Calculate score based on extracted signals"""
-    score = 0
-    breakdown = {}
-    
-    # Stealth & Founder (30 points)
-    if signals["stealth_founder"]:
-        score += 30
-        breakdown["stealth_founder"] = 30
-    else:
-        breakdown["stealth_founder"] = 0
+    # Rules that fired (see EXPLAIN) plus the matched city/network/penalty terms
+    hits = [key for key in ("stealth_founder", "recency", "indian_background",
+                            "health_focus", "consumer_focus", "ai_focus") if signals[key]]
     
-    # Recency (20 points)
-    if signals["recency"]:
-        score += 20
-        breakdown["recency"] = 20
-    else:
-        breakdown["recency"] = 0
-    
-    # Indian Background (15 points)
-    if signals["indian_background"]:
-        score += 15
-        breakdown["indian_background"] = 15
-    else:
-        breakdown["indian_background"] = 0
-    
-    # Health/Consumer Focus (15 points)
-    focus_score = 0
-    if signals["health_focus"]:
-        focus_score += 8
-    if signals["consumer_focus"]:
-        focus_score += 8
-    if signals["ai_focus"]:
-        focus_score += 4
-    
-    score += min(focus_score, 15)
-    breakdown["health_consumer_focus"] = min(focus_score, 15)
-    
-    # Top Companies (10 points)
-    company_score = min(len(signals["top_companies"]) * 2, 10)
-    score += company_score
-    breakdown["top_companies"] = company_score
-    
-    # Top Schools (5 points)
-    school_score = min(len(signals["top_schools"]) * 2, 5)
-    score += school_score
-    breakdown["top_schools"] = school_score
+    # Top Companies (2 each, 10 points) / Top Schools (2 each, 5 points)
+    hits += [f"top_companies_{n}" for n in range(1, min(len(signals["top_companies"]), 5) + 1)]
+    hits += [f"top_schools_{n}" for n in range(1, min(len(signals["top_schools"]), 3) + 1)]
     
     # Geography (5 points)
-    if signals["geography"] in ["Bangalore", "Mumbai", "Delhi", "Hyderabad"]:
-        score += 5
-        breakdown["geography"] = 5
-    elif signals["geography"]:
-        score += 3
-        breakdown["geography"] = 3
-    else:
-        breakdown["geography"] = 0
+    if signals["geography"]:
+        hits.append("geography_major" if signals["geography"] in MAJOR_CITIES else "geography_other")
+        hits.append(f"city:{signals['geography'].lower()}")
     
-    # Network (5 points)
-    network_score = min(len(signals["network"]) * 2, 5)
-    score += network_score
-    breakdown["network"] = network_score
+    # Network (2 each, 5 points)
+    hits += [f"network_{n}" for n in range(1, min(len(signals["network"]), 3) + 1)]
+    hits += [f"network:{keyword}" for keyword in signals["network"]]
     
     # Outreach Readiness (5 points)
     if signals["outreach_ready"]:
-        score += 5
-        breakdown["outreach_ready"] = 5
-    else:
-        breakdown["outreach_ready"] = 0
+        hits.append("outreach_ready")
     
-    # Penalties (up to -20 points)
-    penalty_score = min(len(signals["penalties"]) * 5, 20)
-    score -= penalty_score
-    breakdown["penalties"] = -penalty_score
+    # Penalties (5 each, up to -20 points)
+    hits += [f"penalties_{n}" for n in range(1, min(len(signals["penalties"]), 4) + 1)]
+    hits += [f"penalty:{indicator}" for indicator in signals["penalties"]]
+    
+    explain_bits = EXPLAIN.encode(hits)
+    breakdown = EXPLAIN.breakdown(explain_bits)
     
     # Ensure score is between 0 and 100
-    score = max(0, min(100, score))
+    score = max(0, min(100, sum(breakdown.values())))
     
     # Determine tier
     if score >= 75:
@@ -241,7 +237,8 @@ def calculate_score(signals: Dict[str, Any], profile_data: Dict[str, Any]) -> Di
         "total_score": score,
         "tier": tier,
         "breakdown": breakdown,
-        "signals": signals
+        "signals": signals,
+        "explain_bits": to_hex(explain_bits)
     }
 
 def generate_conversation_starter(profile_data: Dict[str, Any], signals: Dict[str, Any]) -> str:
@@ -267,24 +264,17 @@ def generate_conversation_starter(profile_data: Dict[str, Any], signals: Dict[st
     
     return template
 
-def main():
-    """Main scoring function"""
-    print("🎯 Indian Founders Scoring - Health & Consumer Tech")
-    print("=" * 60)
-    
-    # Load filtered profiles
-    try:
-        with open("indian_founders_filtered.json", "r") as f:
-            profiles = json.load(f)
-    except FileNotFoundError:
-        print("❌ indian_founders_filtered.json not found. Run indian_founders_discovery.py first.")
-        return
-    
-    print(f"📊 Scoring {len(profiles)} Indian founders...")
-    
+def parse_args():
+    parser = argparse.ArgumentParser(description="Score Indian health/consumer founders")
+    parser.add_argument("--db", nargs="?", const="", default=None, metavar="URL",
+                        help="Also upsert into the profile store (default URL: DATABASE_URL)")
+    parser.add_argument("--format", choices=FORMATS, default="json",
+                        help="Format of the full scored dump (parquet/arrow need pyarrow)")
+    return parser.parse_args()
+
+def score_profiles(profiles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Score filtered profiles in memory, highest score first"""
     scored_profiles = []
-    tier_counts = {"A": 0, "B": 0, "C": 0}
-    category_counts = {}
     
     for profile in profiles:
         # Extract signals
@@ -302,38 +292,52 @@ def main():
             "score": scoring_result["total_score"],
             "tier": scoring_result["tier"],
             "score_breakdown": scoring_result["breakdown"],
+            "explain_bits": scoring_result["explain_bits"],
             "signals": signals,
             "conversation_starter": conversation_starter
         }
         
         scored_profiles.append(scored_profile)
-        
-        # Update counts
-        tier_counts[scoring_result["tier"]] += 1
-        
-        for category in profile.get("categories", []):
-            category_counts[category] = category_counts.get(category, 0) + 1
     
     # Sort by score (highest first)
     scored_profiles.sort(key=lambda x: x["score"], reverse=True)
-    
+    return scored_profiles
+
+def write_outputs(scored_profiles: List[Dict[str, Any]], fmt: str = "json") -> Dict[str, Any]:
+    """Write scored JSON (or Parquet/Arrow)/CSV/summary files and print the report; returns the summary"""
     # Save scored profiles
-    with open("indian_founders_scored.json", "w") as f:
-        json.dump(scored_profiles, f, indent=2)
+    if fmt == "json":
+        scored_path = "indian_founders_scored.json"
+        with open(scored_path, "w") as f:
+            json.dump(scored_profiles, f, indent=2)
+    else:
+        scored_path = write_scored(scored_profiles, output_path("indian_founders_scored.json", fmt), fmt,
+                                   columns=COLUMNAR_COLUMNS)
     
-    # Create tier-specific CSV files
+    # All-profile and tier-specific CSV files plus the summary, in one pass
     import csv
     
-    # All scored profiles
-    with open("indian_founders_scored.csv", "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=[
-            "name", "headline", "location", "categories", "score", "tier", 
-            "conversation_starter", "linkedin_url"
-        ])
+    all_fields = [
+        "name", "headline", "location", "categories", "score", "tier",
+        "conversation_starter", "linkedin_url"
+    ]
+    tier_fields = [f for f in all_fields if f != "tier"]
+    acc = SummaryAccumulator()
+    
+    with open("indian_founders_scored.csv", "w", newline="", encoding="utf-8") as f_all, \
+         open("indian_founders_tierA.csv", "w", newline="", encoding="utf-8") as f_a, \
+         open("indian_founders_tierB.csv", "w", newline="", encoding="utf-8") as f_b:
+        writer = csv.DictWriter(f_all, fieldnames=all_fields)
+        tier_writers = {
+            "A": csv.DictWriter(f_a, fieldnames=tier_fields),
+            "B": csv.DictWriter(f_b, fieldnames=tier_fields),
+        }
         writer.writeheader()
+        for tier_writer in tier_writers.values():
+            tier_writer.writeheader()
         
         for profile in scored_profiles:
-            writer.writerow({
+            row = {
                 "name": profile.get("name", ""),
                 "headline": profile.get("headline", ""),
                 "location": profile.get("location", ""),
@@ -342,68 +346,34 @@ def main():
                 "tier": profile.get("tier", ""),
                 "conversation_starter": profile.get("conversation_starter", ""),
                 "linkedin_url": profile.get("linkedin_url", "")
-            })
-    
-    # Tier A profiles
-    tier_a_profiles = [p for p in scored_profiles if p["tier"] == "A"]
-    with open("indian_founders_tierA.csv", "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=[
-            "name", "headline", "location", "categories", "score", 
-            "conversation_starter", "linkedin_url"
-        ])
-        writer.writeheader()
-        
-        for profile in tier_a_profiles:
-            writer.writerow({
-                "name": profile.get("name", ""),
-                "headline": profile.get("headline", ""),
-                "location": profile.get("location", ""),
-                "categories": ", ".join(profile.get("categories", [])),
-                "score": profile.get("score", 0),
-                "conversation_starter": profile.get("conversation_starter", ""),
-                "linkedin_url": profile.get("linkedin_url", "")
-            })
-    
-    # Tier B profiles
-    tier_b_profiles = [p for p in scored_profiles if p["tier"] == "B"]
-    with open("indian_founders_tierB.csv", "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=[
-            "name", "headline", "location", "categories", "score", 
-            "conversation_starter", "linkedin_url"
-        ])
-        writer.writeheader()
-        
-        for profile in tier_b_profiles:
-            writer.writerow({
-                "name": profile.get("name", ""),
-                "headline": profile.get("headline", ""),
-                "location": profile.get("location", ""),
-                "categories": ", ".join(profile.get("categories", [])),
-                "score": profile.get("score", 0),
-                "conversation_starter": profile.get("conversation_starter", ""),
-                "linkedin_url": profile.get("linkedin_url", "")
-            })
+            }
+            writer.writerow(row)
+            tier_writer = tier_writers.get(profile["tier"])
+            if tier_writer is not None:
+                del row["tier"]
+                tier_writer.writerow(row)
+            
+            acc.row()
+            acc.count("tiers", profile["tier"])
+            for category in profile.get("categories", []):
+                acc.count("categories", category)
+            acc.observe("score", profile["score"])
+            acc.heavy("locations", profile.get("location", "Unknown"))
+            acc.count("ai_adoption", "with_ai" if profile.get("has_ai") else "without_ai")
+    
+    tier_counts = {"A": 0, "B": 0, "C": 0, **acc.counter("tiers")}
+    category_counts = acc.counter("categories")
     
     # Generate summary
     summary = {
-        "total_profiles": len(scored_profiles),
+        "total_profiles": acc.rows,
         "tier_distribution": tier_counts,
         "category_distribution": category_counts,
-        "average_score": sum(p["score"] for p in scored_profiles) / len(scored_profiles) if scored_profiles else 0,
-        "top_locations": {},
-        "ai_adoption": {"with_ai": 0, "without_ai": 0}
+        "average_score": acc.mean("score"),
+        "top_locations": acc.top("locations", 50),
+        "ai_adoption": {"with_ai": 0, "without_ai": 0, **acc.counter("ai_adoption")}
     }
     
-    # Count locations
-    for profile in scored_profiles:
-        location = profile.get("location", "Unknown")
-        summary["top_locations"][location] = summary["top_locations"].get(location, 0) + 1
-        
-        if profile.get("has_ai"):
-            summary["ai_adoption"]["with_ai"] += 1
-        else:
-            summary["ai_adoption"]["without_ai"] += 1
-    
     # Save summary
     with open("indian_founders_scored_summary.json", "w") as f:
         json.dump(summary, f, indent=2)
@@ -417,11 +387,45 @@ def main():
     print(f"📈 Average score: {summary['average_score']:.1f}")
     
     print("\n📁 Output files:")
-    print("- indian_founders_scored.json: All scored profiles with details")
+    print(f"- {scored_path}: All scored profiles with details")
     print("- indian_founders_scored.csv: All profiles in CSV format")
     print("- indian_founders_tierA.csv: Top tier profiles for immediate outreach")
     print("- indian_founders_tierB.csv: Second tier profiles for targeted outreach")
     print("- indian_founders_scored_summary.json: Summary statistics")
+    
+    return summary
+
+def run_scoring(profiles: List[Dict[str, Any]], db_url: Optional[str] = None,
+                source: str = "indian_founders_filtered.json", fmt: str = "json") -> List[Dict[str, Any]]:
+    """Score, write outputs and (if db_url is not None) upsert into the profile store"""
+    print("🎯 Indian Founders Scoring - Health & Consumer Tech")
+    print("=" * 60)
+    print(f"📊 Scoring {len(profiles)} Indian founders...")
+    
+    scored_profiles = score_profiles(profiles)
+    write_outputs(scored_profiles, fmt)
+    
+    if db_url is not None:
+        from profile_store import store_scored_run
+        run_id = store_scored_run(scored_profiles, scored_profiles, scorer="indian_founders",
+                                  source=source, db_url=db_url or None)
+        print(f"🗃️ Upserted {len(scored_profiles)} profiles into profile store (run {run_id})")
+    
+    return scored_profiles
+
+def main():
+    """Main scoring function"""
+    args = parse_args()
+    
+    # Load filtered profiles
+    try:
+        with open("indian_founders_filtered.json", "r") as f:
+            profiles = json.load(f)
+    except FileNotFoundError:
+        print("❌ indian_founders_filtered.json not found. Run indian_founders_discovery.py first.")
+        return
+    
+    run_scoring(profiles, db_url=args.db, fmt=args.format)
 
 if __name__ == "__main__":
     main()
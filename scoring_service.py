@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Scoring Service (FastAPI)
+=========================
+
+Long-running HTTP front for the scorers, so integrations (CRM, review UI)
+score profiles in-process instead of spawning the batch scripts.
+
+- POST /score?scorer=apimaestro          one profile (JSON body) -> result
+- POST /score/batch?scorer=apimaestro    NDJSON body, one profile per line
+                                         -> NDJSON results, streamed in order
+- GET  /health                           scorers loaded + warm-up timing
+- GET  /metrics                          Prometheus text (metrics.py: scoring
+                                         latency histograms, request counts)
+
+Scorers:
+- apimaestro       score_apimaestro.score_profile; body is a raw Apify item
+                   of either schema (normalized via profile_merge)
+- indian_founders  score_indian_founders.calculate_score; body is the flat
+                   {name, linkedin_url, headline, about, location,
+                   experience, education} profile the filters produce
+
+Bodies are validated with Pydantic (422 on a bad /score body; a bad batch
+line yields {"line": n, "error": ...} and the batch continues). Term
+tables and explanation registries are built at import and every scorer is
+run once at startup, so the first request pays no warm-up cost.
+Add ?explain=true for readable explanation lines (score_explain.py).
+
+Usage:
+    python scoring_service.py [--host 0.0.0.0] [--port 8000]
+    curl -s localhost:8000/score -d @profile.json
+    curl -s localhost:8000/score/batch -H 'Content-Type: application/x-ndjson' --data-binary @profiles.ndjson
+
+Env overrides: SCORING_HOST, SCORING_PORT
+"""
+
+import os
+import json
+import time
+import argparse
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Iterator, Dict, List, Optional, Tuple, Type
+
+from fastapi import Body, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, ValidationError, field_validator, model_validator
+
+from metrics import CONTENT_TYPE, REGISTRY, counter
+from profile_merge import is_failed, normalize_profile
+from score_apimaestro import score_profile
+from score_explain import explain
+from score_indian_founders import calculate_score, extract_signals
+
+SCORING_HOST = os.getenv("SCORING_HOST", "127.0.0.1")
+SCORING_PORT = int(os.getenv("SCORING_PORT", "8000"))
+
+SCORE_REQUESTS = counter("founder_score_requests_total", "Profiles scored by the service, by outcome",
+                         ["scorer", "outcome"])
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+# ---- request / response models --------------------------------------------
+
+class LinkedInProfileIn(BaseModel):
+    """Raw Apify item: nested (basic_info/experience/education) or flat schema."""
+    model_config = ConfigDict(extra="allow")
+
+    basic_info: Optional[Dict[str, Any]] = None
+
+    @model_validator(mode="after")
+    def _not_failed(self) -> "LinkedInProfileIn":
+        if is_failed(self.model_dump()):
+            raise ValueError("failed scrape (no profile data)")
+        return self
+
+
+class ExperienceIn(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    title: str = ""
+    company: str = ""
+
+    @field_validator("title", "company", mode="before")
+    @classmethod
+    def none_to_empty(cls, value: Any) -> str:
+        return _text(value)
+
+
+class EducationIn(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    school: str = ""
+
+    @field_validator("school", mode="before")
+    @classmethod
+    def none_to_empty(cls, value: Any) -> str:
+        return _text(value)
+
+
+class FlatProfileIn(BaseModel):
+    """Flat profile as produced by the Indian founder filters."""
+    model_config = ConfigDict(extra="allow")
+
+    name: str = ""
+    linkedin_url: str = ""
+    headline: str = ""
+    about: str = ""
+    location: str = ""
+    experience: List[ExperienceIn] = []
+    education: List[EducationIn] = []
+
+    @field_validator("name", "linkedin_url", "headline", "about", "location", mode="before")
+    @classmethod
+    def none_to_empty(cls, value: Any) -> str:
+        return _text(value)
+
+
+class ScoreResult(BaseModel):
+    scorer: str
+    id: str = ""
+    name: str = ""
+    score: float
+    tier: str
+    breakdown: Dict[str, int]
+    explain_bits: str
+    explanation: Optional[List[str]] = None
+
+
+# ---- scorers ----------------------------------------------------------------
+
+def _score_apimaestro(item: Dict[str, Any]) -> Dict[str, Any]:
+    row = score_profile(normalize_profile(item))
+    return {"id": row["url"], "name": row["name"], "score": row["score"], "tier": row["tier"],
+            "breakdown": row["breakdown"], "explain_bits": row["explain_bits"]}
+
+
+def _score_indian_founders(profile: Dict[str, Any]) -> Dict[str, Any]:
+    result = calculate_score(extract_signals(profile), profile)
+    return {"id": profile["linkedin_url"], "name": profile["name"], "score": result["total_score"],
+            "tier": result["tier"], "breakdown": result["breakdown"], "explain_bits": result["explain_bits"]}
+
+
+SCORERS: Dict[str, Tuple[Type[BaseModel], Callable[[Dict[str, Any]], Dict[str, Any]]]] = {
+    "apimaestro": (LinkedInProfileIn, _score_apimaestro),
+    "indian_founders": (FlatProfileIn, _score_indian_founders),
+}
+
+WARMUP_PROFILES = {
+    "apimaestro": {
+        "basic_info": {"fullname": "Warm Up", "headline": "Founder building in stealth", "about": "AI x health",
+                       "public_identifier": "warm-up", "location": {"full": "Bangalore, India"}},
+        "experience": [{"title": "Co-Founder", "company": "Stealth", "is_current": True,
+                        "start_date": {"year": 2024}}],
+        "education": [{"school": "IIT Bombay"}],
+    },
+    "indian_founders": {"headline": "Founder building in stealth", "about": "healthtech, AI",
+                        "location": "Bangalore", "experience": [{"company": "Google"}],
+                        "education": [{"school": "IIT Delhi"}]},
+}
+
+
+class ScoringError(ValueError):
+    """A body that validated but whose field values the scorer cannot use."""
+
+
+def score_one(scorer: str, body: Any, with_explanation: bool = False) -> ScoreResult:
+    """Validate one profile for `scorer` and score it (ValidationError / ScoringError on a bad body)."""
+    model, fn = SCORERS[scorer]
+    profile = model.model_validate(body).model_dump()
+    try:
+        scored = fn(profile)
+    except (AttributeError, TypeError, KeyError) as e:
+        raise ScoringError(f"could not score profile: {e}") from e
+    result = ScoreResult(scorer=scorer, **scored)
+    if with_explanation:
+        result.explanation = explain(scorer, result.explain_bits)
+    return result
+
+
+def warm_up() -> Dict[str, float]:
+    """Score one sample per scorer so lazy state is built before the first request; ms per scorer."""
+    timings = {}
+    for scorer, sample in WARMUP_PROFILES.items():
+        start = time.perf_counter()
+        score_one(scorer, sample, with_explanation=True)
+        timings[scorer] = round((time.perf_counter() - start) * 1000, 3)
+    return timings
+
+
+# ---- app --------------------------------------------------------------------
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.warmup_ms = warm_up()
+    print(f"🔥 Scorers warm: {app.state.warmup_ms}")
+    yield
+
+
+app = FastAPI(title="Founder Scoring Service", lifespan=lifespan)
+
+
+def _check_scorer(scorer: str) -> None:
+    if scorer not in SCORERS:
+        raise HTTPException(status_code=404, detail=f"Unknown scorer {scorer!r}; expected one of {sorted(SCORERS)}")
+
+
+@app.get("/health")
+def health(request: Request) -> Dict[str, Any]:
+    return {"status": "ok", "scorers": sorted(SCORERS), "warmup_ms": getattr(request.app.state, "warmup_ms", {})}
+
+
+@app.get("/metrics")
+def metrics_text() -> Response:
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+@app.post("/score", response_model=ScoreResult, response_model_exclude_none=True)
+def score(response: Response, body: Dict[str, Any] = Body(...), scorer: str = Query("apimaestro"),
+          explain_result: bool = Query(False, alias="explain")) -> ScoreResult:
+    _check_scorer(scorer)
+    start = time.perf_counter()
+    try:
+        result = score_one(scorer, body, explain_result)
+    except ValidationError as e:
+        SCORE_REQUESTS.inc(scorer=scorer, outcome="invalid")
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+    except ScoringError as e:
+        SCORE_REQUESTS.inc(scorer=scorer, outcome="invalid")
+        raise HTTPException(status_code=422, detail=str(e))
+    SCORE_REQUESTS.inc(scorer=scorer, outcome="ok")
+    response.headers["X-Score-Ms"] = f"{(time.perf_counter() - start) * 1000:.3f}"
+    return result
+
+
+@app.post("/score/batch")
+async def score_batch(request: Request, scorer: str = Query("apimaestro"),
+                      explain_result: bool = Query(False, alias="explain")) -> StreamingResponse:
+    """NDJSON in, NDJSON out: one result (or {"line", "error"}) per non-empty input line."""
+    _check_scorer(scorer)
+    # Read the body up front: once the response streams, Starlette listens on
+    # the same receive channel for client disconnects
+    body = await request.body()
+
+    def results() -> Iterator[bytes]:
+        for line_no, line in enumerate(body.split(b"\n"), 1):
+            if not line.strip():
+                continue
+            try:
+                out = score_one(scorer, json.loads(line), explain_result).model_dump(exclude_none=True)
+                SCORE_REQUESTS.inc(scorer=scorer, outcome="ok")
+            except json.JSONDecodeError as e:
+                out = {"line": line_no, "error": f"invalid JSON: {e}"}
+            except ValidationError as e:
+                out = {"line": line_no, "error": e.errors(include_url=False, include_context=False)}
+            except ScoringError as e:
+                out = {"line": line_no, "error": str(e)}
+            if "error" in out:
+                SCORE_REQUESTS.inc(scorer=scorer, outcome="invalid")
+            yield json.dumps(out, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the scorers over HTTP")
+    parser.add_argument("--host", default=SCORING_HOST)
+    parser.add_argument("--port", type=int, default=SCORING_PORT)
+    args = parser.parse_args()
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,18 @@ SerpAPI -> Apify LinkedIn Details Pipeline
 =========================================
 
 1) Use SerpAPI to search Google for stealth-founder queries (with pagination)
-2) Extract LinkedIn profile URLs
-3) Feed URLs into the provided Apify LinkedIn details TASK in batches
+2) Extract LinkedIn profile URLs (canonicalized; near-duplicate people under
+   different URLs are collapsed from the result titles/snippets by
+   near_duplicates.py, and identifiers already in the global URL frontier
+   are not sent to Apify again; identifiers are added to the frontier only
+   once Apify has answered for them, and a dropped near-duplicate once its
+   kept person is settled, with source "near_dup_of:<kept id>")
+3) Feed new URLs into the provided Apify LinkedIn details TASK in batches
 4) Save raw and stealth-filtered outputs
+
+Each stage (SerpAPI search, Apify start/poll/dataset download, JSON parse,
+output writes) is timed with pipeline_timing.py; a per-run report is printed
+at the end (PIPELINE_PROFILE=cprofile|sample adds a profile dump).
 """
 
 import os
@@ -17,6 +26,13 @@ from typing import Any, Dict, List, Set
 import requests
 from dotenv import load_dotenv
 
+import pipeline_timing
+from metrics import APIFY_CALL_SECONDS, HTTP_RESPONSES, IN_FLIGHT, PROFILES_ENRICHED
+from near_duplicates import dedupe_serp
+from pipeline_timing import count, span
+from profile_merge import profile_id
+from url_frontier import UrlFrontier, canonical_url, canonicalize
+
 load_dotenv()
 
 SERPAPI_KEY = os.getenv("SERPAPI_KEY")
@@ -61,16 +77,21 @@ def serpapi_search(query: str, start: int = 0) -> Dict[str, Any]:
         "gl": "us",
         "api_key": SERPAPI_KEY,
     }
-    r = requests.get("https://serpapi.com/search.json", params=params, timeout=30)
+    with span("serpapi.search"):
+        r = requests.get("https://serpapi.com/search.json", params=params, timeout=30)
+    count("serpapi.requests")
+    HTTP_RESPONSES.inc(service="serpapi", status=r.status_code)
     r.raise_for_status()
-    return r.json()
+    with span("json.parse"):
+        return r.json()
 
 
 def extract_linkedin_urls_from_serp(result: Dict[str, Any]) -> Set[str]:
     urls: Set[str] = set()
     def add(url: str):
-        if "linkedin.com/in/" in url:
-            urls.add(url.split("?")[0].rstrip("/"))
+        pid = canonicalize(url)
+        if pid:
+            urls.add(canonical_url(pid))
     for item in result.get("organic_results", []) or []:
         link = item.get("link")
         if link:
@@ -86,10 +107,23 @@ def extract_linkedin_urls_from_serp(result: Dict[str, Any]) -> Set[str]:
     return urls
 
 
+def extract_serp_entries(result: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    """Canonical profile URL -> {"title", "snippet"} of the organic results."""
+    entries: Dict[str, Dict[str, str]] = {}
+    for item in result.get("organic_results", []) or []:
+        pid = canonicalize(item.get("link") or "")
+        if pid:
+            entries.setdefault(canonical_url(pid), {"title": item.get("title") or "", "snippet": item.get("snippet") or ""})
+    return entries
+
+
 def run_task_with_urls(task_id: str, urls: List[str]) -> Dict[str, Any]:
     url = f"{APIFY_BASE}/actor-tasks/{task_id}/runs?token={APIFY_TOKEN}"
     payload = {"startUrls": [{"url": u} for u in urls]}
-    r = requests.post(url, json=payload, timeout=60)
+    with span("apify.start_run"):
+        r = requests.post(url, json=payload, timeout=60)
+    count("apify.runs")
+    HTTP_RESPONSES.inc(service="apify", status=r.status_code)
     r.raise_for_status()
     return r.json()
 
@@ -99,6 +133,8 @@ def poll_run(run_id: str, interval_sec: float = 5.0, timeout_sec: int = 1200) ->
     start = time.time()
     while True:
         r = requests.get(url, timeout=30)
+        count("apify.poll_requests")
+        HTTP_RESPONSES.inc(service="apify", status=r.status_code)
         r.raise_for_status()
         data = r.json()
         status = data.get("data", {}).get("status")
@@ -111,10 +147,14 @@ def poll_run(run_id: str, interval_sec: float = 5.0, timeout_sec: int = 1200) ->
 
 def fetch_dataset_items(dataset_id: str, limit: int = 5000) -> List[Dict[str, Any]]:
     url = f"{APIFY_BASE}/datasets/{dataset_id}/items?token={APIFY_TOKEN}&clean=true&limit={limit}"
-    r = requests.get(url, timeout=60)
+    with span("apify.dataset_download"):
+        r = requests.get(url, timeout=60)
+    count("apify.dataset_bytes", len(r.content))
+    HTTP_RESPONSES.inc(service="apify", status=r.status_code)
     r.raise_for_status()
     try:
-        return r.json()
+        with span("json.parse"):
+            return r.json()
     except Exception:
         return [{"raw": r.text}]
 
@@ -134,6 +174,7 @@ def looks_stealthy_blob(item: Dict[str, Any]) -> bool:
 def main():
     print("🚀 SerpAPI -> Apify pipeline (expanded)")
     all_urls: Set[str] = set()
+    entries: Dict[str, Dict[str, str]] = {}
 
     for qi, q in enumerate(QUERIES, 1):
         for p in range(PAGES_PER_QUERY):
@@ -144,46 +185,80 @@ def main():
                 urls = extract_linkedin_urls_from_serp(res)
                 print(f"   ↳ Found {len(urls)} URLs on this page")
                 all_urls.update(urls)
-                time.sleep(1.5)
+                for url, entry in extract_serp_entries(res).items():
+                    entries.setdefault(url, entry)
+                count("serpapi.urls", len(urls))
+                with span("sleep"):
+                    time.sleep(1.5)
             except Exception as e:
                 print(f"   ↳ Error: {e}")
                 continue
 
     urls_list = sorted(all_urls)
     print(f"🔗 Total unique LinkedIn URLs: {len(urls_list)}")
-    with open("serpapi_linkedin_urls.json", "w") as f:
+    with span("write_output"), open("serpapi_linkedin_urls.json", "w") as f:
         json.dump(urls_list, f, indent=2)
 
+    # One URL per person before paying for enrichment
+    with span("near_duplicates"):
+        urls_list, near_dups = dedupe_serp({u: entries.get(u, {}) for u in urls_list})
+    if near_dups:
+        print(f"🧬 {len(near_dups)} URLs dropped as near-duplicates of another result's person")
+
+    frontier = UrlFrontier()
+    with span("frontier.filter"):
+        urls_list = frontier.unseen(urls_list)
+    print(f"🆕 {len(urls_list)} not enriched in earlier runs ({len(all_urls) - len(urls_list)} skipped)")
+
     if not urls_list:
-        print("❌ No URLs found. Consider increasing pages or adjusting queries.")
+        frontier.add_near_duplicates(near_dups, set())
+        frontier.close()
+        print("❌ No new URLs found. Consider increasing pages or adjusting queries.")
         return
 
     batch_size = 25
     all_items: List[Dict[str, Any]] = []
+    answered: Set[str] = set()
 
-    for i in range(0, len(urls_list), batch_size):
-        batch = urls_list[i:i+batch_size]
-        print(f"📦 Running Apify LinkedIn details task for batch {i//batch_size+1} ({len(batch)} URLs)…")
-        task_run = run_task_with_urls(LINKEDIN_TASK_ID, batch)
-        run_id = task_run.get("data", {}).get("id")
-        if not run_id:
-            print("   ↳ Failed to start run")
-            continue
-        final_run = poll_run(run_id)
-        status = final_run.get("data", {}).get("status")
-        dataset_id = final_run.get("data", {}).get("defaultDatasetId")
-        print(f"   ↳ Status: {status}")
-        if dataset_id:
-            items = fetch_dataset_items(dataset_id)
-            all_items.extend(items)
-        time.sleep(2)
-
-    with open("serpapi_apify_linkedin_raw.json", "w") as f:
+    try:
+        for i in range(0, len(urls_list), batch_size):
+            batch = urls_list[i:i+batch_size]
+            print(f"📦 Running Apify LinkedIn details task for batch {i//batch_size+1} ({len(batch)} URLs)…")
+            started = time.perf_counter()
+            task_run = run_task_with_urls(LINKEDIN_TASK_ID, batch)
+            run_id = task_run.get("data", {}).get("id")
+            if not run_id:
+                print("   ↳ Failed to start run")
+                continue
+            with span("apify.poll"), IN_FLIGHT.track(service="apify"):
+                final_run = poll_run(run_id)
+            status = final_run.get("data", {}).get("status")
+            dataset_id = final_run.get("data", {}).get("defaultDatasetId")
+            print(f"   ↳ Status: {status}")
+            if dataset_id:
+                items = fetch_dataset_items(dataset_id)
+                all_items.extend(items)
+                count("apify.items", len(items))
+                PROFILES_ENRICHED.inc(len(items), source="linkedin_task")
+                # Only identifiers Apify answered for are settled; the rest stay discoverable
+                batch_answered = {profile_id(it) for it in items if isinstance(it, dict)}
+                answered |= batch_answered
+                frontier.add_answered(batch, batch_answered, source="serpapi_to_apify")
+            APIFY_CALL_SECONDS.observe(time.perf_counter() - started, service="linkedin_task")
+            with span("sleep"):
+                time.sleep(2)
+    finally:
+        # Dropped near-duplicates are settled with their kept person (url_frontier.py --release-near-dups)
+        frontier.add_near_duplicates(near_dups, answered)
+        frontier.close()
+
+    with span("write_output"), open("serpapi_apify_linkedin_raw.json", "w") as f:
         json.dump(all_items, f, indent=2)
     print(f"🗂️ Aggregated {len(all_items)} LinkedIn items")
 
-    stealth_items = [it for it in all_items if looks_stealthy_blob(it)]
-    with open("serpapi_apify_linkedin_stealth.json", "w") as f:
+    with span("stealth_filter"):
+        stealth_items = [it for it in all_items if looks_stealthy_blob(it)]
+    with span("write_output"), open("serpapi_apify_linkedin_stealth.json", "w") as f:
         json.dump(stealth_items, f, indent=2)
     print(f"🕵️ Stealth-matching items: {len(stealth_items)}")
 
@@ -194,4 +269,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    with pipeline_timing.run("serpapi_to_apify"):
+        main()
@@ -15,6 +15,9 @@ from typing import List, Dict, Any
 from openai import OpenAI
 from dotenv import load_dotenv
 
+from llm_analysis_pool import AnalysisJob, run_analyses
+from response_cache import ResponseCache
+
 # Load environment variables
 load_dotenv()
 
@@ -122,19 +125,13 @@ def search_google_for_profiles(search_queries: List[str]) -> List[str]:
     
     return list(discovered_profiles)
 
-def analyze_profile_with_openai(profile_url: str) -> Dict[str, Any]:
-    """
-    Use OpenAI to analyze a profile URL and extract information
-    """
-    try:
-        prompt = f"""
-        Analyze this LinkedIn profile URL and provide key information for Antler VC:
-        
-        Profile URL: {profile_url}
+ANALYSIS_SYSTEM_PROMPT = "You are a VC analyst helping Antler find early-stage founders. Analyze LinkedIn profile URLs and provide insights."
+ANALYSIS_INSTRUCTIONS = """
+        Analyze this LinkedIn profile URL and provide key information for Antler VC.
         
         Based on the URL pattern and common LinkedIn profile structures, provide:
         
-        {{
+        {
             "name": "Estimated name from URL",
             "headline": "Likely headline based on URL pattern",
             "location": "Likely location",
@@ -152,7 +149,7 @@ def analyze_profile_with_openai(profile_url: str) -> Dict[str, Any]:
                 "Personalized message 2",
                 "Personalized message 3"
             ]
-        }}
+        }
         
         Focus on:
         - Early-stage indicators (recent graduates, stealth mode, building something)
@@ -162,11 +159,22 @@ def analyze_profile_with_openai(profile_url: str) -> Dict[str, Any]:
         
         Be realistic and conservative in scoring.
         """
+
+ANALYSIS_MODEL = "gpt-3.5-turbo"
+# Bump whenever ANALYSIS_INSTRUCTIONS/ANALYSIS_SYSTEM_PROMPT change so cached analyses are not reused
+ANALYSIS_PROMPT_VERSION = "simple-v1"
+
+def analyze_profile_with_openai(profile_url: str) -> Dict[str, Any]:
+    """
+    Use OpenAI to analyze a profile URL and extract information
+    """
+    try:
+        prompt = f"{ANALYSIS_INSTRUCTIONS}\n\nProfile URL: {profile_url}"
         
         response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
+            model=ANALYSIS_MODEL,
             messages=[
-                {"role": "system", "content": "You are a VC analyst helping Antler find early-stage founders. Analyze LinkedIn profile URLs and provide insights."},
+                {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.3,
@@ -186,6 +194,29 @@ def analyze_profile_with_openai(profile_url: str) -> Dict[str, Any]:
     except Exception as e:
         return {"url": profile_url, "success": False, "error": str(e)}
 
+def analyze_profiles_concurrently(profile_urls: List[str]) -> List[Dict[str, Any]]:
+    """
+    Analyze many profile URLs through the async OpenAI pool
+    (bounded concurrency, TPM limiting, optional batching, validated JSON).
+    """
+    if not profile_urls:
+        return []
+    jobs = [AnalysisJob(key=url, content=f"Profile URL: {url}") for url in profile_urls]
+    cache = ResponseCache(namespace="llm_analysis")
+    analyses = run_analyses(
+        jobs,
+        instructions=ANALYSIS_INSTRUCTIONS,
+        system_prompt=ANALYSIS_SYSTEM_PROMPT,
+        model=ANALYSIS_MODEL,
+        cache=cache,
+        prompt_version=ANALYSIS_PROMPT_VERSION,
+    )
+    print(cache.report())
+    for url, analysis in zip(profile_urls, analyses):
+        analysis["url"] = url
+    cache.close()
+    return analyses
+
 def get_curated_real_profiles() -> List[str]:
     """
     Return a curated list of real LinkedIn profiles that are likely early-stage founders
@@ -340,10 +371,9 @@ def main():
     print("\n📊 Step 4: Analyzing profiles with OpenAI...")
     analyzed_profiles = []
     
-    for i, profile_url in enumerate(all_profiles[:50]):  # Limit to first 50
-        print(f"Analyzing {i+1}/{min(50, len(all_profiles))}: {profile_url}")
-        
-        analysis = analyze_profile_with_openai(profile_url)
+    to_analyze = all_profiles[:50]  # Limit to first 50
+    for i, (profile_url, analysis) in enumerate(zip(to_analyze, analyze_profiles_concurrently(to_analyze))):
+        print(f"Analyzed {i+1}/{len(to_analyze)}: {profile_url}")
         
         if analysis.get("success"):
             analyzed_profiles.append(analysis)
@@ -351,8 +381,6 @@ def main():
             print(f"   Antler Fit: {analysis.get('antler_fit_score', 'N/A')}/10")
         else:
             print(f"   ❌ Analysis failed: {analysis.get('error', 'Unknown error')}")
-        
-        time.sleep(1)  # Rate limiting
     
     # Step 5: Save results
     print("\n💾 Step 5: Saving results...")
@@ -13,11 +13,17 @@ import time
 import re
 from typing import List, Dict, Any
 
+from url_frontier import UrlFrontier, canonical_url, canonicalize
+
 def search_stealth_founders() -> List[str]:
     """
-    Search for real early-stage founders in stealth mode
+    Search for real early-stage founders in stealth mode.
+    Only profiles not already in the global URL frontier are returned; the
+    frontier itself is left to the pipelines that enrich them.
     """
     stealth_profiles = []
+    found_ids = set()
+    frontier = UrlFrontier()
     
     # Search patterns for stealth founders
     search_patterns = [
@@ -106,9 +112,10 @@ def search_stealth_founders() -> List[str]:
                 matches = re.findall(linkedin_pattern, response.text)
                 
                 for match in matches:
-                    profile_url = match.rstrip('/')
-                    if profile_url not in stealth_profiles:
-                        stealth_profiles.append(profile_url)
+                    pid = canonicalize(match)
+                    if pid and pid not in found_ids and not frontier.seen(match):
+                        found_ids.add(pid)
+                        stealth_profiles.append(canonical_url(pid))
                 
                 print(f"✅ Found {len(matches)} profiles")
             else:
@@ -121,6 +128,7 @@ def search_stealth_founders() -> List[str]:
             print(f"❌ Error: {str(e)}")
             continue
     
+    frontier.close()
     return stealth_profiles
 
 def get_curated_stealth_profiles() -> List[Dict[str, Any]]:
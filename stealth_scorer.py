@@ -7,6 +7,8 @@ Score early-stage stealth founders for Antler conversations
 import json
 from typing import Dict, Any, List
 
+from timeline_features import RECENT_MONTHS, recent_year_terms, timeline
+
 def score_stealth_founder(profile_data: Dict[str, Any]) -> Dict[str, Any]:
     """Score a stealth founder based on early-stage indicators"""
     
@@ -42,8 +44,9 @@ def score_stealth_founder(profile_data: Dict[str, Any]) -> Dict[str, Any]:
     
     # Recent activity indicators (high weight)
     recent_score = 0
-    recent_indicators = [
-        "2024", "2023", "recent graduate", "recently graduated",
+    # The as-of year and the one before (timeline_features.py), not fixed years
+    recent_indicators = recent_year_terms() + [
+        "recent graduate", "recently graduated",
         "new graduate", "fresh graduate", "just graduated",
         "recently joined", "new opportunity", "recent transition"
     ]
@@ -52,6 +55,13 @@ def score_stealth_founder(profile_data: Dict[str, Any]) -> Dict[str, Any]:
         if indicator in profile_text:
             recent_score += 2
     
+    # Dated experience: a role started or ended, or a big company was left, recently
+    tl = timeline(profile_data)
+    if tl.started_current_within(RECENT_MONTHS) or tl.ended_within(RECENT_MONTHS):
+        recent_score += 2
+    if tl.left_bigco_within(RECENT_MONTHS):
+        recent_score += 2
+    
     # Background quality indicators (medium weight)
     background_score = 0
     background_indicators = [
@@ -215,7 +225,7 @@ def create_conversation_starters(profile_data: Dict[str, Any], score_data: Dict[
     profile_text = profile_text.lower()
     
     # Recent graduate conversation starters
-    if any(indicator in profile_text for indicator in ["recent graduate", "2024", "2023", "graduated"]):
+    if any(indicator in profile_text for indicator in ["recent graduate", "graduated"] + recent_year_terms()):
         conversation_starters.append(
             "I noticed you recently graduated and are building in [field]. Would love to hear about what you're working on!"
         )
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Streaming Summary Statistics
+============================
+
+Single-pass accumulator for the summary JSONs written by the filter and
+scoring scripts. Counters are updated as each profile flows past, so a
+summary never needs its own pass over the profile list.
+
+- Exact counters for low-cardinality fields (tier, category, focus area)
+- Space-Saving heavy-hitter sketches for high-cardinality fields
+  (company, school, location): memory stays at TOPK_CAPACITY entries per
+  field however large the corpus, and any item whose true count exceeds
+  N / TOPK_CAPACITY is guaranteed to be tracked
+- Running count / sum / min / max for numeric fields (e.g. score)
+
+Usage:
+    acc = SummaryAccumulator()
+    for profile in profiles:
+        acc.count("tier", profile["tier"])
+        acc.heavy("company", company)
+        acc.observe("score", profile["score"])
+    acc.counter("tier"), acc.top("company", 10), acc.mean("score")
+
+Env override: SUMMARY_TOPK_CAPACITY
+"""
+
+import os
+import heapq
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+TOPK_CAPACITY = int(os.getenv("SUMMARY_TOPK_CAPACITY", "500"))
+
+
+class SpaceSaving:
+    """Space-Saving top-k sketch (Metwally et al.) over hashable items."""
+
+    def __init__(self, capacity: int = TOPK_CAPACITY):
+        self.capacity = max(1, capacity)
+        self.counts: Dict[Hashable, int] = {}
+        # Overestimation bound per tracked item (count inherited on eviction)
+        self.errors: Dict[Hashable, int] = {}
+        # Lazy min-heap of (count, seq, item); stale entries are skipped on pop
+        self._heap: List[Tuple[int, int, Hashable]] = []
+        self._seq = 0
+        self.total = 0
+
+    def _push(self, item: Hashable) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, (self.counts[item], self._seq, item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, i, it) for i, (it, c) in enumerate(self.counts.items())]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> Tuple[Hashable, int]:
+        while True:
+            count, _, item = heapq.heappop(self._heap)
+            if self.counts.get(item) == count:
+                return item, count
+
+    def add(self, item: Hashable, n: int = 1) -> None:
+        self.total += n
+        if item in self.counts:
+            self.counts[item] += n
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = n
+            self.errors[item] = 0
+        else:
+            victim, floor = self._pop_min()
+            del self.counts[victim]
+            del self.errors[victim]
+            self.counts[item] = floor + n
+            self.errors[item] = floor
+        self._push(item)
+
+    def top(self, n: int = 10) -> List[Tuple[Hashable, int]]:
+        """Up to n (item, estimated count) pairs, highest first."""
+        return heapq.nlargest(n, self.counts.items(), key=lambda kv: kv[1])
+
+
+class SummaryAccumulator:
+    """Exact counters, heavy-hitter sketches and numeric stats, updated per profile."""
+
+    def __init__(self, capacity: int = TOPK_CAPACITY):
+        self.capacity = capacity
+        self.rows = 0
+        self.counters: Dict[str, Dict[Any, int]] = {}
+        self.sketches: Dict[str, SpaceSaving] = {}
+        self.numbers: Dict[str, List[float]] = {}  # name -> [count, sum, min, max]
+
+    def row(self) -> None:
+        """Mark one profile seen."""
+        self.rows += 1
+
+    def count(self, name: str, key: Any, n: int = 1) -> None:
+        counter = self.counters.setdefault(name, {})
+        counter[key] = counter.get(key, 0) + n
+
+    def heavy(self, name: str, key: Any, n: int = 1) -> None:
+        if key is None or key == "":
+            return
+        sketch = self.sketches.get(name)
+        if sketch is None:
+            sketch = self.sketches[name] = SpaceSaving(self.capacity)
+        sketch.add(key, n)
+
+    def observe(self, name: str, value: Optional[float]) -> None:
+        if value is None:
+            return
+        stats = self.numbers.get(name)
+        if stats is None:
+            self.numbers[name] = [1, value, value, value]
+            return
+        stats[0] += 1
+        stats[1] += value
+        if value < stats[2]:
+            stats[2] = value
+        if value > stats[3]:
+            stats[3] = value
+
+    # ---- read-out ---------------------------------------------------
+
+    def counter(self, name: str) -> Dict[Any, int]:
+        return dict(self.counters.get(name, {}))
+
+    def top(self, name: str, n: int = 10) -> Dict[Any, int]:
+        sketch = self.sketches.get(name)
+        return dict(sketch.top(n)) if sketch else {}
+
+    def mean(self, name: str) -> float:
+        stats = self.numbers.get(name)
+        return stats[1] / stats[0] if stats else 0
+
+    def stats(self, name: str) -> Dict[str, float]:
+        stats = self.numbers.get(name)
+        if not stats:
+            return {"count": 0, "mean": 0, "min": 0, "max": 0}
+        return {"count": stats[0], "mean": stats[1] / stats[0], "min": stats[2], "max": stats[3]}
@@ -0,0 +1,56 @@
+from analysis_cascade import keyword_score, markdown_to_profile, should_escalate
+
+STEALTH_FOUNDER = """# Priya Rao
+Co-founder & CEO at Stealth AI startup | ex-Google | Stanford
+San Francisco Bay Area
+"""
+
+DATED_FOUNDER = """# Arjun Mehta
+Healthcare access
+## Experience
+Founder, Carebridge (2025 - Present)
+### Product Manager
+PractoCare
+Jan 2019 - Dec 2024 · 6 yrs
+## Education
+### Indian Institute of Technology Bombay
+B.Tech
+2013 - 2017
+"""
+
+NON_FOUNDER = """# Sam Lee
+Accountant at Local Firm
+## Experience
+Accountant
+Local Firm
+2015 - Present
+"""
+
+
+def scraped(markdown):
+    return {"url": "https://www.linkedin.com/in/someone", "data": {"markdown": markdown}}
+
+
+def test_headline_background_becomes_roles_and_schools():
+    profile = markdown_to_profile("https://www.linkedin.com/in/priya", STEALTH_FOUNDER)
+    companies = [r["company"] for r in profile["experience"]]
+    assert "Stealth AI startup" in companies and "Google" in companies
+    assert profile["education"] == [{"school": "Stanford"}]
+
+
+def test_experience_section_is_parsed_with_dates():
+    roles = markdown_to_profile("https://www.linkedin.com/in/arjun", DATED_FOUNDER)["experience"]
+    assert roles[0] == {"title": "Founder", "company": "Carebridge", "is_current": True,
+                        "start_date": {"year": 2025}, "end_date": None}
+    assert roles[1]["end_date"] == {"year": 2024, "month": 12}
+
+
+def test_clear_founders_escalate():
+    for markdown in (STEALTH_FOUNDER, DATED_FOUNDER):
+        result = keyword_score(scraped(markdown))
+        assert result["breakdown"]["founder"] > 0
+        assert should_escalate(result)
+
+
+def test_non_founder_is_settled():
+    assert not should_escalate(keyword_score(scraped(NON_FOUNDER)))
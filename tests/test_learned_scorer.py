@@ -0,0 +1,49 @@
+import numpy as np
+
+from learned_scorer import LearnedScorer, train
+
+
+def binary_rows(n=20):
+    # Bit 0 set -> tier B, clear -> tier C
+    rows = []
+    for i in range(n):
+        hit = i % 2 == 0
+        rows.append({"url": f"https://www.linkedin.com/in/p{i}", "explain_bits": 0b11 if hit else 0b10,
+                     "tier": "B" if hit else "C"})
+    return rows
+
+
+def test_single_row_binary_coef_scores_both_classes():
+    model = LearnedScorer("apimaestro", ["a", "b"], ["B", "C"], [[-2.0, 0.0]], [1.0])
+    assert model.coef_t.shape == (2, 2)
+    assert model.predict([0b01, 0b00]) == ["B", "C"]
+    proba = model.predict_proba([0b00])[0]
+    assert np.isclose(proba[1], 1 / (1 + np.exp(-1.0)))
+
+
+def test_binary_training_separates_tiers(tmp_path):
+    rows = binary_rows()
+    model, report = train(rows, None)
+    assert report["labels"] == {"B": 10, "C": 10}
+    assert model.predict([r["explain_bits"] for r in rows]) == [r["tier"] for r in rows]
+
+    path = str(tmp_path / "model.json")
+    model.save(path)
+    assert LearnedScorer.load(path).predict([0b11, 0b10]) == ["B", "C"]
+
+
+def test_score_and_tier_is_covered():
+    from learned_scorer import rule_tier
+    from score_and_tier import score_item
+    from score_explain import explain_breakdown
+
+    heavy = "stealth building exploring pre-seed early stage incubating working on stanford google meta yc antler"
+    scored = [score_item({"basic_info": {"public_identifier": f"p{i}", "fullname": f"P {i}",
+                                         "about": heavy if i % 2 == 0 else "accountant"}}) for i in range(12)]
+    for row in scored:
+        assert rule_tier("score_and_tier", explain_breakdown("score_and_tier", row["explain_bits"])) == row["tier"]
+
+    # Analyst labels: the founder-language half is tier B
+    labelled = [{**row, "tier": "B" if i % 2 == 0 else "C"} for i, row in enumerate(scored)]
+    model, _ = train(labelled, None, scorer="score_and_tier")
+    assert model.predict([r["explain_bits"] for r in labelled]) == [r["tier"] for r in labelled]
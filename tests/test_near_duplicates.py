@@ -0,0 +1,38 @@
+from near_duplicates import dedupe_serp
+
+TITLE = "Rahul Sharma - Founder - Carebridge Health | LinkedIn"
+STEALTH_TITLE = "Rahul Sharma - Founder - Stealth Startup | LinkedIn"
+
+
+def test_distinct_hash_suffixes_are_different_accounts():
+    kept, dropped = dedupe_serp({
+        "https://www.linkedin.com/in/rahul-sharma-1a2b3c4d": {"title": TITLE, "snippet": "Bengaluru, Karnataka"},
+        "https://www.linkedin.com/in/rahul-sharma-9f8e7d6c": {"title": TITLE, "snippet": "Bengaluru, Karnataka"},
+    })
+    assert len(kept) == 2 and dropped == {}
+
+
+def test_name_and_headline_alone_do_not_merge():
+    title = "Rahul Sharma - Building something new | LinkedIn"
+    kept, dropped = dedupe_serp({
+        "https://www.linkedin.com/in/rahul-sharma": {"title": title, "snippet": "Mumbai, Maharashtra"},
+        "https://www.linkedin.com/in/rahul-sharma-1a2b3c4d": {"title": title, "snippet": "Pune area"},
+    })
+    assert len(kept) == 2 and dropped == {}
+
+
+def test_placeholder_company_does_not_corroborate():
+    kept, dropped = dedupe_serp({
+        "https://www.linkedin.com/in/rahul-sharma": {"title": STEALTH_TITLE, "snippet": ""},
+        "https://www.linkedin.com/in/rahul-sharma-1a2b3c4d": {"title": STEALTH_TITLE, "snippet": ""},
+    })
+    assert len(kept) == 2 and dropped == {}
+
+
+def test_vanity_and_suffixed_identifier_with_shared_company_merge():
+    kept, dropped = dedupe_serp({
+        "https://www.linkedin.com/in/rahul-sharma": {"title": TITLE, "snippet": ""},
+        "https://www.linkedin.com/in/rahul-sharma-1a2b3c4d": {"title": TITLE, "snippet": ""},
+    })
+    assert kept == ["https://www.linkedin.com/in/rahul-sharma"]
+    assert dropped == {"https://www.linkedin.com/in/rahul-sharma-1a2b3c4d": "https://www.linkedin.com/in/rahul-sharma"}
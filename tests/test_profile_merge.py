@@ -0,0 +1,47 @@
+import os
+import time
+
+from profile_merge import MTIME_TOLERANCE, ProfileMerger, file_fetch_times
+
+
+def item(headline, **extra):
+    return {"basic_info": {"public_identifier": "priya-rao", "fullname": "Priya Rao", "headline": headline},
+            **extra}
+
+
+def merged_headline(paths, items_by_path):
+    merger = ProfileMerger()
+    for path, fetched_at in zip(paths, file_fetch_times(paths)):
+        merger.add_many(items_by_path[path], source=path, fetched_at=fetched_at)
+    return merger.records()[0]["basic_info"]["headline"]
+
+
+def write(path, mtime):
+    with open(path, "w") as f:
+        f.write("[]")
+    os.utime(path, (mtime, mtime))
+
+
+def test_close_mtimes_keep_file_order(tmp_path):
+    pref, fallback = str(tmp_path / "pref.json"), str(tmp_path / "fallback.json")
+    now = time.time()
+    write(pref, now - 5)
+    write(fallback, now)  # e.g. both reset by one checkout
+    assert merged_headline([pref, fallback], {pref: [item("Preferred")], fallback: [item("Fallback")]}) == "Preferred"
+
+
+def test_clearly_newer_file_wins(tmp_path):
+    pref, fallback = str(tmp_path / "pref.json"), str(tmp_path / "fallback.json")
+    now = time.time()
+    write(pref, now - 3 * MTIME_TOLERANCE)
+    write(fallback, now)
+    assert merged_headline([pref, fallback], {pref: [item("Preferred")], fallback: [item("Fallback")]}) == "Fallback"
+
+
+def test_item_scrape_timestamp_beats_file_order(tmp_path):
+    pref, fallback = str(tmp_path / "pref.json"), str(tmp_path / "fallback.json")
+    write(pref, 1_600_000_000)
+    write(fallback, 1_600_000_000)
+    items = {pref: [item("Old", scrapedAt="2020-01-01T00:00:00Z")],
+             fallback: [item("New", scrapedAt="2024-06-01T00:00:00Z")]}
+    assert merged_headline([pref, fallback], items) == "New"
@@ -0,0 +1,19 @@
+import pytest
+
+from score_and_tier import score_item
+from score_explain import explain, explain_breakdown
+from timeline_features import recent_year_terms
+
+
+def test_explain_bits_rebuild_the_score():
+    year = recent_year_terms()[0]
+    row = score_item({
+        "basic_info": {"public_identifier": "priya-rao", "fullname": "Priya Rao",
+                       "headline": f"Building in stealth since {year} | ex-Google | YC alumni",
+                       "about": "AI for clinical trials"},
+    })
+    assert explain_breakdown("score_and_tier", row["explain_bits"]) == pytest.approx(row["breakdown"])
+    assert row["score"] == round(sum(row["breakdown"].values()), 2)
+    lines = explain("score_and_tier", row["explain_bits"])
+    assert any('"as-of year"' in line for line in lines)
+    assert any(line.startswith("+0.5 stealth") for line in lines)
@@ -0,0 +1,22 @@
+from url_frontier import UrlFrontier
+
+KEPT = "https://www.linkedin.com/in/rahul-sharma"
+DROPPED = "https://www.linkedin.com/in/rahul-sharma-1a2b3c4d"
+
+
+def test_near_duplicates_settle_with_their_person_and_can_be_released(tmp_path):
+    frontier = UrlFrontier(str(tmp_path / "frontier.sqlite"), capacity=100)
+    try:
+        # Kept person not answered yet: the dropped URL stays discoverable
+        assert frontier.add_near_duplicates({DROPPED: KEPT}, set()) == 0
+        assert frontier.unseen([DROPPED]) == [DROPPED]
+
+        frontier.add_answered([KEPT], {"rahul-sharma"}, source="test")
+        assert frontier.add_near_duplicates({DROPPED: KEPT}, set()) == 1
+        assert frontier.unseen([KEPT, DROPPED]) == []
+
+        assert frontier.release_near_duplicates(KEPT) == [DROPPED]
+        assert frontier.unseen([KEPT, DROPPED]) == [DROPPED]
+        assert len(frontier) == 1
+    finally:
+        frontier.close()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Experience Timeline Features
+============================
+
+Scorers used to test start/end years against hard-coded recent years
+({2024, 2023}) or look for the literal strings "2024"/"2023". Here every
+experience's dates are parsed once into integer month offsets
+(year * 12 + month - 1; a missing month counts as January), and all
+recency features are derived relative to one as-of month:
+
+- tenure_months            total months covered by roles (overlaps merged)
+- gap_months               months since the last role ended (0 while a
+                           role is current, None without dated roles)
+- current_role_months      age of the most recently started current role
+- months_since_left_bigco  months since a role at a big company ended
+- started_current_within(n) / ended_within(n) / left_bigco_within(n)
+
+As-of month: TIMELINE_AS_OF=YYYY-MM (default: today), or set_as_of(),
+e.g. to re-score an old dump as of when it was scraped. Windows default to
+TIMELINE_RECENT_MONTHS.
+
+Parsed timelines are cached per profile version: the key is the public
+identifier plus the raw dates/companies, so an edited profile gets a new
+entry and every scorer in the process reuses the same parse.
+
+Usage:
+    tl = timeline(record)                 # canonical, compact or flat profile
+    tl.started_current_within(RECENT_MONTHS)
+    tl.features()                         # dict of all features
+    recent_year_terms()                   # ["2026", "2025"] for text matching
+"""
+
+import os
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+RECENT_MONTHS = int(os.getenv("TIMELINE_RECENT_MONTHS", "24"))
+CACHE_SIZE = 65536
+BIG_COMPANIES = (
+    "google", "alphabet", "meta", "facebook", "amazon", "microsoft", "apple", "netflix", "stripe",
+    "airbnb", "tesla", "openai", "uber", "salesforce", "nvidia", "linkedin", "flipkart",
+)
+
+Role = Tuple[int, Optional[int], bool, bool]  # start, end (None if open), is_current, big company
+
+
+def parse_month(value: Any) -> Optional[int]:
+    """Month offset of {year, month} / {year} / 'YYYY[-MM]' / a year, or None."""
+    year, month = None, None
+    if isinstance(value, dict):
+        year, month = value.get("year"), value.get("month")
+    elif isinstance(value, (int, float)) and value:
+        year = int(value)
+    elif isinstance(value, str) and value[:4].isdigit():
+        parts = value.split("-")
+        year = int(parts[0])
+        month = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+    if not isinstance(year, int) or year <= 0:
+        return None
+    if not isinstance(month, int) or not 1 <= month <= 12:
+        month = 1
+    return year * 12 + month - 1
+
+
+def _as_of_from(value: Optional[str]) -> int:
+    if value:
+        parsed = parse_month(value)
+        if parsed is None:
+            raise ValueError(f"As-of month must be YYYY-MM, got {value!r}")
+        return parsed
+    today = date.today()
+    return today.year * 12 + today.month - 1
+
+
+AS_OF = _as_of_from(os.getenv("TIMELINE_AS_OF"))
+
+
+def set_as_of(value: Optional[str]) -> int:
+    """Set the process-wide as-of month ('YYYY-MM'; None = today); returns the offset."""
+    global AS_OF
+    AS_OF = _as_of_from(value)
+    return AS_OF
+
+
+def as_of_year() -> int:
+    return AS_OF // 12
+
+
+def recent_year_terms(years: int = 2) -> list:
+    """The as-of year and the ones before it, as strings for text matching."""
+    return [str(as_of_year() - i) for i in range(years)]
+
+
+def is_big_company(company: str) -> bool:
+    company = (company or "").lower()
+    return any(name in company for name in BIG_COMPANIES)
+
+
+class Timeline:
+    """Parsed roles of one profile; every feature takes an optional as-of month (default AS_OF)."""
+    __slots__ = ("roles",)
+
+    def __init__(self, roles: Tuple[Role, ...]):
+        self.roles = roles
+
+    def tenure_months(self, as_of: Optional[int] = None) -> int:
+        as_of = AS_OF if as_of is None else as_of
+        spans = sorted((s, min(as_of, e if e is not None else as_of)) for s, e, _, _ in self.roles if s <= as_of)
+        total, cur_start, cur_end = 0, None, None
+        for s, e in spans:
+            if cur_end is None or s > cur_end:
+                if cur_end is not None:
+                    total += cur_end - cur_start
+                cur_start, cur_end = s, e
+            else:
+                cur_end = max(cur_end, e)
+        if cur_end is not None:
+            total += cur_end - cur_start
+        return total
+
+    def gap_months(self, as_of: Optional[int] = None) -> Optional[int]:
+        as_of = AS_OF if as_of is None else as_of
+        if any(cur and s <= as_of for s, _, cur, _ in self.roles):
+            return 0
+        ends = [e for _, e, _, _ in self.roles if e is not None and e <= as_of]
+        return as_of - max(ends) if ends else None
+
+    def current_role_months(self, as_of: Optional[int] = None) -> Optional[int]:
+        as_of = AS_OF if as_of is None else as_of
+        starts = [s for s, _, cur, _ in self.roles if cur and s <= as_of]
+        return as_of - max(starts) if starts else None
+
+    def months_since_left_bigco(self, as_of: Optional[int] = None) -> Optional[int]:
+        as_of = AS_OF if as_of is None else as_of
+        ends = [e for _, e, cur, big in self.roles if big and not cur and e is not None and e <= as_of]
+        return as_of - max(ends) if ends else None
+
+    def started_current_within(self, months: int = RECENT_MONTHS, as_of: Optional[int] = None) -> bool:
+        as_of = AS_OF if as_of is None else as_of
+        return any(cur and 0 <= as_of - s < months for s, _, cur, _ in self.roles)
+
+    def ended_within(self, months: int = RECENT_MONTHS, as_of: Optional[int] = None) -> bool:
+        as_of = AS_OF if as_of is None else as_of
+        return any(e is not None and 0 <= as_of - e < months for _, e, _, _ in self.roles)
+
+    def left_bigco_within(self, months: int = RECENT_MONTHS, as_of: Optional[int] = None) -> bool:
+        since = self.months_since_left_bigco(as_of)
+        return since is not None and since < months
+
+    def features(self, as_of: Optional[int] = None, months: int = RECENT_MONTHS) -> Dict[str, Any]:
+        return {
+            "tenure_months": self.tenure_months(as_of),
+            "gap_months": self.gap_months(as_of),
+            "current_role_months": self.current_role_months(as_of),
+            "months_since_left_bigco": self.months_since_left_bigco(as_of),
+            "started_current_recently": self.started_current_within(months, as_of),
+            "ended_recently": self.ended_within(months, as_of),
+            "left_bigco_recently": self.left_bigco_within(months, as_of),
+        }
+
+
+def _raw_roles(experience: Iterable[Any]) -> Tuple[Tuple[Any, ...], ...]:
+    """Hashable raw (start, end, is_current, company) per role of any experience shape."""
+    out = []
+    for exp in experience or ():
+        if isinstance(exp, dict):
+            start = exp.get("start_date") or exp.get("startDate") or (exp.get("timePeriod") or {}).get("startDate")
+            end = exp.get("end_date") or exp.get("endDate") or (exp.get("timePeriod") or {}).get("endDate")
+            out.append((_freeze(start), _freeze(end), bool(exp.get("is_current") or exp.get("isCurrent")),
+                        exp.get("company") or exp.get("companyName") or ""))
+        elif hasattr(exp, "start_year"):
+            out.append(((exp.start_year, exp.start_month), (exp.end_year, exp.end_month),
+                        exp.is_current, exp.company))
+    return tuple(out)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return (value.get("year"), value.get("month"))
+    return value
+
+
+def _parse(raw: Tuple[Any, ...]) -> Optional[int]:
+    if isinstance(raw, tuple):
+        return parse_month({"year": raw[0], "month": raw[1]})
+    return parse_month(raw)
+
+
+_CACHE: "OrderedDict[Tuple[str, Tuple], Timeline]" = OrderedDict()
+_stats = {"hits": 0, "misses": 0}
+
+
+def timeline_from_roles(raw_roles: Tuple[Tuple[Any, ...], ...], key: str = "") -> Timeline:
+    cache_key = (key, raw_roles)
+    tl = _CACHE.get(cache_key)
+    if tl is not None:
+        _stats["hits"] += 1
+        _CACHE.move_to_end(cache_key)
+        return tl
+    _stats["misses"] += 1
+    roles = []
+    for start, end, current, company in raw_roles:
+        s = _parse(start)
+        if s is None:
+            continue
+        roles.append((s, _parse(end), current, is_big_company(company)))
+    tl = Timeline(tuple(roles))
+    _CACHE[cache_key] = tl
+    if len(_CACHE) > CACHE_SIZE:
+        _CACHE.popitem(last=False)
+    return tl
+
+
+def timeline(profile: Any) -> Timeline:
+    """Cached timeline of a canonical record, compact record or flat profile dict."""
+    if isinstance(profile, dict):
+        basic = profile.get("basic_info") if isinstance(profile.get("basic_info"), dict) else profile
+        key = basic.get("public_identifier") or profile.get("linkedin_url") or profile.get("url") or ""
+        experience = profile.get("experience") or profile.get("positions") or profile.get("experiences")
+    else:
+        key = getattr(profile, "public_identifier", "")
+        experience = getattr(profile, "experience", ())
+    return timeline_from_roles(_raw_roles(experience), key)
+
+
+def cache_stats() -> Dict[str, int]:
+    return {**_stats, "size": len(_CACHE)}
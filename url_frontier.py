@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Global LinkedIn URL Frontier
+============================
+
+One place to canonicalize and dedupe LinkedIn profile URLs across all
+discovery scripts.
+
+- canonicalize(url) -> public identifier: host variants (in./www./m.),
+  http/https, trailing slashes, sub-pages, query strings, fragments,
+  percent-encoding and case all collapse to the same id
+- UrlFrontier remembers every identifier ever enriched. Discovery only
+  filters with unseen()/seen(); identifiers are recorded (add_answered)
+  once Apify has answered for them, so a failed or timed-out run leaves
+  its profiles discoverable by every pipeline:
+  * SQLite table `seen` (exact, persistent, with first source/time)
+  * Bloom filter in front of it (persisted next to the database), so the
+    common "never seen" case is answered without touching SQLite
+  The filter is sized for FRONTIER_CAPACITY ids and grows (rebuilt from
+  SQLite at double size) when that is exceeded, so it scales to millions
+- URLs collapsed into another person before enrichment (near_duplicates.py)
+  are recorded with source "near_dup_of:<kept id>" once that person is
+  settled (add_near_duplicates), so they are not rediscovered and enriched
+  anyway; the match is a heuristic, so release_near_duplicates() forgets
+  them again (all, or those of one kept person)
+
+Usage:
+    frontier = UrlFrontier()
+    new_urls = frontier.unseen(urls)
+    items = enrich(new_urls)
+    frontier.add_answered(new_urls, {profile_id(it) for it in items}, source="serpapi")
+    frontier.add_near_duplicates(dropped_to_kept, answered_ids)
+    frontier.close()
+    python url_frontier.py --release-near-dups [KEPT_URL]   # undo near-duplicate merges
+
+Env overrides: FRONTIER_PATH, FRONTIER_CAPACITY
+"""
+
+import os
+import math
+import time
+import sqlite3
+import hashlib
+import argparse
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import quote, unquote, urlsplit
+
+FRONTIER_PATH = os.getenv("FRONTIER_PATH", "url_frontier.sqlite")
+FRONTIER_CAPACITY = int(os.getenv("FRONTIER_CAPACITY", "2000000"))
+FALSE_POSITIVE_RATE = 0.001
+COMMIT_EVERY = 1000
+BLOOM_MAGIC = b"BLM1"
+NEAR_DUP_SOURCE = "near_dup_of:"
+
+
+def canonicalize(url: str) -> str:
+    """LinkedIn public identifier (lowercased, unquoted) or "" for non-profile URLs."""
+    if not url or "linkedin.com/in/" not in url.lower():
+        return ""
+    raw = url.strip()
+    if "://" not in raw:
+        raw = "https://" + raw
+    parts = urlsplit(raw)
+    host = parts.netloc.lower().split(":")[0]
+    if not (host == "linkedin.com" or host.endswith(".linkedin.com")):
+        return ""
+    segments = [s for s in parts.path.split("/") if s]
+    if len(segments) < 2 or segments[0].lower() != "in":
+        return ""
+    return unquote(segments[1]).strip().lower()
+
+
+def canonical_url(public_id: str) -> str:
+    """Canonical profile URL for a public identifier."""
+    return f"https://www.linkedin.com/in/{quote(public_id, safe='-_.~')}"
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (blake2b double hashing)."""
+
+    def __init__(self, capacity: int, error_rate: float = FALSE_POSITIVE_RATE):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def save(self, path: str) -> None:
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(BLOOM_MAGIC)
+            for value in (self.capacity, self.num_bits, self.num_hashes, self.count):
+                f.write(value.to_bytes(8, "little"))
+            f.write(self.bits)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["BloomFilter"]:
+        try:
+            with open(path, "rb") as f:
+                if f.read(4) != BLOOM_MAGIC:
+                    return None
+                capacity, num_bits, num_hashes, count = (int.from_bytes(f.read(8), "little") for _ in range(4))
+                bits = bytearray(f.read())
+        except OSError:
+            return None
+        if len(bits) != (num_bits + 7) // 8:
+            return None
+        bloom = cls.__new__(cls)
+        bloom.capacity = capacity
+        bloom.error_rate = FALSE_POSITIVE_RATE
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom.bits = bits
+        bloom.count = count
+        return bloom
+
+
+class UrlFrontier:
+    """Persistent set of seen LinkedIn public identifiers."""
+
+    def __init__(self, path: str = FRONTIER_PATH, capacity: int = FRONTIER_CAPACITY):
+        self.path = path
+        self.bloom_path = path + ".bloom"
+        self.capacity = capacity
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS seen (
+                public_id TEXT PRIMARY KEY,
+                source TEXT,
+                first_seen REAL NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+        self.conn.commit()
+        self.size = self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+        self.bloom = BloomFilter.load(self.bloom_path)
+        if self.bloom is None or self.bloom.count != self.size:
+            # Missing or stale (e.g. crash before close): rebuild from SQLite
+            self._rebuild_bloom(max(capacity, self.size * 2))
+        self._pending = 0
+
+    def _rebuild_bloom(self, capacity: int) -> None:
+        self.bloom = BloomFilter(capacity)
+        for (pid,) in self.conn.execute("SELECT public_id FROM seen"):
+            self.bloom.add(pid)
+
+    def _in_db(self, pid: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM seen WHERE public_id = ?", (pid,)).fetchone() is not None
+
+    # ---- membership -------------------------------------------------
+
+    def seen(self, url: str) -> bool:
+        pid = canonicalize(url)
+        if not pid or pid not in self.bloom:
+            return False
+        return self._in_db(pid)
+
+    __contains__ = seen
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, url: str, source: str = "") -> bool:
+        """Record a URL; True if its identifier was never seen before."""
+        pid = canonicalize(url)
+        if not pid:
+            return False
+        if pid in self.bloom and self._in_db(pid):
+            return False
+        self.conn.execute(
+            "INSERT OR IGNORE INTO seen (public_id, source, first_seen) VALUES (?, ?, ?)",
+            (pid, source, time.time()),
+        )
+        self.bloom.add(pid)
+        self.size += 1
+        if self.size > self.bloom.capacity:
+            self._rebuild_bloom(self.bloom.capacity * 2)
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self.flush()
+        return True
+
+    def unseen(self, urls: Iterable[str]) -> List[str]:
+        """Canonical URLs among `urls` not in the frontier, in input order, unique; records nothing."""
+        ids: Set[str] = set()
+        new_urls = []
+        for url in urls:
+            pid = canonicalize(url)
+            if pid and pid not in ids and not self.seen(url):
+                ids.add(pid)
+                new_urls.append(canonical_url(pid))
+        return new_urls
+
+    def add_answered(self, urls: Iterable[str], answered_ids: Set[str], source: str = "") -> int:
+        """Record the `urls` whose identifier is in `answered_ids` (ids Apify returned an item for)."""
+        added = 0
+        for url in urls:
+            if canonicalize(url) in answered_ids and self.add(url, source):
+                added += 1
+        self.flush()
+        return added
+
+    def add_near_duplicates(self, dropped: Dict[str, str], answered_ids: Set[str]) -> int:
+        """Record collapsed near-duplicates (dropped URL -> kept URL) whose kept person is settled:
+        answered in this run (`answered_ids`) or already in the frontier."""
+        added = 0
+        for url, kept in dropped.items():
+            kept_id = canonicalize(kept)
+            if kept_id and (kept_id in answered_ids or self.seen(kept)):
+                if self.add(url, NEAR_DUP_SOURCE + kept_id):
+                    added += 1
+        self.flush()
+        return added
+
+    def release_near_duplicates(self, kept: Optional[str] = None) -> List[str]:
+        """Forget identifiers recorded as near-duplicates (of `kept`, a URL or identifier, or of
+        anyone), so discovery treats them as new again; returns their canonical URLs."""
+        if kept:
+            kept_id = canonicalize(kept) or kept.strip().lower()
+            where, arg = "source = ?", NEAR_DUP_SOURCE + kept_id
+        else:
+            where, arg = "source LIKE ?", NEAR_DUP_SOURCE + "%"
+        ids = [pid for (pid,) in self.conn.execute(f"SELECT public_id FROM seen WHERE {where}", (arg,))]
+        if ids:
+            self.conn.execute(f"DELETE FROM seen WHERE {where}", (arg,))
+            self.flush()
+            self.size -= len(ids)
+            # Bloom filters cannot delete: rebuild without the released ids
+            self._rebuild_bloom(self.bloom.capacity)
+        return [canonical_url(pid) for pid in ids]
+
+    # ---- persistence ------------------------------------------------
+
+    def flush(self) -> None:
+        self.conn.commit()
+        self._pending = 0
+
+    def close(self) -> None:
+        self.flush()
+        self.bloom.save(self.bloom_path)
+        self.conn.close()
+
+
+def unique_profile_urls(urls: Iterable[str]) -> List[str]:
+    """Canonical, in-order unique profile URLs within one batch (no persistence)."""
+    ids: Set[str] = set()
+    out = []
+    for url in urls:
+        pid = canonicalize(url)
+        if pid and pid not in ids:
+            ids.add(pid)
+            out.append(canonical_url(pid))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the global URL frontier")
+    parser.add_argument("--release-near-dups", nargs="?", const="", default=None, metavar="KEPT",
+                        help="Forget URLs recorded as near-duplicates (of KEPT only, if given)")
+    args = parser.parse_args()
+    frontier = UrlFrontier()
+    try:
+        if args.release_near_dups is not None:
+            released = frontier.release_near_duplicates(args.release_near_dups or None)
+            print(f"♻️ Released {len(released)} near-duplicate URLs; discovery will treat them as new")
+            for url in released:
+                print(f"   {url}")
+        else:
+            print(f"🔗 {len(frontier)} identifiers in {frontier.path}")
+    finally:
+        frontier.close()
+
+
+if __name__ == "__main__":
+    main()